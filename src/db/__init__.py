@@ -48,3 +48,5 @@ class TableUri:
 
 
 PG_URI_STR = str()
+# maximum number of connections in connection pool of one process
+PG_POOL_MAX_CONNECTIONS = 20
@@ -1,11 +1,13 @@
+import functools
 import logging
 import re
 from urllib import parse
 import psycopg2
+import psycopg2.errors
 import psycopg2.pool
 
 import crs as crs_def
-from . import PG_URI_STR
+from . import PG_URI_STR, PG_POOL_MAX_CONNECTIONS
 from .error import Error
 
 logger = logging.getLogger(__name__)
@@ -19,7 +21,7 @@ def get_connection_pool(db_uri_str=None, encapsulate_exception=True):
     if not connection_pool:
         db_uri_parsed = parse.urlparse(db_uri_str)
         try:
-            connection_pool = psycopg2.pool.ThreadedConnectionPool(3, 20,
+            connection_pool = psycopg2.pool.ThreadedConnectionPool(3, PG_POOL_MAX_CONNECTIONS,
                                                                    user=db_uri_parsed.username,
                                                                    password=db_uri_parsed.password,
                                                                    host=db_uri_parsed.hostname,
@@ -56,6 +58,35 @@ def run_query(query, data=None, uri_str=None, encapsulate_exception=True, log_qu
     return rows
 
 
+def run_prepared_query(name, query, data=None, uri_str=None, encapsulate_exception=True):
+    """Run query as server-side prepared statement, preparing it first in each pooled connection that lacks it.
+
+    Query uses positional parameters $1, $2, ... as required by PREPARE.
+    """
+    data = tuple(data or tuple())
+    execute_query = f"EXECUTE {name}" + (f" ({', '.join(['%s'] * len(data))})" if data else '')
+    pool = get_connection_pool(db_uri_str=uri_str, encapsulate_exception=encapsulate_exception, )
+    conn = pool.getconn()
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(execute_query, data)
+        except psycopg2.errors.InvalidSqlStatementName:
+            cur.execute(f"PREPARE {name} AS {query}")
+            cur.execute(execute_query, data)
+        rows = cur.fetchall()
+    except BaseException as exc:
+        if encapsulate_exception:
+            logger.error(f"run_prepared_query, name={name}, query={query}, data={data}, exc={exc}")
+            raise Error(2) from exc
+        raise exc
+    finally:
+        pool.putconn(conn)
+
+    return rows
+
+
 def run_statement(query, data=None, uri_str=None, encapsulate_exception=True, log_query=False):
     pool = get_connection_pool(db_uri_str=uri_str, encapsulate_exception=encapsulate_exception, )
     conn = pool.getconn()
@@ -84,6 +115,8 @@ def to_tsquery_string(value):
     return value
 
 
+# mapping between CRS and SRID does not change during runtime
+@functools.lru_cache(maxsize=None)
 def get_internal_srid(crs):
     if crs is None:
         srid = None
@@ -97,6 +130,7 @@ def get_internal_srid(crs):
     return srid
 
 
+@functools.lru_cache(maxsize=None)
 def get_crs_from_srid(srid, uri_str=None, *, use_internal_srid):
     crs = next((
         crs_code for crs_code, crs_item_def in crs_def.CRSDefinitions.items()
@@ -64,3 +64,30 @@ def test_proxy_base_url_management():
     assert gs_util.ensure_proxy_base_url(init_proxy_base_url, GS_AUTH)
     proxy_base_url = gs_util.get_proxy_base_url(GS_AUTH)
     assert proxy_base_url == init_proxy_base_url
+
+
+def test_security_rules_management():
+    rule_r = gs_util.get_layer_security_rule('test_ws_abc', 'test_layer_abc', 'r')
+    rule_w = gs_util.get_layer_security_rule('test_ws_abc', 'test_layer_abc', 'w')
+    init_rules = gs_util.get_all_security_acl_rules(GS_AUTH)
+    assert rule_r not in init_rules and rule_w not in init_rules
+
+    rules = {rule_r: {'ROLE_ANONYMOUS', 'ROLE_AUTHENTICATED'}, rule_w: {TEST_ROLE}}
+    snapshot = gs_util.ensure_security_rules(rules, GS_AUTH)
+    assert gs_util.get_security_rules_changes(rules, snapshot) == ({}, {})
+    assert gs_util.get_security_roles(rule_r, GS_AUTH) == {'ROLE_ANONYMOUS', 'ROLE_AUTHENTICATED'}
+
+    rules[rule_r] = {TEST_ROLE}
+    assert gs_util.get_security_rules_changes(rules, snapshot) == ({}, {rule_r: {TEST_ROLE}})
+    gs_util.ensure_security_rules(rules, GS_AUTH, current_rules=snapshot)
+    assert gs_util.get_security_roles(rule_r, GS_AUTH) == {TEST_ROLE}
+    assert gs_util.get_security_roles(rule_w, GS_AUTH) == {TEST_ROLE}
+
+    # outdated snapshot is detected and refreshed
+    gs_util.delete_security_roles(rule_r, GS_AUTH)
+    rules[rule_r] = {'ROLE_ANONYMOUS'}
+    gs_util.ensure_security_rules(rules, GS_AUTH, current_rules=snapshot)
+    assert gs_util.get_security_roles(rule_r, GS_AUTH) == {'ROLE_ANONYMOUS'}
+
+    gs_util.delete_security_roles(rule_r, GS_AUTH)
+    gs_util.delete_security_roles(rule_w, GS_AUTH)
@@ -118,24 +118,16 @@ def ensure_user(user, password, auth):
 
 
 def get_workspace_security_roles(workspace, type, auth):
-    return get_security_roles(workspace + '.*.' + type, auth)
+    return get_security_roles(get_workspace_security_rule(workspace, type), auth)
+
+
+def parse_security_roles(roles_string):
+    return {role.strip() for role in roles_string.split(',') if role.strip()}
 
 
 def get_security_roles(rule, auth):
-    response = requests.get(
-        GS_REST_SECURITY_ACL_LAYERS,
-        headers=headers_json,
-        auth=auth,
-        timeout=GS_REST_TIMEOUT,
-    )
-    response.raise_for_status()
-    rules = response.json()
-    try:
-        roles_string = rules[rule]
-        roles = set(roles_string.split(','))
-    except KeyError:
-        roles = set()
-    return roles
+    rules = get_all_security_acl_rules(auth)
+    return parse_security_roles(rules[rule]) if rule in rules else set()
 
 
 def get_all_security_acl_rules(auth):
@@ -150,34 +142,73 @@ def get_all_security_acl_rules(auth):
     return all_rules
 
 
+def get_security_rules_changes(rules, current_rules):
+    """Return rules that are missing in `current_rules` and rules whose roles differ from `current_rules`.
+
+    `rules` maps ACL layer rule to set of roles, `current_rules` is snapshot of all ACL layer rules as returned by GeoServer.
+    """
+    rules_to_add = {}
+    rules_to_modify = {}
+    for rule, roles in rules.items():
+        if rule not in current_rules:
+            rules_to_add[rule] = roles
+        elif parse_security_roles(current_rules[rule]) != set(roles):
+            rules_to_modify[rule] = roles
+    return rules_to_add, rules_to_modify
+
+
+def ensure_security_rules(rules, auth, *, current_rules=None, retries=1):
+    """Ensure ACL layer rules, given as dict rule -> set of roles, by at most one POST and one PUT request.
+
+    Rules are diffed against `current_rules` snapshot of all ACL layer rules, that is downloaded if not given.
+    If the snapshot turns out to be outdated, fresh one is downloaded and used. Returns snapshot with ensured rules.
+    """
+    if current_rules is None:
+        current_rules = get_all_security_acl_rules(auth)
+    rules_to_add, rules_to_modify = get_security_rules_changes(rules, current_rules)
+    logger.info(f"Ensure_security_rules, rules to add={rules_to_add}, rules to modify={rules_to_modify}")
+
+    for method, changed_rules in [('POST', rules_to_add), ('PUT', rules_to_modify)]:
+        if not changed_rules:
+            continue
+        response = requests.request(
+            method,
+            GS_REST_SECURITY_ACL_LAYERS,
+            data=json.dumps({rule: ','.join(sorted(roles)) for rule, roles in changed_rules.items()}),
+            headers=headers_json,
+            auth=auth,
+            timeout=GS_REST_TIMEOUT,
+        )
+        if response.status_code == 409 and retries > 0:
+            # some rule was added or deleted since the snapshot was taken
+            return ensure_security_rules(rules, auth, retries=retries - 1)
+        response.raise_for_status()
+
+    return {
+        **current_rules,
+        **{rule: ','.join(sorted(roles)) for rule, roles in rules.items()},
+    }
+
+
 def ensure_security_roles(rule, roles, auth):
-    roles_str = ', '.join(roles)
+    ensure_security_rules({rule: roles}, auth)
 
-    logger.info(f"Ensure_security_roles rule={rule}, roles={roles}, roles_str={roles_str}")
-    delete_security_roles(rule, auth)
 
-    response = requests.post(
-        GS_REST_SECURITY_ACL_LAYERS,
-        data=json.dumps(
-            {rule: roles_str}),
-        headers=headers_json,
-        auth=auth,
-        timeout=GS_REST_TIMEOUT,
-    )
-    if response.status_code == 409:
-        existing_roles = get_security_roles(rule, auth)
-        assert existing_roles == roles, f'existing_roles={existing_roles}, roles={roles}'
-    else:
-        response.raise_for_status()
+def get_workspace_security_rule(workspace, type):
+    return f"{workspace}.*.{type}"
+
+
+def get_layer_security_rule(workspace, layername, type):
+    return f"{workspace}.{layername}.{type}"
 
 
 def ensure_workspace_security_roles(workspace, roles, type, auth):
-    rule = workspace + '.*.' + type
+    rule = get_workspace_security_rule(workspace, type)
     ensure_security_roles(rule, roles, auth)
 
 
 def ensure_layer_security_roles(workspace, layername, roles, type, auth):
-    rule = f"{workspace}.{layername}.{type}"
+    rule = get_layer_security_rule(workspace, layername, type)
     ensure_security_roles(rule, roles, auth)
 
 
@@ -290,6 +321,20 @@ def delete_security_roles(rule, auth):
         response.raise_for_status()
 
 
+def delete_security_rules(rules, auth, *, current_rules=None):
+    """Delete ACL layer rules, given as iterable of rule names, that exist in `current_rules` snapshot.
+
+    Snapshot of all ACL layer rules is downloaded if not given. GeoServer REST API deletes one ACL layer rule per
+    request, so rules that are missing in the snapshot are not requested at all.
+    """
+    if current_rules is None:
+        current_rules = get_all_security_acl_rules(auth)
+    rules_to_delete = sorted(set(rules) & set(current_rules))
+    logger.info(f"Delete_security_rules, rules to delete={rules_to_delete}")
+    for rule in rules_to_delete:
+        delete_security_roles(rule, auth)
+
+
 def get_all_workspaces(auth):
     response = requests.get(
         GS_REST_WORKSPACES,
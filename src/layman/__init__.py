@@ -32,6 +32,9 @@ logger.setLevel(settings.LAYMAN_LOGLEVEL)
 
 from geoserver import util as gs_util
 from .http import LaymanError
+from .common.filesystem.upload import UploadRequest
+
+app.request_class = UploadRequest
 from .make_celery import make_celery
 
 celery_app = make_celery(app)
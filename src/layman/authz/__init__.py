@@ -1,6 +1,5 @@
-import json
 from functools import wraps
-from flask import after_this_request, request
+from flask import request
 
 from layman import LaymanError, settings, authn, util as layman_util, common
 from layman.common.prime_db_schema import workspaces, users
@@ -60,18 +59,6 @@ def authorize(workspace, publication_type, publication_name, request_method, act
         raise LaymanError(31, {'method': request_method})  # unsupported method
 
 
-def authorize_after_multi_get_request(actor_name, response):
-    # print(f"authorize_after_request, status_code = {response.status_code}, workspace={workspace}, actor_name={actor_name}")
-    if response.status_code == 200:
-        publications_json = json.loads(response.get_data())
-        publications_json = [
-            publication_json for publication_json in publications_json
-            if is_user_in_access_rule(actor_name, publication_json['access_rights']['read'])
-        ]
-        response.set_data(json.dumps(publications_json))
-    return response
-
-
 def is_user_in_access_rule(username, access_rule_names):
     usernames, rolenames = split_user_and_role_names(access_rule_names)
     userroles = role_service.get_user_roles(username)
@@ -108,12 +95,8 @@ def authorize_workspace_publications_decorator(func):
             raise Exception(f"Authorization module is unable to authorize path {req_path}")
         actor_name = authn.get_authn_username()
         # raises exception in case of unauthorized request
+        # multi-publication GET requests are filtered by actor's read rights directly in DB query
         authorize(workspace, publication_type, publication_name, request.method, actor_name)
-        if workspace and publication_type and not publication_name and request.method.lower() == common.REQUEST_METHOD_GET:
-            # pylint: disable=unused-variable
-            @after_this_request
-            def authorize_after_request_tmp(response):
-                return authorize_after_multi_get_request(actor_name, response)
         return func(*args, **kwargs)
 
     return decorated_function
@@ -151,12 +134,7 @@ def authorize_publications_decorator(func):
         (workspace, _, publication_name) = parse_request_path(req_path)
         if workspace or publication_name:
             raise Exception(f"Authorization module is unable to authorize path {req_path}")
-        actor_name = authn.get_authn_username()
-        if request.method.lower() == common.REQUEST_METHOD_GET:
-            # pylint: disable=unused-variable
-            @after_this_request
-            def authorize_after_request_tmp(response):
-                return authorize_after_multi_get_request(actor_name, response)
+        # GET requests are filtered by actor's read rights directly in DB query
         return func(*args, **kwargs)
 
     return decorated_function
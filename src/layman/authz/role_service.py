@@ -1,12 +1,68 @@
+import json
 import logging
 
 from db import util as db_util
 from layman import settings
+from layman.cache import request as request_cache
 
 logger = logging.getLogger(__name__)
 
+USER_ROLES_KEY_PREFIX = f'{__name__}:USER_ROLES'
+
+# Process-wide counters of shared (Redis) cache of user roles, hits are role service queries avoided
+STATISTICS = {
+    'hits': 0,
+    'misses': 0,
+    'invalidations': 0,
+}
+
+
+def get_user_roles_key(username):
+    return f'{USER_ROLES_KEY_PREFIX}:{username}'
+
 
 def get_user_roles(username):
+    """Return roles of the user, cached within request or task and shared in Redis for LAYMAN_CACHE_ROLE_SERVICE_TIMEOUT."""
+    if username is None:
+        return set()
+    return request_cache.get(request_cache.USER_ROLES, username, lambda: _get_shared_user_roles(username))
+
+
+def _get_shared_user_roles(username):
+    key = get_user_roles_key(username)
+    value = settings.LAYMAN_REDIS.get(key)
+    if value is not None:
+        STATISTICS['hits'] += 1
+        return set(json.loads(value))
+    STATISTICS['misses'] += 1
+    roles = _get_user_roles_from_role_service(username)
+    settings.LAYMAN_REDIS.set(key, json.dumps(sorted(roles)), ex=settings.LAYMAN_CACHE_ROLE_SERVICE_TIMEOUT)
+    return roles
+
+
+def invalidate_user_roles(username=None):
+    """Invalidate cached roles of the user, or of all users if username is None.
+
+    Has to be called after every change of user_roles in role service done by Layman.
+    """
+    STATISTICS['invalidations'] += 1
+    request_cache.invalidate(request_cache.USER_ROLES)
+    if username is not None:
+        settings.LAYMAN_REDIS.delete(get_user_roles_key(username))
+    else:
+        keys = list(settings.LAYMAN_REDIS.scan_iter(match=f'{USER_ROLES_KEY_PREFIX}:*'))
+        if keys:
+            settings.LAYMAN_REDIS.delete(*keys)
+
+
+def get_cache_statistics():
+    return {
+        'shared': dict(STATISTICS),
+        'request': request_cache.get_statistics(),
+    }
+
+
+def _get_user_roles_from_role_service(username):
     query = f"""
 select rolename from {settings.LAYMAN_ROLE_SERVICE_SCHEMA}.user_roles
 where username = %s
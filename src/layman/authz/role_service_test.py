@@ -0,0 +1,33 @@
+from layman import app, settings
+from test_tools.role_service import ensure_user_role, delete_user_role, delete_role
+from . import role_service
+
+
+def test_get_user_roles_cache():
+    username = 'test_get_user_roles_cache_user'
+    role = 'TEST_GET_USER_ROLES_CACHE_ROLE'
+    key = role_service.get_user_roles_key(username)
+
+    with app.app_context():
+        role_service.invalidate_user_roles(username)
+        assert role_service.get_user_roles(username) == set()
+        assert settings.LAYMAN_REDIS.exists(key)
+
+        ensure_user_role(username, role)
+        assert not settings.LAYMAN_REDIS.exists(key)
+
+    with app.test_request_context():
+        statistics = role_service.get_cache_statistics()['shared']
+        assert role_service.get_user_roles(username) == {role}
+        assert role_service.get_user_roles(username) == {role}
+        new_statistics = role_service.get_cache_statistics()['shared']
+        assert new_statistics['misses'] == statistics['misses'] + 1, 'second call is served by request cache'
+        assert new_statistics['hits'] == statistics['hits']
+
+    with app.test_request_context():
+        assert role_service.get_user_roles(username) == {role}
+        assert role_service.get_cache_statistics()['shared']['hits'] == new_statistics['hits'] + 1
+
+        delete_user_role(username, role)
+        delete_role(role)
+        assert role_service.get_user_roles(username) == set()
@@ -0,0 +1,88 @@
+import copy
+from functools import wraps
+
+from flask import g, has_app_context, has_request_context
+
+FLASK_CACHE_KEY = f'{__name__}:CACHE'
+FLASK_ENABLED_KEY = f'{__name__}:ENABLED'
+
+# Namespaces
+PUBLICATION_INFOS = 'PUBLICATION_INFOS'
+USER_ROLES = 'USER_ROLES'
+
+# Process-wide counters, hits are calls that did not need to compute the value (e.g. DB round trips avoided)
+STATISTICS = {
+    'hits': 0,
+    'misses': 0,
+    'invalidations': 0,
+}
+
+
+def enable():
+    """Enable cache in current application context, e.g. in Celery task. It's enabled in every Flask request."""
+    setattr(g, FLASK_ENABLED_KEY, True)
+
+
+def is_enabled():
+    return has_app_context() and (has_request_context() or g.get(FLASK_ENABLED_KEY, False))
+
+
+def _get_namespace_dict(namespace):
+    cache = g.get(FLASK_CACHE_KEY)
+    if cache is None:
+        cache = {}
+        setattr(g, FLASK_CACHE_KEY, cache)
+    return cache.setdefault(namespace, {})
+
+
+def get(namespace, key, create_value):
+    """Return value cached in current request or task, or create it by `create_value` and cache it.
+
+    Values are deep-copied, so callers are free to modify them.
+    """
+    if not is_enabled():
+        return create_value()
+    namespace_dict = _get_namespace_dict(namespace)
+    if key in namespace_dict:
+        STATISTICS['hits'] += 1
+        value = namespace_dict[key]
+    else:
+        STATISTICS['misses'] += 1
+        value = create_value()
+        namespace_dict[key] = value
+    return copy.deepcopy(value)
+
+
+def set(namespace, key, value):  # pylint: disable=redefined-builtin
+    if is_enabled():
+        _get_namespace_dict(namespace)[key] = copy.deepcopy(value)
+
+
+def invalidate(namespace=None):
+    if not has_app_context():
+        return
+    cache = g.get(FLASK_CACHE_KEY)
+    if not cache:
+        return
+    STATISTICS['invalidations'] += 1
+    if namespace is None:
+        cache.clear()
+    else:
+        cache.pop(namespace, None)
+
+
+def invalidating(namespace):
+    """Decorator of functions changing data, that invalidates cached values of the namespace after the call."""
+    def decorator(func):
+        @wraps(func)
+        def decorated_function(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                invalidate(namespace)
+        return decorated_function
+    return decorator
+
+
+def get_statistics():
+    return dict(STATISTICS)
@@ -0,0 +1,52 @@
+from flask import Flask
+
+from . import request as request_cache
+
+NAMESPACE = f'{__name__}:TEST'
+
+
+def test_get_set_invalidate():
+    app = Flask(__name__)
+    calls = []
+
+    def create_value():
+        calls.append(1)
+        return {'value': len(calls)}
+
+    assert request_cache.get(NAMESPACE, 'key', create_value) == {'value': 1}
+    assert request_cache.get(NAMESPACE, 'key', create_value) == {'value': 2}, 'no app context, nothing is cached'
+
+    with app.test_request_context():
+        value = request_cache.get(NAMESPACE, 'key', create_value)
+        assert value == {'value': 3}
+        value['value'] = 'changed'
+        assert request_cache.get(NAMESPACE, 'key', create_value) == {'value': 3}
+
+        request_cache.set(NAMESPACE, 'other_key', {'value': 'set'})
+        assert request_cache.get(NAMESPACE, 'other_key', create_value) == {'value': 'set'}
+
+        request_cache.invalidate(NAMESPACE)
+        assert request_cache.get(NAMESPACE, 'key', create_value) == {'value': 4}
+
+    with app.test_request_context():
+        assert request_cache.get(NAMESPACE, 'key', create_value) == {'value': 5}, 'cache is bound to one request'
+
+    with app.app_context():
+        assert not request_cache.is_enabled()
+        request_cache.enable()
+        assert request_cache.get(NAMESPACE, 'key', create_value) == {'value': 6}
+        assert request_cache.get(NAMESPACE, 'key', create_value) == {'value': 6}
+
+
+def test_invalidating():
+    app = Flask(__name__)
+
+    @request_cache.invalidating(NAMESPACE)
+    def change():
+        return 'changed'
+
+    with app.test_request_context():
+        request_cache.set(NAMESPACE, 'key', 'value')
+        assert request_cache.get(NAMESPACE, 'key', lambda: 'new value') == 'value'
+        assert change() == 'changed'
+        assert request_cache.get(NAMESPACE, 'key', lambda: 'new value') == 'new value'
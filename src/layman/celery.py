@@ -9,12 +9,13 @@ from celery.contrib.abortable import AbortableAsyncResult, ABORTED
 
 from layman.publication_relation.util import update_related_publications_after_change
 from layman import settings, common, app, util as layman_util
-from layman.common import redis as redis_util
+from layman.common import redis as redis_util, feature_change
 
 REDIS_CURRENT_TASK_NAMES = f"{__name__}:CURRENT_TASK_NAMES"
 PUBLICATION_CHAIN_INFOS = f'{__name__}:PUBLICATION_CHAIN_INFOS'
 LAST_TASK_ID_IN_CHAIN_TO_PUBLICATION = f'{__name__}:LAST_TASK_ID_IN_CHAIN_TO_PUBLICATION'
 RUN_AFTER_CHAIN = f'{__name__}:RUN_AFTER_CHAIN'
+RUNNING_PUBLICATION_CHAINS = f'{__name__}:RUNNING_PUBLICATION_CHAINS:{{publication_type}}'
 
 
 def task_prerun(workspace, _publication_type, publication_name, _task_id, task_name):
@@ -60,7 +61,7 @@ def _get_task_hash(task_name, workspace, publication_name):
 def push_step_to_run_after_chain(workspace, publication_type, publication_name, step_code, ):
     rds = settings.LAYMAN_REDIS
     key = RUN_AFTER_CHAIN
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     val = rds.hget(key, hash)
     queue = json.loads(val) if val is not None else []
     if step_code not in queue:
@@ -71,7 +72,7 @@ def push_step_to_run_after_chain(workspace, publication_type, publication_name,
 def pop_step_to_run_after_chain(workspace, publication_type, publication_name, ):
     rds = settings.LAYMAN_REDIS
     key = RUN_AFTER_CHAIN
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     val = rds.hget(key, hash)
     result = None
     if val:
@@ -85,7 +86,7 @@ def pop_step_to_run_after_chain(workspace, publication_type, publication_name, )
 def get_run_after_chain_queue(workspace, publication_type, publication_name, ):
     rds = settings.LAYMAN_REDIS
     key = RUN_AFTER_CHAIN
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     val = rds.hget(key, hash)
     queue = json.loads(val) if val is not None else []
     return queue
@@ -94,7 +95,7 @@ def get_run_after_chain_queue(workspace, publication_type, publication_name, ):
 def clear_steps_to_run_after_chain(workspace, publication_type, publication_name, ):
     rds = settings.LAYMAN_REDIS
     key = RUN_AFTER_CHAIN
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     rds.hdel(key, hash)
 
 
@@ -103,6 +104,7 @@ def set_publication_chain_finished(workspace, publication_type, publication_name
     chain_info['finished'] = True
     chain_info['state'] = state
     set_publication_chain_info_dict(workspace, publication_type, publication_name, chain_info)
+    _remove_running_publication_chain(workspace, publication_type, publication_name)
 
 
 def finish_publication_chain(last_task_id_in_chain, state):
@@ -153,7 +155,7 @@ def to_chain_info_with_states(chain_info):
 def get_publication_chain_info_dict(workspace, publication_type, publication_name):
     rds = settings.LAYMAN_REDIS
     key = PUBLICATION_CHAIN_INFOS
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     val = rds.hget(key, hash)
     chain_info = json.loads(val) if val is not None else val
     return chain_info
@@ -206,7 +208,7 @@ def set_publication_chain_info_dict(workspace, publication_type, publication_nam
     rds = settings.LAYMAN_REDIS
     val = json.dumps(chain_info)
     key = PUBLICATION_CHAIN_INFOS
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     rds.hset(key, hash, val)
 
 
@@ -231,10 +233,46 @@ def set_publication_chain_info(workspace, publication_type, publication_name, ta
 
     rds = settings.LAYMAN_REDIS
     key = LAST_TASK_ID_IN_CHAIN_TO_PUBLICATION
-    val = _get_publication_hash(workspace, publication_type, publication_name)
+    val = common.get_publication_hash(workspace, publication_type, publication_name)
     hash = chain_info['last']
     rds.hset(key, hash, val)
 
+    key = RUNNING_PUBLICATION_CHAINS.format(publication_type=publication_type)
+    rds.sadd(key, val)
+
+
+def _remove_running_publication_chain(workspace, publication_type, publication_name):
+    rds = settings.LAYMAN_REDIS
+    key = RUNNING_PUBLICATION_CHAINS.format(publication_type=publication_type)
+    rds.srem(key, common.get_publication_hash(workspace, publication_type, publication_name))
+
+
+def _iter_running_publication_chains(publication_type):
+    rds = settings.LAYMAN_REDIS
+    key = RUNNING_PUBLICATION_CHAINS.format(publication_type=publication_type)
+    for publ_hash in rds.smembers(key):
+        workspace, _, publication_name = _hash_to_publication(publ_hash)
+        chain_info = get_inconsistent_publication_chain_info(workspace, publication_type, publication_name)
+        if chain_info is None or chain_info['finished']:
+            # e.g. publication was deleted in the meantime
+            rds.srem(key, publ_hash)
+            continue
+        if not is_chain_ready(chain_info):
+            yield publ_hash
+
+
+def is_any_publication_chain_running(publication_type):
+    """Return True if chain of any publication of given type is not yet ready.
+
+    Only publications with unfinished chain are checked, their set is maintained by set_publication_chain_info and
+    set_publication_chain_finished. In the usual case when nothing is running, it costs one Redis call.
+    """
+    return next(_iter_running_publication_chains(publication_type), None) is not None
+
+
+def get_running_publication_chains_count(publication_type):
+    return sum(1 for _ in _iter_running_publication_chains(publication_type))
+
 
 def wait_for_abort(workspace, publication_type, publication_name):
     round = 0
@@ -311,12 +349,8 @@ def is_chain_failed_without_info(chain_info):
         not any(res.state == states.FAILURE for res in chain_info['by_order'])
 
 
-def _get_publication_hash(workspace, publication_type, publication_name):
-    hash = f"{workspace}:{publication_type}:{publication_name}"
-    return hash
-
-
 def delete_publication(workspace, publication_type, publication_name):
+    feature_change.delete_pending_change(workspace, publication_type, publication_name)
     chain_info = get_publication_chain_info_dict(workspace, publication_type, publication_name)
     if chain_info is None:
         return
@@ -324,11 +358,12 @@ def delete_publication(workspace, publication_type, publication_name):
 
     rds = settings.LAYMAN_REDIS
     key = PUBLICATION_CHAIN_INFOS
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     rds.hdel(key, hash)
 
     key = LAST_TASK_ID_IN_CHAIN_TO_PUBLICATION
     rds.hdel(key, task_id)
+    _remove_running_publication_chain(workspace, publication_type, publication_name)
 
 
 def run_next_chain(workspace, publ_type, publication):
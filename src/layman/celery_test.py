@@ -1,6 +1,7 @@
 import importlib
 import time
 import sys
+from types import SimpleNamespace
 from celery import chain
 from celery.contrib.abortable import AbortableAsyncResult
 
@@ -137,3 +138,22 @@ def test_abortable_task_chain():
     with app.app_context():
         layer = LayerMock(uuid=publ_uuid, layer_tuple=(workspace, layername))
         input_chunk.delete_layer(layer)
+
+
+def test_is_any_publication_chain_running():
+    publication_type = 'layman.test_running_chains'
+    workspace = 'test_running_chains_workspace'
+    publication_name = 'test_running_chains_publication'
+    task_result = SimpleNamespace(task_id='75ee3b80-32b1-4c9f-b1ec-3c0a0db0a6d1', parent=None)
+
+    with app.app_context():
+        assert not celery_util.is_any_publication_chain_running(publication_type)
+
+        celery_util.set_publication_chain_info(workspace, publication_type, publication_name,
+                                               [SimpleNamespace(name='test_task')], task_result)
+        assert celery_util.is_any_publication_chain_running(publication_type)
+
+        celery_util.set_publication_chain_finished(workspace, publication_type, publication_name, 'SUCCESS')
+        assert not celery_util.is_any_publication_chain_running(publication_type)
+
+        celery_util.delete_publication(workspace, publication_type, publication_name)
@@ -15,6 +15,10 @@ InternalSourceTypeDef = namedtuple('InternalSourceTypeDef', ['info_items',
                                                              ])
 
 
+def get_publication_hash(workspace, publication_type, publication_name):
+    return f"{workspace}:{publication_type}:{publication_name}"
+
+
 def empty_method(*_args, **_kwargs):
     pass
 
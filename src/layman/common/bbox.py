@@ -1,9 +1,17 @@
 import logging
+import math
+import threading
+
+from osgeo import osr
+
 import crs as crs_def
 from db import util as db_util
 
 logger = logging.getLogger(__name__)
 
+# osr.CoordinateTransformation objects are not thread-safe, so each thread has its own cache
+_TRANSFORMATIONS = threading.local()
+
 
 def is_empty(bbox):
     return all(num is None for num in bbox)
@@ -76,11 +84,7 @@ def get_bbox_to_publish(native_bbox, native_crs):
     return result
 
 
-def transform(bbox, crs_from, crs_to):
-    if is_empty(bbox):
-        return None, None, None, None
-    srid_from = db_util.get_internal_srid(crs_from)
-    srid_to = db_util.get_internal_srid(crs_to)
+def _crop_to_world_bounds(bbox, crs_from, crs_to):
     world_bounds = crs_def.CRSDefinitions[crs_to].world_bounds.get(crs_from)
     if world_bounds:
         bbox = (
@@ -89,6 +93,91 @@ def transform(bbox, crs_from, crs_to):
             max(min(bbox[2], world_bounds[2]), world_bounds[0]),
             max(min(bbox[3], world_bounds[3]), world_bounds[1]),
         )
+    return bbox
+
+
+def _crop_to_max_bbox(bbox, crs_to):
+    max_bbox = crs_def.CRSDefinitions[crs_to].max_bbox
+    return (
+        min(max(bbox[0], max_bbox[0]), max_bbox[2]),
+        min(max(bbox[1], max_bbox[1]), max_bbox[3]),
+        max(min(bbox[2], max_bbox[2]), max_bbox[0]),
+        max(min(bbox[3], max_bbox[3]), max_bbox[1]),
+    ) if max_bbox else bbox
+
+
+def _get_spatial_reference(crs):
+    # the same definition as in spatial_ref_sys table of PostGIS
+    crs_item_def = crs_def.CRSDefinitions.get(crs)
+    spatial_reference = osr.SpatialReference()
+    if crs_item_def and crs_item_def.proj4text:
+        spatial_reference.ImportFromProj4(crs_item_def.proj4text)
+    else:
+        spatial_reference.SetFromUserInput(crs)
+    spatial_reference.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return spatial_reference
+
+
+def _get_transformation(crs_from, crs_to):
+    cache = getattr(_TRANSFORMATIONS, 'cache', None)
+    if cache is None:
+        cache = {}
+        _TRANSFORMATIONS.cache = cache
+    key = (crs_from, crs_to)
+    if key not in cache:
+        cache[key] = osr.CoordinateTransformation(_get_spatial_reference(crs_from), _get_spatial_reference(crs_to))
+    return cache[key]
+
+
+def transform_many(bboxes, crs_from, crs_to):
+    """Transform list of bounding boxes in the same CRS in process by one batch transformation of their corners.
+
+    Results are the same as results of `transform_by_db` (PostGIS ST_Transform), i.e. bounding box of transformed
+    corners cropped by world bounds and max bbox of CRS definitions. If a bounding box can not be transformed in
+    process, it is transformed by DB.
+    """
+    bboxes = [tuple(bbox) for bbox in bboxes]
+    to_transform = [(idx, _crop_to_world_bounds(bbox, crs_from, crs_to))
+                    for idx, bbox in enumerate(bboxes) if not is_empty(bbox)]
+    results = [(None, None, None, None)] * len(bboxes)
+    if not to_transform:
+        return results
+
+    if crs_from == crs_to:
+        transformed_points = [(x, y) for _, bbox in to_transform for x, y in _get_corners(bbox)]
+    else:
+        try:
+            transformed_points = _get_transformation(crs_from, crs_to).TransformPoints(
+                [corner for _, bbox in to_transform for corner in _get_corners(bbox)])
+        except RuntimeError:
+            logger.warning(f'In-process transformation {crs_from} -> {crs_to} failed, transforming by DB.')
+            transformed_points = [(math.inf, math.inf)] * (4 * len(to_transform))
+
+    for pos, (idx, _) in enumerate(to_transform):
+        corners = transformed_points[pos * 4:pos * 4 + 4]
+        x_coords = [corner[0] for corner in corners]
+        y_coords = [corner[1] for corner in corners]
+        if all(math.isfinite(coord) for coord in x_coords + y_coords):
+            results[idx] = _crop_to_max_bbox((min(x_coords), min(y_coords), max(x_coords), max(y_coords)), crs_to)
+        else:
+            results[idx] = transform_by_db(bboxes[idx], crs_from, crs_to)
+    return results
+
+
+def _get_corners(bbox):
+    return [(bbox[0], bbox[1]), (bbox[0], bbox[3]), (bbox[2], bbox[1]), (bbox[2], bbox[3])]
+
+
+def transform(bbox, crs_from, crs_to):
+    return transform_many([bbox], crs_from, crs_to)[0]
+
+
+def transform_by_db(bbox, crs_from, crs_to):
+    if is_empty(bbox):
+        return None, None, None, None
+    srid_from = db_util.get_internal_srid(crs_from)
+    srid_to = db_util.get_internal_srid(crs_to)
+    bbox = _crop_to_world_bounds(bbox, crs_from, crs_to)
 
     query = f'''
     with tmp as (select ST_Transform(ST_SetSRID(ST_MakeBox2D(ST_Point(%s, %s),
@@ -103,14 +192,7 @@ def transform(bbox, crs_from, crs_to):
     ;'''
     params = tuple(bbox) + (srid_from, srid_to,)
     result = db_util.run_query(query, params)[0]
-    max_bbox = crs_def.CRSDefinitions[crs_to].max_bbox
-    result = (
-        min(max(result[0], max_bbox[0]), max_bbox[2]),
-        min(max(result[1], max_bbox[1]), max_bbox[3]),
-        max(min(result[2], max_bbox[2]), max_bbox[0]),
-        max(min(result[3], max_bbox[3]), max_bbox[1]),
-    ) if max_bbox else result
-    return result
+    return _crop_to_max_bbox(result, crs_to)
 
 
 def are_similar(bbox1, bbox2, *, no_area_bbox_padding=None, limit=0.95):
@@ -127,3 +127,32 @@ def test_transform(bbox, crs_from, crs_to, expected_bbox):
     with app.app_context():
         transformed_bbox = bbox_util.transform(bbox, crs_from, crs_to)
     assert_util.assert_same_bboxes(transformed_bbox, expected_bbox, 0.1)
+
+
+@pytest.mark.parametrize('crs_from, crs_to', [
+    (crs_from, crs_to)
+    for crs_from in crs_def.CRSDefinitions
+    for crs_to in [crs_def.EPSG_3857, crs_def.EPSG_4326]
+    if crs_from != crs_to
+])
+def test_transform_parity_with_db(crs_from, crs_to):
+    default_bbox = crs_def.CRSDefinitions[crs_from].default_bbox
+    width = default_bbox[2] - default_bbox[0]
+    height = default_bbox[3] - default_bbox[1]
+    bboxes = [
+        default_bbox,
+        (default_bbox[0] + width * 0.4, default_bbox[1] + height * 0.4,
+         default_bbox[0] + width * 0.6, default_bbox[1] + height * 0.6),
+        (default_bbox[0] + width * 0.5, default_bbox[1] + height * 0.5,
+         default_bbox[0] + width * 0.5, default_bbox[1] + height * 0.5),
+        (None, None, None, None),
+    ]
+    precision = 0.00001 if crs_to == crs_def.EPSG_4326 else 0.1
+    with app.app_context():
+        transformed_bboxes = bbox_util.transform_many(bboxes, crs_from, crs_to)
+        for bbox, transformed_bbox in zip(bboxes, transformed_bboxes):
+            db_bbox = bbox_util.transform_by_db(bbox, crs_from, crs_to)
+            if bbox_util.is_empty(bbox):
+                assert bbox_util.is_empty(transformed_bbox)
+            else:
+                assert_util.assert_same_bboxes(transformed_bbox, db_bbox, precision)
@@ -0,0 +1,14 @@
+from celery.utils.log import get_task_logger
+
+from layman import celery_app, util as layman_util
+
+logger = get_task_logger(__name__)
+
+
+@celery_app.task(
+    name='layman.common.bulk_delete.delete_publications',
+)
+def delete_publications(publ_tuples, method):
+    publ_tuples = [tuple(publ_tuple) for publ_tuple in publ_tuples]
+    infos = layman_util.bulk_delete_publications(publ_tuples, method=method)
+    logger.info(f"Bulk delete finished, deleted {len(infos)} publications")
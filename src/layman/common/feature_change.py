@@ -0,0 +1,140 @@
+import logging
+import time
+
+from layman import settings
+from layman.common import get_publication_hash
+
+logger = logging.getLogger(__name__)
+
+PENDING_FIRST_CHANGE_KEY = f'{__name__}:PENDING_FIRST_CHANGE'
+PENDING_LAST_CHANGE_KEY = f'{__name__}:PENDING_LAST_CHANGE'
+FLUSH_SCHEDULED_KEY = f'{__name__}:FLUSH_SCHEDULED'
+STATISTICS_KEY = f'{__name__}:STATISTICS'
+# flush that was not run for LAYMAN_FEATURE_CHANGE_MAX_LATENCY plus this time (in seconds) after it was scheduled is
+# considered lost, e.g. because worker was killed or the task raised
+LOST_FLUSH_MARGIN = 60
+
+
+def _schedule_flush(workspace, publication_type, publication_name, *, countdown):
+    from . import feature_change_tasks
+    publ_hash = get_publication_hash(workspace, publication_type, publication_name)
+    settings.LAYMAN_REDIS.hset(FLUSH_SCHEDULED_KEY, publ_hash, time.time())
+    feature_change_tasks.flush_feature_change.apply_async(
+        args=(workspace, publication_type, publication_name),
+        countdown=countdown,
+        queue=settings.LAYMAN_CELERY_QUEUE,
+    )
+
+
+def schedule_patch_after_feature_change(workspace, publication_type, publication_name):
+    """Debounced variant of layman.util.patch_after_feature_change.
+
+    Changes of one publication are coalesced into one chain that starts after LAYMAN_FEATURE_CHANGE_QUIET_TIME
+    seconds without any change, but no later than LAYMAN_FEATURE_CHANGE_MAX_LATENCY seconds after the first change.
+    """
+    if settings.LAYMAN_FEATURE_CHANGE_QUIET_TIME == 0:
+        from layman import util as layman_util
+        layman_util.patch_after_feature_change(workspace, publication_type, publication_name)
+        return
+    publ_hash = get_publication_hash(workspace, publication_type, publication_name)
+    now = time.time()
+    with settings.LAYMAN_REDIS.pipeline() as pipe:
+        pipe.hsetnx(PENDING_FIRST_CHANGE_KEY, publ_hash, now)
+        pipe.hset(PENDING_LAST_CHANGE_KEY, publ_hash, now)
+        pipe.hincrby(STATISTICS_KEY, 'changes', 1)
+        pipe.hget(PENDING_FIRST_CHANGE_KEY, publ_hash)
+        pipe.hget(FLUSH_SCHEDULED_KEY, publ_hash)
+        is_first_change, _, _, first_change, flush_scheduled = pipe.execute()
+    if is_first_change:
+        _schedule_flush(workspace, publication_type, publication_name,
+                        countdown=settings.LAYMAN_FEATURE_CHANGE_QUIET_TIME)
+    else:
+        _reschedule_lost_flush(workspace, publication_type, publication_name, first_change=first_change,
+                               flush_scheduled=flush_scheduled, now=now)
+
+
+def _reschedule_lost_flush(workspace, publication_type, publication_name, *, first_change, flush_scheduled, now):
+    """Schedule flush again if the last scheduled one was lost, otherwise the change would stay pending forever."""
+    # without scheduled time, flush is being scheduled by other process right now or it was lost before scheduling
+    last_scheduled = float(flush_scheduled if flush_scheduled is not None else first_change)
+    if now - last_scheduled <= settings.LAYMAN_FEATURE_CHANGE_MAX_LATENCY + LOST_FLUSH_MARGIN:
+        return
+    logger.warning(f"Flush of feature change of {get_publication_hash(workspace, publication_type, publication_name)} "
+                   f"scheduled {now - last_scheduled:.1f} s ago was lost, scheduling it again")
+    settings.LAYMAN_REDIS.hincrby(STATISTICS_KEY, 'lost_flushes', 1)
+    _schedule_flush(workspace, publication_type, publication_name, countdown=settings.LAYMAN_FEATURE_CHANGE_QUIET_TIME)
+
+
+def is_change_pending(workspace, publication_type, publication_name):
+    """Also schedules flush again if the last scheduled one was lost, so that the change does not stay pending
+    forever even if the publication is not changed anymore."""
+    publ_hash = get_publication_hash(workspace, publication_type, publication_name)
+    with settings.LAYMAN_REDIS.pipeline() as pipe:
+        pipe.hget(PENDING_FIRST_CHANGE_KEY, publ_hash)
+        pipe.hget(FLUSH_SCHEDULED_KEY, publ_hash)
+        first_change, flush_scheduled = pipe.execute()
+    if first_change is None:
+        return False
+    _reschedule_lost_flush(workspace, publication_type, publication_name, first_change=first_change,
+                           flush_scheduled=flush_scheduled, now=time.time())
+    return True
+
+
+def delete_pending_change(workspace, publication_type, publication_name):
+    publ_hash = get_publication_hash(workspace, publication_type, publication_name)
+    with settings.LAYMAN_REDIS.pipeline() as pipe:
+        pipe.hdel(PENDING_FIRST_CHANGE_KEY, publ_hash)
+        pipe.hdel(PENDING_LAST_CHANGE_KEY, publ_hash)
+        pipe.hdel(FLUSH_SCHEDULED_KEY, publ_hash)
+        pipe.execute()
+
+
+def flush(workspace, publication_type, publication_name):
+    """Start chain for pending changes of the publication if debounce window is over, otherwise check it later."""
+    from layman import celery as celery_util, util as layman_util
+    from layman.map import MAP_TYPE
+
+    rds = settings.LAYMAN_REDIS
+    publ_hash = get_publication_hash(workspace, publication_type, publication_name)
+    first_change = rds.hget(PENDING_FIRST_CHANGE_KEY, publ_hash)
+    last_change = rds.hget(PENDING_LAST_CHANGE_KEY, publ_hash)
+    if first_change is None:
+        return
+    now = time.time()
+    last_change = float(last_change) if last_change is not None else now
+    wait_time = min(last_change + settings.LAYMAN_FEATURE_CHANGE_QUIET_TIME - now,
+                    float(first_change) + settings.LAYMAN_FEATURE_CHANGE_MAX_LATENCY - now)
+    if wait_time > 0:
+        _schedule_flush(workspace, publication_type, publication_name, countdown=wait_time)
+        return
+
+    if publication_type == MAP_TYPE \
+            and celery_util.get_running_publication_chains_count(MAP_TYPE) >= settings.LAYMAN_FEATURE_CHANGE_MAX_MAP_CHAINS:
+        rds.hincrby(STATISTICS_KEY, 'postponed_map_chains', 1)
+        _schedule_flush(workspace, publication_type, publication_name,
+                        countdown=max(settings.LAYMAN_FEATURE_CHANGE_QUIET_TIME, 1))
+        return
+
+    delete_pending_change(workspace, publication_type, publication_name)
+    if not layman_util.get_publication_info(workspace, publication_type, publication_name, context={'keys': ['name']}):
+        logger.info(f"Publication {publ_hash} does not exist anymore, skipping its feature change")
+        return
+    rds.hincrby(STATISTICS_KEY, 'chains', 1)
+    logger.info(f"Starting chain after feature change of {publ_hash}, first change {now - float(first_change):.1f} s ago")
+    layman_util.patch_after_feature_change(workspace, publication_type, publication_name)
+
+
+def get_statistics():
+    """Return number of publications waiting for end of debounce window, length of Celery queue and counters of
+    received changes, started chains, map chains postponed by LAYMAN_FEATURE_CHANGE_MAX_MAP_CHAINS, and flushes
+    scheduled again because they were lost."""
+    rds = settings.LAYMAN_REDIS
+    counters = rds.hgetall(STATISTICS_KEY)
+    return {
+        'pending_publications': rds.hlen(PENDING_FIRST_CHANGE_KEY),
+        'celery_queue_length': rds.llen(settings.LAYMAN_CELERY_QUEUE),
+        'changes': int(counters.get('changes', 0)),
+        'chains': int(counters.get('chains', 0)),
+        'postponed_map_chains': int(counters.get('postponed_map_chains', 0)),
+        'lost_flushes': int(counters.get('lost_flushes', 0)),
+    }
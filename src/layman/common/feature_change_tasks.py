@@ -0,0 +1,13 @@
+from celery.utils.log import get_task_logger
+
+from layman import celery_app
+from . import feature_change
+
+logger = get_task_logger(__name__)
+
+
+@celery_app.task(
+    name='layman.common.feature_change.flush',
+)
+def flush_feature_change(workspace, publication_type, publication_name):
+    feature_change.flush(workspace, publication_type, publication_name)
@@ -0,0 +1,120 @@
+import time
+import pytest
+
+from layman import app, settings, common as common_const
+from layman.common import redis, get_publication_hash
+from test_tools import process_client
+from test_tools.process import LAYMAN_CELERY_QUEUE
+from . import feature_change
+
+WORKSPACE = 'test_feature_change_workspace'
+
+
+@pytest.fixture(autouse=True)
+def celery_queue(monkeypatch):
+    monkeypatch.setattr(settings, 'LAYMAN_CELERY_QUEUE', LAYMAN_CELERY_QUEUE)
+
+
+def wait_for_no_pending_change(workspace, publication_type, publication, *, max_wait=30):
+    start = time.time()
+    while feature_change.is_change_pending(workspace, publication_type, publication):
+        assert time.time() - start < max_wait, f'Change of {workspace}:{publication_type}:{publication} still pending'
+        time.sleep(0.2)
+
+
+@pytest.mark.usefixtures('ensure_layman')
+def test_burst_is_coalesced_into_one_chain():
+    publication_type = process_client.LAYER_TYPE
+    publication = 'test_feature_change_burst_layer'
+    uuid = process_client.publish_workspace_publication(publication_type, WORKSPACE, publication)['uuid']
+    stats_before = feature_change.get_statistics()
+
+    with app.app_context():
+        for _ in range(5):
+            feature_change.schedule_patch_after_feature_change(WORKSPACE, publication_type, publication)
+    assert feature_change.is_change_pending(WORKSPACE, publication_type, publication)
+    assert not redis.get_publication_lock(WORKSPACE, publication_type, publication)
+
+    wait_for_no_pending_change(WORKSPACE, publication_type, publication)
+    process_client.wait_for_publication_status(WORKSPACE, publication_type, publication)
+    stats_after = feature_change.get_statistics()
+    assert stats_after['changes'] - stats_before['changes'] == 5
+    assert stats_after['chains'] - stats_before['chains'] == 1
+
+    process_client.delete_publication_by_uuid(publication_type, uuid)
+
+
+@pytest.mark.usefixtures('ensure_layman')
+def test_max_latency_flush(monkeypatch):
+    publication_type = process_client.LAYER_TYPE
+    publication = 'test_feature_change_max_latency_layer'
+    uuid = process_client.publish_workspace_publication(publication_type, WORKSPACE, publication)['uuid']
+    monkeypatch.setattr(settings, 'LAYMAN_FEATURE_CHANGE_QUIET_TIME', 1)
+    monkeypatch.setattr(settings, 'LAYMAN_FEATURE_CHANGE_MAX_LATENCY', 2)
+    stats_before = feature_change.get_statistics()
+
+    with app.app_context():
+        start = time.time()
+        while time.time() - start < settings.LAYMAN_FEATURE_CHANGE_MAX_LATENCY:
+            feature_change.schedule_patch_after_feature_change(WORKSPACE, publication_type, publication)
+            feature_change.flush(WORKSPACE, publication_type, publication)
+            assert feature_change.is_change_pending(WORKSPACE, publication_type, publication)
+            time.sleep(0.3)
+        # changes still keep coming, but the first one is older than LAYMAN_FEATURE_CHANGE_MAX_LATENCY
+        feature_change.schedule_patch_after_feature_change(WORKSPACE, publication_type, publication)
+        feature_change.flush(WORKSPACE, publication_type, publication)
+    assert not feature_change.is_change_pending(WORKSPACE, publication_type, publication)
+    assert redis.get_publication_lock(WORKSPACE, publication_type, publication) == common_const.PUBLICATION_LOCK_FEATURE_CHANGE
+
+    process_client.wait_for_publication_status(WORKSPACE, publication_type, publication)
+    stats_after = feature_change.get_statistics()
+    assert stats_after['chains'] - stats_before['chains'] == 1
+
+    process_client.delete_publication_by_uuid(publication_type, uuid)
+
+
+@pytest.mark.usefixtures('ensure_layman')
+def test_delete_during_window():
+    publication_type = process_client.LAYER_TYPE
+    publication = 'test_feature_change_delete_layer'
+    uuid = process_client.publish_workspace_publication(publication_type, WORKSPACE, publication)['uuid']
+    stats_before = feature_change.get_statistics()
+
+    with app.app_context():
+        feature_change.schedule_patch_after_feature_change(WORKSPACE, publication_type, publication)
+    assert feature_change.is_change_pending(WORKSPACE, publication_type, publication)
+
+    process_client.delete_publication_by_uuid(publication_type, uuid)
+    assert not feature_change.is_change_pending(WORKSPACE, publication_type, publication)
+
+    # scheduled flush finds nothing to do
+    time.sleep(settings.LAYMAN_FEATURE_CHANGE_QUIET_TIME + 1)
+    assert not feature_change.is_change_pending(WORKSPACE, publication_type, publication)
+    assert not redis.get_publication_lock(WORKSPACE, publication_type, publication)
+    stats_after = feature_change.get_statistics()
+    assert stats_after['chains'] - stats_before['chains'] == 0
+
+
+@pytest.mark.usefixtures('ensure_layman')
+def test_lost_flush_is_scheduled_again():
+    publication_type = process_client.LAYER_TYPE
+    publication = 'test_feature_change_lost_flush_layer'
+    uuid = process_client.publish_workspace_publication(publication_type, WORKSPACE, publication)['uuid']
+    stats_before = feature_change.get_statistics()
+
+    # change is pending, but its flush was scheduled long ago and never run
+    publ_hash = get_publication_hash(WORKSPACE, publication_type, publication)
+    long_ago = time.time() - settings.LAYMAN_FEATURE_CHANGE_MAX_LATENCY - feature_change.LOST_FLUSH_MARGIN - 1
+    settings.LAYMAN_REDIS.hset(feature_change.PENDING_FIRST_CHANGE_KEY, publ_hash, long_ago)
+    settings.LAYMAN_REDIS.hset(feature_change.PENDING_LAST_CHANGE_KEY, publ_hash, long_ago)
+    settings.LAYMAN_REDIS.hset(feature_change.FLUSH_SCHEDULED_KEY, publ_hash, long_ago)
+
+    with app.app_context():
+        feature_change.schedule_patch_after_feature_change(WORKSPACE, publication_type, publication)
+    wait_for_no_pending_change(WORKSPACE, publication_type, publication)
+    process_client.wait_for_publication_status(WORKSPACE, publication_type, publication)
+    stats_after = feature_change.get_statistics()
+    assert stats_after['lost_flushes'] - stats_before['lost_flushes'] == 1
+    assert stats_after['chains'] - stats_before['chains'] == 1
+
+    process_client.delete_publication_by_uuid(publication_type, uuid)
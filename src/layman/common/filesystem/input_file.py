@@ -12,4 +12,8 @@ def save_files(files, filepath_mapping, *, prefix=None):
         full_file_path = os.path.join(prefix, filepath) if prefix else filepath
         directory = os.path.dirname(full_file_path)
         pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
-        file.save(full_file_path)
+        if hasattr(file.stream, 'move_to'):
+            # file part staged on the same filesystem by layman.common.filesystem.upload, no need to copy it
+            file.stream.move_to(full_file_path)
+        else:
+            file.save(full_file_path)
@@ -0,0 +1,123 @@
+import errno
+import hashlib
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+
+from flask import Request, has_request_context, request
+
+from layman import settings
+from layman.http import LaymanError
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = os.path.join(settings.LAYMAN_DATA_DIR, 'upload')
+# Smaller requests are parsed by Werkzeug in memory
+MIN_STAGED_CONTENT_LENGTH = 500 * 1024
+ZIP_SIGNATURES = (b'PK\x03\x04', b'PK\x05\x06', )
+
+
+def mkdtemp():
+    """Create temporary directory on the same filesystem as publication directories, so it can be moved by rename.
+
+    Within request, the directory is deleted when the request is closed, unless it was moved away before.
+    """
+    pathlib.Path(UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix='layman_', dir=UPLOAD_DIR)
+    if has_request_context() and isinstance(request, UploadRequest):
+        request.__dict__.setdefault('_staged_dirs', []).append(temp_dir)
+    return temp_dir
+
+
+class StagedFile:
+    """Writable file part of multipart request, stored in LAYMAN_DATA_DIR instead of system temporary directory.
+
+    Size limit and zip signature are checked and checksum is computed while the part is being received. The file
+    is moved into its final location by `move_to`, i.e. without copying. File that was not moved is deleted on close.
+    """
+
+    def __init__(self, filename):
+        pathlib.Path(UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+        file_descriptor, self.path = tempfile.mkstemp(dir=UPLOAD_DIR, prefix='part_')
+        self._file = os.fdopen(file_descriptor, 'w+b')
+        self.filename = filename
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._is_zip = os.path.splitext(filename or '')[1].lower() in settings.COMPRESSED_FILE_EXTENSIONS
+        self._moved = False
+
+    def write(self, data):
+        if self.size == 0 and self._is_zip and len(data) >= 4 and not data.startswith(ZIP_SIGNATURES):
+            raise LaymanError(2, {'parameter': 'file',
+                                  'message': 'File is not valid zip file.',
+                                  'file': self.filename,
+                                  })
+        self.size += len(data)
+        if 0 < settings.LAYMAN_UPLOAD_MAX_FILE_SIZE < self.size:
+            raise LaymanError(2, {'parameter': 'file',
+                                  'message': 'File is too large.',
+                                  'expected': f'File of at most {settings.LAYMAN_UPLOAD_MAX_FILE_SIZE} bytes.',
+                                  'file': self.filename,
+                                  })
+        self._hash.update(data)
+        return self._file.write(data)
+
+    @property
+    def checksum(self):
+        return self._hash.hexdigest()
+
+    def move_to(self, filepath):
+        self._file.flush()
+        try:
+            os.replace(self.path, filepath)
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+            # upload directory is mounted on other filesystem than target directory, so the file has to be copied
+            shutil.move(self.path, filepath)
+        self.path = filepath
+        self._moved = True
+        logger.info(f"Uploaded file {self.filename} moved to {filepath}, size={self.size}, sha256={self.checksum}")
+
+    def close(self):
+        self._file.close()
+        if not self._moved:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+
+# pylint: disable=too-few-public-methods
+class UploadRequest(Request):
+    """Request staging file parts of large multipart requests as StagedFile.
+
+    Parts are tracked on the request and closed with it, because parts received before parsing failed (e.g. size
+    limit, invalid zip, client disconnect) never get into `request.files`. Directories created by `mkdtemp` and not
+    moved away are deleted with the request too.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is None or total_content_length > MIN_STAGED_CONTENT_LENGTH:
+            staged_file = StagedFile(filename)
+            self.__dict__.setdefault('_staged_files', []).append(staged_file)
+            return staged_file
+        return super()._get_file_stream(total_content_length, content_type, filename=filename,
+                                        content_length=content_length)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            for staged_file in self.__dict__.pop('_staged_files', []):
+                staged_file.close()
+            for staged_dir in self.__dict__.pop('_staged_dirs', []):
+                shutil.rmtree(staged_dir, ignore_errors=True)
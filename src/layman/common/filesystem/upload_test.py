@@ -0,0 +1,82 @@
+import errno
+import io
+import os
+
+import pytest
+
+from layman import app, settings, LaymanError
+from . import upload
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload, 'UPLOAD_DIR', str(tmp_path / 'upload'))
+    yield tmp_path / 'upload'
+
+
+def test_staged_file_size_limit(upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, 'LAYMAN_UPLOAD_MAX_FILE_SIZE', 10)
+    staged_file = upload.StagedFile('layer.geojson')
+    staged_file.write(b'0123456789')
+    with pytest.raises(LaymanError) as exc_info:
+        staged_file.write(b'a')
+    assert exc_info.value.code == 2
+    assert exc_info.value.data['message'] == 'File is too large.'
+    staged_file.close()
+    assert os.listdir(upload_dir) == []
+
+
+def test_staged_file_bad_zip(upload_dir):
+    staged_file = upload.StagedFile('layer.zip')
+    with pytest.raises(LaymanError) as exc_info:
+        staged_file.write(b'not a zip file')
+    assert exc_info.value.data['message'] == 'File is not valid zip file.'
+    staged_file.close()
+    assert os.listdir(upload_dir) == []
+
+
+def test_staged_file_move_to(upload_dir, tmp_path):
+    staged_file = upload.StagedFile('layer.zip')
+    staged_file.write(b'PK\x05\x06' + bytes(18))
+    staged_path = staged_file.path
+    inode = os.stat(staged_path).st_ino
+    target_path = str(tmp_path / 'layer.zip')
+    staged_file.move_to(target_path)
+    staged_file.close()
+    assert os.stat(target_path).st_ino == inode, 'file is renamed, not copied'
+    assert not os.path.exists(staged_path)
+    assert os.listdir(upload_dir) == []
+
+
+
+def test_staged_file_move_to_other_filesystem(upload_dir, tmp_path, monkeypatch):
+    def replace_across_filesystems(*_):
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    staged_file = upload.StagedFile('layer.zip')
+    content = b'PK\x05\x06' + bytes(18)
+    staged_file.write(content)
+    staged_path = staged_file.path
+    target_path = str(tmp_path / 'layer.zip')
+    monkeypatch.setattr(upload.os, 'replace', replace_across_filesystems)
+    staged_file.move_to(target_path)
+    staged_file.close()
+    with open(target_path, 'rb') as file:
+        assert file.read() == content
+    assert not os.path.exists(staged_path)
+    assert os.listdir(upload_dir) == []
+
+def test_staged_files_deleted_when_parsing_fails(upload_dir):
+    data = {
+        'file': [
+            (io.BytesIO(b'{}' + b' ' * upload.MIN_STAGED_CONTENT_LENGTH), 'layer.geojson'),
+            (io.BytesIO(b'not a zip file'), 'layer.zip'),
+        ],
+    }
+    with app.test_request_context(method='POST', data=data, content_type='multipart/form-data'):
+        from flask import request
+        assert isinstance(request, upload.UploadRequest)
+        with pytest.raises(LaymanError):
+            _ = request.files
+        assert len(os.listdir(upload_dir)) == 2
+    assert os.listdir(upload_dir) == []
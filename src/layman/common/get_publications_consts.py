@@ -16,3 +16,6 @@ ORDERING_BBOX_CRS = 'ordering_bbox_crs'
 
 LIMIT = 'limit'
 OFFSET = 'offset'
+CURSOR = 'cursor'
+TOTAL_COUNT = 'total_count'
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
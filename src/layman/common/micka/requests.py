@@ -5,8 +5,32 @@ from owslib.util import nspath_eval
 
 from layman import settings, LaymanError
 import requests_util.retry
+from requests_util.pool import get_pooled_session
 from micka import NAMESPACES
 
+RECORD_PRESENCE_KEY = f'{__name__}:RECORD_PRESENCE'
+
+
+def get_csw_session():
+    return get_pooled_session('micka_csw', max_retries=requests_util.retry.get_retry())
+
+
+def get_record_presence_key(muuid):
+    return f'{RECORD_PRESENCE_KEY}:{muuid}'
+
+
+def set_record_present(muuid):
+    settings.LAYMAN_REDIS.set(get_record_presence_key(muuid), 1,
+                              ex=settings.LAYMAN_CACHE_CSW_RECORD_PRESENCE_TIMEOUT)
+
+
+def is_record_present(muuid):
+    return bool(settings.LAYMAN_REDIS.exists(get_record_presence_key(muuid)))
+
+
+def delete_record_presence(muuid):
+    settings.LAYMAN_REDIS.delete(get_record_presence_key(muuid))
+
 
 def is_record_exists_exception(root_el):
     return len(root_el) == 1 and \
@@ -29,10 +53,10 @@ def is_record_does_not_exist_exception(root_el):
 
 def base_insert(xml_str):
     # print(f"Micka insert=\n{xml_str}")
-    response = requests_util.retry.get_session().post(settings.CSW_URL,
-                                                      auth=settings.CSW_BASIC_AUTHN,
-                                                      data=xml_str.encode('utf-8'),
-                                                      timeout=settings.DEFAULT_CONNECTION_TIMEOUT, )
+    response = get_csw_session().post(settings.CSW_URL,
+                                      auth=settings.CSW_BASIC_AUTHN,
+                                      data=xml_str.encode('utf-8'),
+                                      timeout=settings.DEFAULT_CONNECTION_TIMEOUT, )
     # print(f"Micka insert response=\n{r.text}")
     response.raise_for_status()
     root_el = ET.fromstring(response.content)
@@ -55,17 +79,18 @@ def csw_update(template_values, timeout=None):
     template_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'csw-update-template.xml')
     xml_str = fill_template_as_str(template_path, template_values)
     # print(f"CSW update request=\n{xml_str}")
-    response = requests_util.retry.get_session().post(settings.CSW_URL,
-                                                      auth=settings.CSW_BASIC_AUTHN,
-                                                      data=xml_str.encode('utf-8'),
-                                                      timeout=timeout,
-                                                      )
+    response = get_csw_session().post(settings.CSW_URL,
+                                      auth=settings.CSW_BASIC_AUTHN,
+                                      data=xml_str.encode('utf-8'),
+                                      timeout=timeout,
+                                      )
     # print(f"CSW update response=\n{r.text}")
     response.raise_for_status()
     root_el = ET.fromstring(response.content)
 
     if root_el.tag == nspath_eval('ows:ExceptionReport', NAMESPACES):
         if is_record_does_not_exist_exception(root_el):
+            delete_record_presence(template_values['muuid'])
             raise LaymanError(39, data={
                 'response': response.text
             })
@@ -74,20 +99,22 @@ def csw_update(template_values, timeout=None):
         })
     assert root_el.tag == nspath_eval('csw:TransactionResponse', NAMESPACES), response.content
     assert root_el.find(nspath_eval('csw:TransactionSummary/csw:totalUpdated', NAMESPACES)).text == "1", response.content
+    set_record_present(template_values['muuid'])
 
 
 def csw_delete(muuid):
+    delete_record_presence(muuid)
     template_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'csw-delete-template.xml')
     template_values = {
         'muuid': muuid
     }
     xml_str = fill_template_as_str(template_path, template_values)
     # print(f"CSW delete request=\n{xml_str}")
-    response = requests_util.retry.get_session().post(settings.CSW_URL,
-                                                      auth=settings.CSW_BASIC_AUTHN,
-                                                      data=xml_str.encode('utf-8'),
-                                                      timeout=settings.DEFAULT_CONNECTION_TIMEOUT,
-                                                      )
+    response = get_csw_session().post(settings.CSW_URL,
+                                      auth=settings.CSW_BASIC_AUTHN,
+                                      data=xml_str.encode('utf-8'),
+                                      timeout=settings.DEFAULT_CONNECTION_TIMEOUT,
+                                      )
     # print(f"CSW delete response=\n{r.text}")
     response.raise_for_status()
     root_el = ET.fromstring(response.content)
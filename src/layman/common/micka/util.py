@@ -6,7 +6,6 @@ from xml.sax.saxutils import escape
 import urllib.parse as urlparse
 from copy import deepcopy
 import logging
-import requests
 from owslib.csw import CatalogueServiceWeb
 from owslib.util import nspath_eval
 from lxml import etree as ET
@@ -14,12 +13,15 @@ from lxml import etree as ET
 from layman import settings, authz
 from layman.common.metadata import PROPERTIES as COMMON_PROPERTIES
 from micka import NAMESPACES
-from .requests import base_insert, csw_delete, fill_template_as_str
+from .requests import base_insert, csw_delete, fill_template_as_str, get_csw_session, set_record_present, \
+    is_record_present
 from ...publication_class import Publication
 from . import MickaIds
 
 logger = logging.getLogger(__name__)
 
+CSW_RECORD_IDS_BATCH_SIZE = 50
+
 
 class RecordUrlType(Enum):
     BASIC = 'basic'
@@ -241,6 +243,7 @@ def csw_insert(template_values):
     muuid_els = root_el.findall(nspath_eval('csw:InsertResult/csw:BriefRecord/dc:identifier', NAMESPACES))
     assert len(muuid_els) == 1, response.content
     muuid = muuid_els[0].text
+    set_record_present(muuid)
     return muuid
 
 
@@ -258,6 +261,7 @@ def soap_insert(template_values):
             nspath_eval('soap:Body/csw:TransactionResponse/csw:InsertResult/csw:BriefRecord/dc:identifier', NAMESPACES))
         assert len(muuid_els) == 1, response.content
         muuid = muuid_els[0].text
+        set_record_present(muuid)
     except BaseException as exc:
         if response:
             logger.warning(f'response.content={response.content}')
@@ -618,16 +622,46 @@ def get_record_element_by_id(csw, ident):
     return result
 
 
+def get_existing_record_ids(muuids):
+    """Return subset of given metadata record IDs that exist in Micka.
+
+    IDs known to exist are read from presence cache, others are checked by GetRecordById requests,
+    each of them asking for at most CSW_RECORD_IDS_BATCH_SIZE records.
+    """
+    existing_muuids = {muuid for muuid in muuids if is_record_present(muuid)}
+    unknown_muuids = sorted(set(muuids) - existing_muuids)
+    for idx in range(0, len(unknown_muuids), CSW_RECORD_IDS_BATCH_SIZE):
+        batch = unknown_muuids[idx:idx + CSW_RECORD_IDS_BATCH_SIZE]
+        response = get_csw_session().get(settings.CSW_URL,
+                                         auth=settings.CSW_BASIC_AUTHN,
+                                         params={
+                                             'SERVICE': 'CSW',
+                                             'VERSION': '2.0.2',
+                                             'REQUEST': 'GetRecordById',
+                                             'ELEMENTSETNAME': 'brief',
+                                             'ID': ','.join(batch),
+                                         },
+                                         timeout=settings.DEFAULT_CONNECTION_TIMEOUT,
+                                         )
+        response.raise_for_status()
+        tree = ET.fromstring(response.content)
+        found_muuids = set(tree.xpath('//csw:BriefRecord/dc:identifier/text()', namespaces=NAMESPACES))
+        for muuid in found_muuids.intersection(batch):
+            set_record_present(muuid)
+            existing_muuids.add(muuid)
+    return existing_muuids
+
+
 def get_number_of_records(record_id, use_authn):
     authn = settings.CSW_BASIC_AUTHN if use_authn else None
     template_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'csw-number-of-records-template.xml')
     xml_str = fill_template_as_str(template_path, {'record_id': record_id})
 
-    response = requests.post(settings.CSW_URL,
-                             auth=authn,
-                             data=xml_str,
-                             timeout=settings.DEFAULT_CONNECTION_TIMEOUT,
-                             )
+    response = get_csw_session().post(settings.CSW_URL,
+                                      auth=authn,
+                                      data=xml_str,
+                                      timeout=settings.DEFAULT_CONNECTION_TIMEOUT,
+                                      )
     response.raise_for_status()
     parser = ET.XMLParser(remove_blank_text=True)
     tree = ET.fromstring(response.text.encode('utf-8'), parser=parser)
@@ -1,4 +1,6 @@
+import hashlib
 import re
+from collections import defaultdict
 from dataclasses import dataclass
 import logging
 import psycopg2.extras
@@ -9,6 +11,7 @@ from geoserver.util import RESERVED_ROLE_NAMES
 from layman import settings, LaymanError
 from layman.authn import is_user_with_name
 from layman.authz import split_user_and_role_names, role_service
+from layman.cache import request as request_cache
 from layman.common import get_publications_consts as consts, bbox as bbox_util
 from . import workspaces, users, rights
 
@@ -20,6 +23,37 @@ DEFAULT_BBOX_CRS = 'EPSG:3857'
 psycopg2.extras.register_uuid()
 
 
+# Info keys, that can be read by lightweight lookup of one publication: key -> (info key, SQL expression, to info value)
+LOOKUP_COLUMNS = {
+    'id': ('id', 'p.id', None),
+    'workspace': ('_workspace', 'w.name', None),
+    'type': ('type', 'p.type', None),
+    'name': ('name', 'p.name', None),
+    'uuid': ('uuid', 'p.uuid::text', None),
+    'title': ('title', 'p.title', None),
+    'description': ('description', 'p.description', None),
+    'geodata_type': ('geodata_type', 'p.geodata_type', None),
+    'style_type': ('_style_type', 'p.style_type', None),
+    'image_mosaic': ('image_mosaic', 'p.image_mosaic', None),
+    'updated_at': ('updated_at', 'p.updated_at', None),
+    'created_at': ('_created_at', 'p.created_at', None),
+    'original_data_source': ('original_data_source', 'p.external_table_uri is not null',
+                             lambda is_table: settings.EnumOriginalDataSource.TABLE.value if is_table
+                             else settings.EnumOriginalDataSource.FILE.value),
+    'wfs_wms_status': ('_wfs_wms_status', 'p.wfs_wms_status',
+                       lambda status: settings.EnumWfsWmsStatus(status) if status else None),
+    'is_public_workspace': ('_is_public_workspace', 'u.id is null', None),
+}
+LOOKUP_IDENTITY_KEYS = ['workspace', 'type', 'name', 'uuid']
+# Info keys requiring subqueries, decryption or bbox transformation, i.e. full query of get_publication_infos
+NON_LOOKUP_KEYS = {'access_rights', 'bounding_box', 'native_bounding_box', 'native_crs', 'table_uri', 'used_in_maps',
+                   'map_layers', }
+
+
+def is_lookup_enough(keys):
+    return keys is not None and not NON_LOOKUP_KEYS.intersection(keys)
+
+
 @dataclass
 class CalculatedColumnType:
     alias: str
@@ -28,8 +62,59 @@ class CalculatedColumnType:
 
 
 def get_publication_infos(workspace_name=None, pub_type=None, *, style_type=None, uuid=None, pub_name=None):
-    return get_publication_infos_with_metainfo(workspace_name, pub_type, style_type=style_type, uuid=uuid,
-                                               pub_name=pub_name)['items']
+    def create_value():
+        return get_publication_infos_with_metainfo(workspace_name, pub_type, style_type=style_type, uuid=uuid,
+                                                   pub_name=pub_name)['items']
+
+    # Only lookups of one publication are memoized, they are repeated many times within one request or task
+    if style_type is None and uuid is not None and workspace_name is None and pub_type is None and pub_name is None:
+        cache_key = ('uuid', str(uuid))
+    elif style_type is None and uuid is None and None not in (workspace_name, pub_type, pub_name):
+        cache_key = ('name', workspace_name, pub_type, pub_name)
+    else:
+        return create_value()
+
+    infos = request_cache.get(request_cache.PUBLICATION_INFOS, cache_key, create_value)
+    for (info_workspace, info_type, info_name), info in infos.items():
+        request_cache.set(request_cache.PUBLICATION_INFOS, ('uuid', str(info['uuid'])), infos)
+        request_cache.set(request_cache.PUBLICATION_INFOS, ('name', info_workspace, info_type, info_name), infos)
+    return infos
+
+
+def get_publication_lookup_infos(workspace_name=None, pub_type=None, *, pub_name=None, uuid=None, keys=None):
+    """Lightweight variant of get_publication_infos for one publication identified by UUID or by workspace, type and name.
+
+    Only columns of requested keys (out of LOOKUP_COLUMNS) and identity columns are selected, using prepared statement.
+    """
+    assert (uuid is None) != (pub_name is None)
+    if uuid is not None:
+        where_part = 'p.uuid = $1'
+        where_params = (str(uuid),)
+    else:
+        where_part = 'w.name = $1 and p.type = $2 and p.name = $3'
+        where_params = (workspace_name, pub_type, pub_name,)
+    lookup_keys = LOOKUP_IDENTITY_KEYS + sorted(set(keys or []).intersection(LOOKUP_COLUMNS) - set(LOOKUP_IDENTITY_KEYS))
+
+    columns = ',\n       '.join(LOOKUP_COLUMNS[key][1] for key in lookup_keys)
+    users_join = f' left join\n     {DB_SCHEMA}.users u on u.id_workspace = w.id' if 'is_public_workspace' in lookup_keys else ''
+    query = f"""select {columns}
+from {DB_SCHEMA}.workspaces w inner join
+     {DB_SCHEMA}.publications p on p.id_workspace = w.id{users_join}
+where {where_part}"""
+    statement_name = 'layman_publ_lookup_' + hashlib.md5(query.encode()).hexdigest()
+
+    def create_value():
+        infos = {}
+        for row in db_util.run_prepared_query(statement_name, query, where_params):
+            info = {}
+            for key, value in zip(lookup_keys, row):
+                info_key, _, to_info_value = LOOKUP_COLUMNS[key]
+                info[info_key] = to_info_value(value) if to_info_value else value
+            infos[(info['_workspace'], info['type'], info['name'])] = info
+        return infos
+
+    cache_key = ('lookup', statement_name) + where_params
+    return request_cache.get(request_cache.PUBLICATION_INFOS, cache_key, create_value)
 
 
 def get_publication_infos_with_metainfo(workspace_name=None, pub_type=None, *,
@@ -46,8 +131,16 @@ def get_publication_infos_with_metainfo(workspace_name=None, pub_type=None, *,
                                         ordering_full_text=None,
                                         ordering_bbox=None,
                                         ordering_bbox_crs=None,
+                                        after_ordering_values=None,
+                                        with_total_count=True,
                                         ):
+    """Return page of publication infos.
+
+    Page can be defined either by `offset`, or by `after_ordering_values`, i.e. `last_ordering_values` of previous
+    page (keyset pagination). Keyset pagination does not scan skipped publications, so it's fast also for deep pages.
+    """
     order_by_list = order_by_list or []
+    assert offset is None or after_ordering_values is None
 
     full_text_tsquery = db_util.to_tsquery_string(full_text_filter) if full_text_filter else None
     full_text_like = '%' + full_text_filter + '%' if full_text_filter else None
@@ -68,43 +161,24 @@ def get_publication_infos_with_metainfo(workspace_name=None, pub_type=None, *,
         (reader and not is_user_with_name(reader), 'p.everyone_can_read = TRUE', tuple()),
         (is_user_with_name(reader), f"""(p.everyone_can_read = TRUE
                         or (u.id is not null and w.name = %s)
-                        or EXISTS(select 1
-                                  from {DB_SCHEMA}.rights r inner join
-                                       {DB_SCHEMA}.users u2 on r.id_user = u2.id inner join
-                                       {DB_SCHEMA}.workspaces w2 on w2.id = u2.id_workspace
-                                  where r.id_publication = p.id
-                                    and r.type = 'read'
-                                    and w2.name = %s)
-                        or EXISTS(select 1
-                                  from {DB_SCHEMA}.rights r
-                                  where r.id_publication = p.id
-                                    and r.type = 'read'
-                                    and r.role_name = ANY(%s)))""", (reader, reader, reader_roles,)),
+                        or p.read_user_names @> ARRAY[%s]::text[]
+                        or p.read_role_names && %s::text[])""", (reader, reader, reader_roles,)),
         (writer and not is_user_with_name(writer), 'p.everyone_can_write = TRUE', tuple()),
         (is_user_with_name(writer), f"""(p.everyone_can_write = TRUE
                         or (u.id is not null and w.name = %s)
-                        or EXISTS(select 1
-                                  from {DB_SCHEMA}.rights r inner join
-                                       {DB_SCHEMA}.users u2 on r.id_user = u2.id inner join
-                                       {DB_SCHEMA}.workspaces w2 on w2.id = u2.id_workspace
-                                  where r.id_publication = p.id
-                                    and r.type = 'write'
-                                    and w2.name = %s)
-                        or EXISTS(select 1
-                                  from {DB_SCHEMA}.rights r
-                                  where r.id_publication = p.id
-                                    and r.type = 'write'
-                                    and r.role_name = ANY(%s)))""", (writer, writer, writer_roles, )),
+                        or p.write_user_names @> ARRAY[%s]::text[]
+                        or p.write_role_names && %s::text[])""", (writer, writer, writer_roles, )),
         (full_text_filter, '(_prime_schema.my_unaccent(p.title) @@ to_tsquery(unaccent(%s))'
                            'or lower(unaccent(p.title)) like lower(unaccent(%s)))', (full_text_tsquery, full_text_like,)),
         (bbox_filter, bbox_filter_where_part, (filtering_bbox_srid, ) + bbox_filter if bbox_filter else None, ),
     ]
 
+    # ordering -> (expression, direction, params, type of value)
     order_by_definition = {
-        consts.ORDER_BY_FULL_TEXT: ('ts_rank_cd(_prime_schema.my_unaccent(p.title), to_tsquery(unaccent(%s))) DESC',
-                                    (ordering_full_text_tsquery,)),
-        consts.ORDER_BY_TITLE: ("regexp_replace(lower(unaccent(p.title)), '[^a-zA-Z0-9 ]', '', 'g') ASC", tuple()),
-        consts.ORDER_BY_LAST_CHANGE: ('updated_at DESC', tuple()),
+        consts.ORDER_BY_FULL_TEXT: ('ts_rank_cd(_prime_schema.my_unaccent(p.title), to_tsquery(unaccent(%s)))', 'DESC',
+                                    (ordering_full_text_tsquery,), 'real'),
+        consts.ORDER_BY_TITLE: (f"{DB_SCHEMA}.ordering_title(p.title)", 'ASC', tuple(), 'text'),
+        consts.ORDER_BY_LAST_CHANGE: ('p.updated_at', 'DESC', tuple(), 'timestamp with time zone'),
         consts.ORDER_BY_BBOX: ("""
             -- A∩B / (A + B)
             CASE
@@ -121,11 +195,20 @@ def get_publication_infos_with_metainfo(workspace_name=None, pub_type=None, *,
                 -- if there is no intersection, result is 0 in all cases
                 ELSE
                     0
-            END DESC
-            """, tuple()),
+            END
+            """, 'DESC', tuple(), 'double precision'),
     }
+    # tie-breakers making the order unique, needed by keyset pagination
+    unique_order_by_definitions = [
+        ('w.name', 'ASC', tuple(), 'text'),
+        ('p.name', 'ASC', tuple(), 'text'),
+        ('p.type', 'ASC', tuple(), 'text'),
+    ]
 
     assert all(ordering_item in order_by_definition for ordering_item in order_by_list)
+    order_by_definitions = [order_by_definition[order_by_part] for order_by_part in order_by_list] \
+        + unique_order_by_definitions
+    assert after_ordering_values is None or len(after_ordering_values) == len(order_by_definitions)
 
     calculated_columns = []
     ordering_bbox_clause = ''
@@ -169,23 +252,15 @@ select p.id as id_publication,
        p.srid as srid,
        PGP_SYM_DECRYPT(p.external_table_uri, p.uuid::text)::json external_table_uri,
        (select rtrim(concat(case when u.id is not null then w.name || ',' end,
-                            string_agg(COALESCE(w2.name, r.role_name), ',' ORDER BY COALESCE(w2.name, r.role_name)) || ',',
+                            string_agg(user_role_name, ',' ORDER BY user_role_name) || ',',
                             case when p.everyone_can_read then %s || ',' end
                             ), ',')
-        from {DB_SCHEMA}.rights r left join
-             {DB_SCHEMA}.users u2 on r.id_user = u2.id left join
-             {DB_SCHEMA}.workspaces w2 on w2.id = u2.id_workspace
-        where r.id_publication = p.id
-          and r.type = 'read') read_users_roles,
+        from unnest(p.read_user_names || p.read_role_names) user_role_name) read_users_roles,
        (select rtrim(concat(case when u.id is not null then w.name || ',' end,
-                            string_agg(COALESCE(w2.name, r.role_name), ',' ORDER BY COALESCE(w2.name, r.role_name)) || ',',
+                            string_agg(user_role_name, ',' ORDER BY user_role_name) || ',',
                             case when p.everyone_can_write then %s || ',' end
                             ), ',')
-        from {DB_SCHEMA}.rights r left join
-             {DB_SCHEMA}.users u2 on r.id_user = u2.id left join
-             {DB_SCHEMA}.workspaces w2 on w2.id = u2.id_workspace
-        where r.id_publication = p.id
-          and r.type = 'write') write_users_roles,
+        from unnest(p.write_user_names || p.write_role_names) user_role_name) write_users_roles,
        (select json_agg(json_build_object(
                    'name', lr.name,
                    'workspace', layer_ws.name,
@@ -217,13 +292,15 @@ select p.id as id_publication,
             WHEN u.id IS NULL THEN TRUE
                 ELSE FALSE
        END AS is_public_workspace,
-       count(*) OVER() AS full_count
+       {'count(*) OVER()' if with_total_count and after_ordering_values is None else 'NULL::bigint'} AS full_count,
+       {', '.join(f'{expression} AS ordering_value_{idx}' for idx, (expression, _, _, _) in enumerate(order_by_definitions))}
 from {DB_SCHEMA}.workspaces w inner join
      publs p on p.id_workspace = w.id left join
      {DB_SCHEMA}.users u on u.id_workspace = w.id,
      consts
 """
-    select_params = (ROLE_EVERYONE, ROLE_EVERYONE, )
+    select_params = (ROLE_EVERYONE, ROLE_EVERYONE, ) + tuple(
+        param for _, _, params, _ in order_by_definitions for param in params)
 
     #########################################################
     # WHERE clause
@@ -237,17 +314,30 @@ from {DB_SCHEMA}.workspaces w inner join
     if where_parts:
         where_clause = 'WHERE ' + '\n  AND '.join(where_parts) + '\n'
 
+    # Keyset pagination: row has to be after given ordering values in the order, i.e. for some N, first N-1 ordering
+    # values are equal and N-th ordering value is behind
+    keyset_where_clause = ''
+    keyset_params = tuple()
+    if after_ordering_values is not None:
+        keyset_or_parts = []
+        for idx, (expression, direction, params, value_type) in enumerate(order_by_definitions):
+            and_parts = []
+            for prev_idx in range(idx):
+                prev_expression, _, prev_params, prev_value_type = order_by_definitions[prev_idx]
+                and_parts.append(f'{prev_expression} = %s::{prev_value_type}')
+                keyset_params = keyset_params + prev_params + (after_ordering_values[prev_idx],)
+            and_parts.append(f"{expression} {'>' if direction == 'ASC' else '<'} %s::{value_type}")
+            keyset_params = keyset_params + params + (after_ordering_values[idx],)
+            keyset_or_parts.append('(' + ' AND '.join(and_parts) + ')')
+        keyset_where_clause = ('\n  AND ' if where_clause else 'WHERE ') + '(' + '\n    OR '.join(keyset_or_parts) + ')\n'
+
     #########################################################
     # ORDER BY clause
     order_by_params = tuple()
     order_by_parts = []
-    for order_by_part in order_by_list:
-        order_by_parts.append(order_by_definition[order_by_part][0])
-        order_by_params = order_by_params + order_by_definition[order_by_part][1]
-
-    order_by_parts.append('w.name ASC')
-    order_by_parts.append('p.name ASC')
-    order_by_parts.append('p.type ASC')
+    for expression, direction, params, _ in order_by_definitions:
+        order_by_parts.append(f'{expression} {direction}')
+        order_by_params = order_by_params + params
     order_by_clause = 'ORDER BY ' + ', '.join(order_by_parts)
 
     #########################################################
@@ -267,8 +357,9 @@ from {DB_SCHEMA}.workspaces w inner join
     #########################################################
     # Put it together
     with_publications_params = tuple(param for column in calculated_columns for param in column.params)
-    sql_params = with_publications_params + with_consts_params + select_params + where_params + order_by_params + pagination_params
-    select = select_clause + where_clause + order_by_clause + pagination_clause
+    sql_params = with_publications_params + with_consts_params + select_params + where_params + keyset_params \
+        + order_by_params + pagination_params
+    select = select_clause + where_clause + keyset_where_clause + order_by_clause + pagination_clause
     values = db_util.run_query(select, sql_params)
 
     # print(f'get_publication_infos:\n\nselect={select}\n\nsql_params={sql_params}\n\n&&&&&&&&&&&&&&&&&')
@@ -306,22 +397,26 @@ from {DB_SCHEMA}.workspaces w inner join
                                    }
              for id_publication, workspace_name, publication_type, publication_name, title, description, uuid,
              geodata_type, style_type, image_mosaic, updated_at, created_at, xmin, ymin, xmax, ymax,
-             srid, external_table_uri, read_users_roles, write_users_roles, map_layers, layer_maps, wfs_wms_status, is_public_workspace, _
+             srid, external_table_uri, read_users_roles, write_users_roles, map_layers, layer_maps, wfs_wms_status, is_public_workspace, *_
              in values}
 
-    infos = {key: {**value,
-                   'bounding_box': list(bbox_util.transform(value['native_bounding_box'],
-                                                            value['native_crs'],
-                                                            DEFAULT_BBOX_CRS))
-                   if value['native_bounding_box'][0]
-                   and value['native_crs']
-                   and DEFAULT_BBOX_CRS != value['native_crs']
-                   else value['native_bounding_box'],
-                   }
-             for key, value in infos.items()}
-
-    if values:
-        total_count = values[0][-1]
+    keys_by_native_crs = defaultdict(list)
+    for key, value in infos.items():
+        value['bounding_box'] = value['native_bounding_box']
+        if value['native_bounding_box'][0] and value['native_crs'] and DEFAULT_BBOX_CRS != value['native_crs']:
+            keys_by_native_crs[value['native_crs']].append(key)
+    for native_crs, keys in keys_by_native_crs.items():
+        bboxes = bbox_util.transform_many([infos[key]['native_bounding_box'] for key in keys], native_crs, DEFAULT_BBOX_CRS)
+        for key, bbox in zip(keys, bboxes):
+            infos[key]['bounding_box'] = list(bbox)
+
+    num_ordering_values = len(order_by_definitions)
+    last_ordering_values = list(values[-1][-num_ordering_values:]) if values else None
+
+    if not with_total_count:
+        total_count = None
+    elif values and after_ordering_values is None:
+        total_count = values[0][-num_ordering_values - 1]
     else:
         count_clause = f"""
         select count(*) AS full_count
@@ -343,6 +438,7 @@ from {DB_SCHEMA}.workspaces w inner join
     result = {'items': infos,
               'total_count': total_count,
               'content_range': content_range,
+              'last_ordering_values': last_ordering_values,
               }
     return result
 
@@ -491,6 +587,7 @@ def get_user_and_role_names_for_db(users_and_roles_list, workspace_name):
     return users_set, roles_set
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def insert_publication(workspace_name, info):
     id_workspace = workspaces.ensure_workspace(workspace_name)
     check_publication_info(workspace_name, info)
@@ -539,6 +636,7 @@ returning id
     return pub_id
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def update_publication(workspace_name, info, is_part_of_user_delete=False):
     id_workspace = workspaces.get_workspace_infos(workspace_name)[workspace_name]["id"]
     right_type_list = ['read', 'write']
@@ -620,18 +718,21 @@ returning id
     return pub_id
 
 
-def delete_publication(workspace_name, type, name):
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
+def delete_publication(workspace_name, type, name, *, is_part_of_bulk_delete=False):
     workspace_info = workspaces.get_workspace_infos(workspace_name).get(workspace_name)
     result = {}
     if workspace_info:
         publ_info = get_publication_infos(workspace_name, type, pub_name=name).get((workspace_name, type, name), {})
         if publ_info:
-            rights.delete_rights_for_publication(publ_info["id"])
-            id_workspace = workspace_info["id"]
-            sql = f"""delete from {DB_SCHEMA}.publications p where p.id_workspace = %s and p.name = %s and p.type = %s;"""
-            db_util.run_statement(sql, (id_workspace,
-                                        name,
-                                        type,))
+            # record of publication deleted in bulk is deleted later together with other publications by `delete_publications`
+            if not is_part_of_bulk_delete:
+                rights.delete_rights_for_publication(publ_info["id"])
+                id_workspace = workspace_info["id"]
+                sql = f"""delete from {DB_SCHEMA}.publications p where p.id_workspace = %s and p.name = %s and p.type = %s;"""
+                db_util.run_statement(sql, (id_workspace,
+                                            name,
+                                            type,))
             result = {
                 'name': publ_info["name"],
                 'title': publ_info.get("title", None),
@@ -645,6 +746,24 @@ def delete_publication(workspace_name, type, name):
     return result
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
+def delete_publications(uuids):
+    """Delete publications of given UUIDs together with their rights by one statement."""
+    if not uuids:
+        return
+    uuids = [str(uuid) for uuid in uuids]
+    sql = f"""with deleted_rights as (
+    delete from {DB_SCHEMA}.rights r
+    using {DB_SCHEMA}.publications p
+    where r.id_publication = p.id
+      and p.uuid = any(%s::uuid[])
+)
+delete from {DB_SCHEMA}.publications p
+where p.uuid = any(%s::uuid[]);"""
+    db_util.run_statement(sql, (uuids, uuids, ))
+
+
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def set_bbox(workspace, publication_type, publication, bbox, crs, ):
     max_bbox = crs_def.CRSDefinitions[crs].max_bbox if crs else None
     cropped_bbox = (
@@ -664,6 +783,7 @@ def set_bbox(workspace, publication_type, publication, bbox, crs, ):
     db_util.run_statement(query, params)
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def set_geodata_type(workspace, publication_type, publication, geodata_type, ):
     query = f'''update {DB_SCHEMA}.publications set
     geodata_type = %s
@@ -707,6 +827,7 @@ def get_bbox_sphere_size(workspace, publication_type, publication):
     return [x_size, y_size]
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def set_wfs_wms_status(workspace, publication_type, publication, status, ):
     query = f'''update {DB_SCHEMA}.publications set
     wfs_wms_status = %s
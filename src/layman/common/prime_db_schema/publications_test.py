@@ -1,8 +1,12 @@
 import uuid
 import pytest
 
+from db import util as db_util
 from layman import settings, app as app, LaymanError
+from layman.layer import LAYER_TYPE
+from layman.layer.layer_class import Layer
 from layman.map import MAP_TYPE
+from layman.map.map_class import Map
 from test_tools.role_service import ensure_role, delete_role, ensure_user_role, delete_user_role
 from . import publications, workspaces, users
 
@@ -66,6 +70,127 @@ class TestGetPublicationInfos:
         for idx, pub_key in enumerate(response.keys()):
             assert pub_key == expected_publications[idx], f'{idx=}\n{pub_key=}, {expected_publications[idx]=}\n\n{response=}\n{expected_publications=}'
 
+    @pytest.mark.parametrize("query_params, keys", [
+        pytest.param({"uuid": uuid}, None, id='by-uuid'),
+        pytest.param({"workspace_name": workspace, "pub_type": publication_type, "pub_name": name}, ['title', 'id'],
+                     id='by-name'),
+        pytest.param({"uuid": uuid}, ['title', 'updated_at', 'is_public_workspace', 'original_data_source'],
+                     id='by-uuid-with-keys'),
+    ])
+    def test_get_publication_lookup_infos(self, query_params, keys):
+        full_info = publications.get_publication_infos(uuid=self.uuid)[(self.workspace, self.publication_type, self.name)]
+        response = publications.get_publication_lookup_infos(**query_params, keys=keys)
+        assert list(response.keys()) == [(self.workspace, self.publication_type, self.name)]
+        info = response[(self.workspace, self.publication_type, self.name)]
+        exp_info_keys = {'_workspace', 'type', 'name', 'uuid'}.union(
+            publications.LOOKUP_COLUMNS[key][0] for key in keys or [])
+        assert set(info.keys()) == exp_info_keys
+        for key, value in info.items():
+            assert value == full_info[key], f'{key=}'
+
+    def test_get_publication_lookup_infos_not_found(self):
+        assert publications.get_publication_lookup_infos(uuid='959c95fb-ab54-47a6-9694-402926b8fd29') == {}
+
+
+class TestPublicationClassLoad:
+    workspace = 'test_publication_class_load'
+    layername = 'test_publication_class_load_layer'
+    mapname = 'test_publication_class_load_map'
+    layer_uuid = uuid.uuid4()
+    map_uuid = uuid.uuid4()
+    access_rights = {
+        "read": {settings.RIGHTS_EVERYONE_ROLE, },
+        "write": {settings.RIGHTS_EVERYONE_ROLE, },
+    }
+
+    @pytest.fixture(scope="class", autouse=True)
+    def provide_data(self, request):
+        with app.app_context():
+            workspaces.ensure_workspace(self.workspace)
+            publications.insert_publication(self.workspace, {
+                "name": self.layername,
+                "title": self.layername,
+                "publ_type_name": LAYER_TYPE,
+                "uuid": self.layer_uuid,
+                "actor_name": settings.ANONYM_USER,
+                "access_rights": self.access_rights,
+                'image_mosaic': False,
+                'style_type': 'sld',
+                'geodata_type': settings.GEODATA_TYPE_VECTOR,
+                'wfs_wms_status': settings.EnumWfsWmsStatus.AVAILABLE.value,
+            })
+            publications.insert_publication(self.workspace, {
+                "name": self.mapname,
+                "title": self.mapname,
+                "publ_type_name": MAP_TYPE,
+                "uuid": self.map_uuid,
+                "actor_name": settings.ANONYM_USER,
+                "access_rights": self.access_rights,
+                'image_mosaic': False,
+            })
+        yield
+        if request.node.session.testsfailed == 0:
+            with app.app_context():
+                publications.delete_publication(self.workspace, LAYER_TYPE, self.layername)
+                publications.delete_publication(self.workspace, MAP_TYPE, self.mapname)
+                workspaces.delete_workspace(self.workspace)
+
+    def test_layer(self):
+        with app.app_context():
+            for layer in [Layer(uuid=str(self.layer_uuid)), Layer(layer_tuple=(self.workspace, self.layername))]:
+                assert layer.uuid == str(self.layer_uuid)
+                assert (layer.workspace, layer.type, layer.name) == (self.workspace, LAYER_TYPE, self.layername)
+                assert layer.title == self.layername
+                assert layer.geodata_type == settings.GEODATA_TYPE_VECTOR
+                assert layer.style_type == 'sld'
+                assert layer.original_data_source == settings.EnumOriginalDataSource.FILE
+                assert layer.table_uri.table == f'layer_{str(self.layer_uuid).replace("-", "_")}'
+                assert layer.image_mosaic is False
+                assert settings.RIGHTS_EVERYONE_ROLE in layer.access_rights['read']
+
+    def test_map(self):
+        with app.app_context():
+            for map_obj in [Map(uuid=str(self.map_uuid)), Map(map_tuple=(self.workspace, self.mapname))]:
+                assert map_obj.uuid == str(self.map_uuid)
+                assert (map_obj.workspace, map_obj.type, map_obj.name) == (self.workspace, MAP_TYPE, self.mapname)
+                assert map_obj.title == self.mapname
+                assert map_obj.map_layers == []
+                assert settings.RIGHTS_EVERYONE_ROLE in map_obj.access_rights['write']
+
+
+def test_delete_publications():
+    workspace = 'test_delete_publications_workspace'
+    username = 'test_delete_publications_user'
+    names = [f'test_delete_publications_map_{idx}' for idx in range(3)]
+    uuids = [uuid.uuid4() for _ in names]
+    with app.app_context():
+        workspaces.ensure_workspace(workspace)
+        ensure_user(username, '70')
+        for name, publ_uuid in zip(names, uuids):
+            publications.insert_publication(workspace, {
+                'name': name,
+                'title': name,
+                'publ_type_name': MAP_TYPE,
+                'uuid': publ_uuid,
+                'actor_name': username,
+                'access_rights': {'read': {username, settings.RIGHTS_EVERYONE_ROLE},
+                                  'write': {username}},
+                'image_mosaic': False,
+            })
+
+        publications.delete_publications(uuids[:2])
+        publications.delete_publications([])
+        assert set(publications.get_publication_infos(workspace, MAP_TYPE)) == {(workspace, MAP_TYPE, names[2])}
+        # read and write rights of the user are kept only for the remaining publication
+        rights_count = db_util.run_query(f'''select count(*) from {settings.LAYMAN_PRIME_SCHEMA}.rights r inner join
+{settings.LAYMAN_PRIME_SCHEMA}.users u on r.id_user = u.id inner join
+{settings.LAYMAN_PRIME_SCHEMA}.workspaces w on w.id = u.id_workspace where w.name = %s''', (username,))[0][0]
+        assert rights_count == 2
+
+        publications.delete_publication(workspace, MAP_TYPE, names[2])
+        users.delete_user(username)
+        workspaces.delete_workspace(workspace)
+
 
 class TestOnlyValidUserNames:
     workspace_name = 'test_only_valid_names_workspace'
@@ -2,11 +2,43 @@ import logging
 
 from db import util as db_util
 from layman import settings
+from layman.cache import request as request_cache
 
 DB_SCHEMA = settings.LAYMAN_PRIME_SCHEMA
 logger = logging.getLogger(__name__)
 
+# Denormalized copy of rights table in publications table, used for fast filtering of readable/writable publications
+REFRESH_EFFECTIVE_RIGHTS_SQL = f'''update {DB_SCHEMA}.publications p set
+    read_user_names = coalesce((select array_agg(w.name order by w.name)
+                                from {DB_SCHEMA}.rights r inner join
+                                     {DB_SCHEMA}.users u on r.id_user = u.id inner join
+                                     {DB_SCHEMA}.workspaces w on w.id = u.id_workspace
+                                where r.id_publication = p.id
+                                  and r.type = 'read'), '{{}}'),
+    read_role_names = coalesce((select array_agg(r.role_name order by r.role_name)
+                                from {DB_SCHEMA}.rights r
+                                where r.id_publication = p.id
+                                  and r.type = 'read'
+                                  and r.role_name is not null), '{{}}'),
+    write_user_names = coalesce((select array_agg(w.name order by w.name)
+                                 from {DB_SCHEMA}.rights r inner join
+                                      {DB_SCHEMA}.users u on r.id_user = u.id inner join
+                                      {DB_SCHEMA}.workspaces w on w.id = u.id_workspace
+                                 where r.id_publication = p.id
+                                   and r.type = 'write'), '{{}}'),
+    write_role_names = coalesce((select array_agg(r.role_name order by r.role_name)
+                                 from {DB_SCHEMA}.rights r
+                                 where r.id_publication = p.id
+                                   and r.type = 'write'
+                                   and r.role_name is not null), '{{}}')
+'''
 
+
+def refresh_effective_rights(id_publication):
+    db_util.run_statement(REFRESH_EFFECTIVE_RIGHTS_SQL + 'where p.id = %s;', (id_publication,))
+
+
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def insert_rights(id_publication,
                   users,
                   roles,
@@ -35,15 +67,19 @@ returning id
                                 id_publication,
                                 type,
                                 ))
+    refresh_effective_rights(id_publication)
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def delete_rights_for_publication(id_publication):
     sql = f'''delete from {DB_SCHEMA}.rights where id_publication = %s;'''
     db_util.run_statement(sql,
                           (id_publication,)
                           )
+    refresh_effective_rights(id_publication)
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def remove_rights(id_publication, users_list, roles_list, right_type):
     sql = f'''delete from {DB_SCHEMA}.rights
 where id_publication = %s
@@ -71,3 +107,4 @@ where id_publication = %s
                                role,
                                )
                               )
+    refresh_effective_rights(id_publication)
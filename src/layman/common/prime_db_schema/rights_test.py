@@ -0,0 +1,118 @@
+import uuid
+import pytest
+
+from db import util as db_util
+from layman import settings, app
+from layman.map import MAP_TYPE
+from test_tools.role_service import ensure_role, delete_role
+from . import publications, workspaces, users, rights
+from .publications_test import ensure_user
+
+DB_SCHEMA = settings.LAYMAN_PRIME_SCHEMA
+EVERYONE = settings.RIGHTS_EVERYONE_ROLE
+
+
+class TestEffectiveRights:
+    workspace_name = 'test_effective_rights_workspace'
+    username = 'test_effective_rights_user'
+    username2 = 'test_effective_rights_user2'
+    role1 = 'TEST_EFFECTIVE_RIGHTS_ROLE1'
+    role2 = 'TEST_EFFECTIVE_RIGHTS_ROLE2'
+    publication_name = 'test_effective_rights_map'
+    public_publication_name = 'test_effective_rights_public_map'
+    publication_type = MAP_TYPE
+
+    @pytest.fixture(scope="class", autouse=True)
+    def provide_data(self, request):
+        with app.app_context():
+            workspaces.ensure_workspace(self.workspace_name)
+            ensure_user(self.username, '50')
+            ensure_user(self.username2, '60')
+            ensure_role(self.role1)
+            ensure_role(self.role2)
+            for name, access_rights in [
+                (self.publication_name, {'read': {self.username, self.role1},
+                                         'write': {self.username}}),
+                (self.public_publication_name, {'read': {EVERYONE, self.role1},
+                                                'write': {self.username}}),
+            ]:
+                publications.insert_publication(self.workspace_name, {
+                    'name': name,
+                    'title': name,
+                    'publ_type_name': self.publication_type,
+                    'uuid': uuid.uuid4(),
+                    'actor_name': self.username,
+                    'access_rights': access_rights,
+                    'image_mosaic': False,
+                })
+        yield
+        if request.node.session.testsfailed == 0:
+            with app.app_context():
+                publications.delete_publication(self.workspace_name, self.publication_type, self.publication_name)
+                publications.delete_publication(self.workspace_name, self.publication_type, self.public_publication_name)
+                delete_role(self.role1)
+                delete_role(self.role2)
+                users.delete_user(self.username)
+                users.delete_user(self.username2)
+                workspaces.delete_workspace(self.workspace_name)
+
+    def get_id(self, name):
+        return publications.get_publication_infos(self.workspace_name, self.publication_type, pub_name=name)[
+            (self.workspace_name, self.publication_type, name)]['id']
+
+    @staticmethod
+    def get_effective_rights(id_publication):
+        return db_util.run_query(f'''select read_user_names, read_role_names, write_user_names, write_role_names
+from {DB_SCHEMA}.publications where id = %s''', (id_publication,))[0]
+
+    def get_readable_names(self, reader, reader_roles):
+        return {name for _, _, name in publications.get_publication_infos_with_metainfo(
+            self.workspace_name, self.publication_type, reader=reader, reader_roles=reader_roles)['items']}
+
+    def get_writable_names(self, writer, writer_roles):
+        return {name for _, _, name in publications.get_publication_infos_with_metainfo(
+            self.workspace_name, self.publication_type, writer=writer, writer_roles=writer_roles)['items']}
+
+    def test_refresh_effective_rights(self):
+        both_names = {self.publication_name, self.public_publication_name}
+        with app.app_context():
+            id_publication = self.get_id(self.publication_name)
+            public_id_publication = self.get_id(self.public_publication_name)
+
+            # EVERYONE is kept in everyone_can_read, not in role arrays
+            assert self.get_effective_rights(public_id_publication) == ([], [self.role1], [self.username], [])
+            assert self.get_effective_rights(id_publication) == ([self.username], [self.role1], [self.username], [])
+            assert self.get_readable_names(settings.ANONYM_USER, None) == {self.public_publication_name}
+            assert self.get_readable_names(self.username2, [EVERYONE]) == {self.public_publication_name}
+            assert self.get_readable_names(self.username2, [self.role1, EVERYONE]) == both_names
+            assert self.get_readable_names(self.username, [EVERYONE]) == both_names
+            assert self.get_writable_names(self.username, [EVERYONE]) == both_names
+            assert self.get_writable_names(self.username2, [self.role2, EVERYONE]) == set()
+            assert self.get_writable_names(settings.ANONYM_USER, None) == set()
+
+            rights.insert_rights(id_publication, [self.username2], [self.role2], 'read')
+            rights.insert_rights(id_publication, [self.username2], [self.role2], 'write')
+            assert self.get_effective_rights(id_publication) == (
+                [self.username, self.username2], [self.role1, self.role2],
+                [self.username, self.username2], [self.role2])
+            assert self.get_readable_names(self.username2, [EVERYONE]) == both_names
+            assert self.get_writable_names(self.username2, [EVERYONE]) == {self.publication_name}
+            assert self.get_writable_names(self.username2 + '_other', [self.role2, EVERYONE]) == {self.publication_name}
+
+            rights.remove_rights(id_publication, [self.username2], [self.role1], 'read')
+            rights.remove_rights(id_publication, [self.username2], [], 'write')
+            assert self.get_effective_rights(id_publication) == (
+                [self.username], [self.role2], [self.username], [self.role2])
+            assert self.get_readable_names(self.username2, [self.role1, EVERYONE]) == {self.public_publication_name}
+            assert self.get_readable_names(self.username2, [self.role2, EVERYONE]) == both_names
+            assert self.get_writable_names(self.username2, [EVERYONE]) == set()
+            assert self.get_writable_names(self.username2, [self.role2, EVERYONE]) == {self.publication_name}
+
+            rights.delete_rights_for_publication(id_publication)
+            assert self.get_effective_rights(id_publication) == ([], [], [], [])
+            for username in [self.username, self.username2]:
+                assert self.get_readable_names(username, [self.role1, self.role2, EVERYONE]) == {
+                    self.public_publication_name}
+            assert self.get_writable_names(self.username2, [self.role2, EVERYONE]) == set()
+            # rights of other publication are untouched
+            assert self.get_effective_rights(public_id_publication) == ([], [self.role1], [self.username], [])
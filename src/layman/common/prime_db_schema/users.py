@@ -1,10 +1,12 @@
 from db import util as db_util
 from layman import settings
+from layman.cache import request as request_cache
 from . import workspaces
 
 DB_SCHEMA = settings.LAYMAN_PRIME_SCHEMA
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def ensure_user(id_workspace, userinfo):
     users = get_user_infos(id_workspace=id_workspace)
     if users:
@@ -12,7 +14,8 @@ def ensure_user(id_workspace, userinfo):
     else:
         sql = f"""insert into {DB_SCHEMA}.users (id_workspace, preferred_username, given_name, family_name, middle_name, name, email, issuer_id, sub)
     values (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-    ON CONFLICT (id_workspace) DO update SET id_workspace = EXCLUDED.id_workspace returning id;"""
+    ON CONFLICT (id_workspace) DO update SET id_workspace = EXCLUDED.id_workspace
+    returning id, (select w.name from {DB_SCHEMA}.workspaces w where w.id = id_workspace);"""
         data = (id_workspace,
                 userinfo["claims"]["preferred_username"],
                 userinfo["claims"]["given_name"],
@@ -24,15 +27,21 @@ def ensure_user(id_workspace, userinfo):
                 userinfo["sub"],
                 )
         ids = db_util.run_query(sql, data)
-        result = ids[0][0]
+        result, username = ids[0]
+        # new user gets roles from role service views
+        from layman.authz import role_service
+        role_service.invalidate_user_roles(username)
     return result
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def delete_user(username):
     sql = f"delete from {DB_SCHEMA}.users where id_workspace = (select w.id from {DB_SCHEMA}.workspaces w where w.name = %s);"
     deleted = db_util.run_statement(sql, (username,))
     if deleted:
         workspaces.delete_workspace(username)
+        from layman.authz import role_service
+        role_service.invalidate_user_roles(username)
 
 
 def get_user_infos(username=None,
@@ -1,5 +1,6 @@
 from db import util as db_util
 from layman import settings
+from layman.cache import request as request_cache
 from layman.common import empty_method
 
 DB_SCHEMA = settings.LAYMAN_PRIME_SCHEMA
@@ -21,6 +22,7 @@ def ensure_workspace(name):
     return result
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def delete_workspace(name):
     sql = f"delete from {DB_SCHEMA}.workspaces where name = %s;"
     db_util.run_statement(sql, (name,))
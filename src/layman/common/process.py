@@ -0,0 +1,82 @@
+import os
+import selectors
+import subprocess
+import time
+from dataclasses import dataclass
+
+# How long (in seconds) to wait for process output or process end in one iteration
+POLL_TIMEOUT = 0.5
+# Minimal time (in seconds) between two calls of is_aborted callback, e.g. AbortableTask.is_aborted
+ABORT_CHECK_INTERVAL = 1
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ProcessResult:
+    return_code: int
+    output: bytes
+    aborted: bool
+
+
+def terminate_processes(processes):
+    for process in processes:
+        if process.poll() is None:
+            process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=POLL_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def supervise(processes, *, is_aborted=None, abort_check_interval=ABORT_CHECK_INTERVAL, poll_timeout=POLL_TIMEOUT):
+    """Wait until all processes end without busy waiting, while continuously reading their piped output.
+
+    Processes are expected to form a pipeline, i.e. return code of the last process is returned. Output is collected
+    from all pipes still opened by the caller, so that no process is blocked by full pipe buffer. If `is_aborted`
+    callback returns True, all processes are terminated and result with `aborted=True` is returned.
+    """
+    if not isinstance(processes, (list, tuple)):
+        processes = [processes]
+
+    output_chunks = []
+    last_abort_check = time.monotonic()
+    with selectors.DefaultSelector() as selector:
+        for process in processes:
+            if process.stdout is not None and not process.stdout.closed:
+                selector.register(process.stdout, selectors.EVENT_READ)
+
+        while True:
+            if selector.get_map():
+                for key, _ in selector.select(timeout=poll_timeout):
+                    chunk = os.read(key.fd, READ_CHUNK_SIZE)
+                    if chunk:
+                        output_chunks.append(chunk)
+                    else:
+                        selector.unregister(key.fileobj)
+            else:
+                running_processes = [process for process in processes if process.poll() is None]
+                if running_processes:
+                    try:
+                        running_processes[0].wait(timeout=poll_timeout)
+                    except subprocess.TimeoutExpired:
+                        pass
+
+            if not selector.get_map() and all(process.poll() is not None for process in processes):
+                break
+
+            now = time.monotonic()
+            if is_aborted is not None and now - last_abort_check >= abort_check_interval:
+                last_abort_check = now
+                if is_aborted():
+                    terminate_processes(processes)
+                    return ProcessResult(return_code=processes[-1].poll(),
+                                         output=b''.join(output_chunks),
+                                         aborted=True,
+                                         )
+
+    return ProcessResult(return_code=processes[-1].poll(),
+                         output=b''.join(output_chunks),
+                         aborted=False,
+                         )
@@ -0,0 +1,45 @@
+import subprocess
+import time
+
+from . import process as process_util
+
+
+def test_supervise_reads_output_larger_than_pipe_buffer():
+    # pylint: disable=consider-using-with
+    process = subprocess.Popen(['bash', '-c', 'head -c 500000 /dev/zero; echo error >&2; exit 3'],
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT)
+    result = process_util.supervise(process)
+    assert result.return_code == 3
+    assert len(result.output) == 500000 + len('error\n')
+    assert not result.aborted
+
+
+def test_supervise_pipeline():
+    # pylint: disable=consider-using-with
+    first_process = subprocess.Popen(['bash', '-c', 'sleep 0.2; echo abc'], stdout=subprocess.PIPE)
+    with first_process.stdout:
+        # pylint: disable=consider-using-with
+        second_process = subprocess.Popen(['tr', 'a-z', 'A-Z'], stdin=first_process.stdout, stdout=subprocess.PIPE)
+    result = process_util.supervise([first_process, second_process])
+    assert result.return_code == 0
+    assert result.output == b'ABC\n'
+    assert not result.aborted
+
+
+def test_supervise_abort():
+    abort_checks = []
+
+    def is_aborted():
+        abort_checks.append(time.monotonic())
+        return len(abort_checks) >= 2
+
+    # pylint: disable=consider-using-with
+    process = subprocess.Popen(['sleep', '30'], stdout=subprocess.PIPE)
+    start = time.monotonic()
+    result = process_util.supervise(process, is_aborted=is_aborted, abort_check_interval=0.2, poll_timeout=0.1)
+    assert result.aborted
+    assert process.poll() is not None
+    assert time.monotonic() - start < 5
+    assert len(abort_checks) == 2
+    assert abort_checks[1] - abort_checks[0] >= 0.2
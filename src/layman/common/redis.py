@@ -3,6 +3,7 @@ from flask import request, current_app
 
 from layman import settings, celery as celery_util, common, util as layman_util
 from layman import LaymanError
+from layman.cache import request as request_cache
 
 PUBLICATION_LOCKS_KEY = f'{__name__}:PUBLICATION_LOCKS'
 
@@ -78,7 +79,7 @@ def create_lock_decorator_by_uuid(is_chain_ready_fn):
 def get_publication_lock(workspace, publication_type, publication_name):
     rds = settings.LAYMAN_REDIS
     key = PUBLICATION_LOCKS_KEY
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     return rds.hget(key, hash)
 
 
@@ -86,17 +87,20 @@ def lock_publication(workspace, publication_type, publication_name, lock_method)
     current_app.logger.info(f"Locking {workspace}:{publication_type}:{publication_name} with {lock_method.upper()}")
     rds = settings.LAYMAN_REDIS
     key = PUBLICATION_LOCKS_KEY
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     value = lock_method.lower()
     rds.hset(key, hash, value)
+    # publication is going to be changed, values read so far are not reliable anymore
+    request_cache.invalidate(request_cache.PUBLICATION_INFOS)
 
 
 def unlock_publication(workspace, publication_type, publication_name):
     current_app.logger.info(f"Unlocking {workspace}:{publication_type}:{publication_name}")
     rds = settings.LAYMAN_REDIS
     key = PUBLICATION_LOCKS_KEY
-    hash = _get_publication_hash(workspace, publication_type, publication_name)
+    hash = common.get_publication_hash(workspace, publication_type, publication_name)
     rds.hdel(key, hash)
+    request_cache.invalidate(request_cache.PUBLICATION_INFOS)
 
 
 def unlock_publication_by_uuid(uuid):
@@ -131,8 +135,3 @@ def solve_locks(workspace, publication_type, publication_name, requested_lock):
         if current_lock == common.PUBLICATION_LOCK_FEATURE_CHANGE and requested_lock in [common.REQUEST_METHOD_PATCH, common.REQUEST_METHOD_POST, ]:
             celery_util.abort_publication_chain(workspace, publication_type, publication_name)
             celery_util.push_step_to_run_after_chain(workspace, publication_type, publication_name, 'layman.util::patch_after_feature_change')
-
-
-def _get_publication_hash(workspace, publication_type, publication_name):
-    hash = f"{workspace}:{publication_type}:{publication_name}"
-    return hash
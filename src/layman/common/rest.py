@@ -1,3 +1,7 @@
+import base64
+import binascii
+import datetime
+import json
 import re
 from flask import jsonify, make_response
 
@@ -153,6 +157,45 @@ def get_integer_from_param(request_args, param_name, negative=True, zero=True, p
     return result
 
 
+def encode_cursor(order_by_list, position, ordering_values):
+    """Create opaque token pointing behind the last publication of a page, see decode_cursor."""
+    data = {
+        'order_by': order_by_list,
+        'position': position,
+        'values': [value.isoformat() if isinstance(value, datetime.datetime) else value for value in ordering_values],
+    }
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(request_args, param_name, order_by_list):
+    """Return tuple (position, ordering_values) from cursor created by encode_cursor, or (None, None)."""
+    if not request_args.get(param_name):
+        return None, None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(request_args[param_name].encode()))
+        position = data['position']
+        ordering_values = data['values']
+        valid = data['order_by'] == order_by_list and isinstance(position, int) and position >= 0 \
+            and isinstance(ordering_values, list)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise LaymanError(2, {'parameter': param_name,
+                              'expected': f'Value of {consts.NEXT_CURSOR_HEADER} header of previous response with '
+                                          f'the same value of "{consts.ORDER_BY_PARAM}" parameter.'})
+    return position, ordering_values
+
+
+def get_boolean_from_param(request_args, param_name, default):
+    result = default
+    if request_args.get(param_name):
+        value = request_args[param_name].lower()
+        if value not in ('true', 'false'):
+            raise LaymanError(2, {'parameter': param_name, 'expected': ['true', 'false'], 'value': request_args[param_name]})
+        result = value == 'true'
+    return result
+
+
 def get_publications(publication_type, actor, request_args=None, workspace=None, *, x_forwarded_items=None):
     request_args = request_args or {}
     known_order_by_values = [consts.ORDER_BY_TITLE, consts.ORDER_BY_FULL_TEXT, consts.ORDER_BY_LAST_CHANGE,
@@ -223,6 +266,11 @@ def get_publications(publication_type, actor, request_args=None, workspace=None,
     # Pagination
     limit = get_integer_from_param(request_args, consts.LIMIT, negative=False)
     offset = get_integer_from_param(request_args, consts.OFFSET, negative=False)
+    cursor_position, after_ordering_values = decode_cursor(request_args, consts.CURSOR, order_by_list)
+    with_total_count = get_boolean_from_param(request_args, consts.TOTAL_COUNT, default=True)
+
+    if offset is not None and cursor_position is not None:
+        raise LaymanError(48, f'Parameters "{consts.OFFSET}" and "{consts.CURSOR}" can not be used together.')
 
     #########################################################
     publication_infos_whole = layman_util.get_publication_infos_with_metainfo(publ_type=publication_type,
@@ -237,7 +285,9 @@ def get_publications(publication_type, actor, request_args=None, workspace=None,
                                                                               order_by_list=order_by_list,
                                                                               ordering_full_text=ordering_full_text,
                                                                               ordering_bbox=ordering_bbox,
-                                                                              ordering_bbox_crs=ordering_bbox_crs
+                                                                              ordering_bbox_crs=ordering_bbox_crs,
+                                                                              after_ordering_values=after_ordering_values,
+                                                                              with_total_count=with_total_count,
                                                                               )
 
     infos = []
@@ -263,8 +313,17 @@ def get_publications(publication_type, actor, request_args=None, workspace=None,
             rest_info.pop(info_key_to_remove, None)
         infos.append(rest_info)
 
+    content_range = publication_infos_whole["content_range"]
+    if cursor_position is not None and infos:
+        content_range = (cursor_position + 1, cursor_position + len(infos))
+    total_count = publication_infos_whole['total_count']
+
     response = make_response(jsonify(infos), 200)
-    response.headers['X-Total-Count'] = publication_infos_whole['total_count']
-    response.headers['Content-Range'] = f'items {publication_infos_whole["content_range"][0]}-' \
-                                        f'{publication_infos_whole["content_range"][1]}/{publication_infos_whole["total_count"]}'
+    if total_count is not None:
+        response.headers['X-Total-Count'] = total_count
+    response.headers['Content-Range'] = f'items {content_range[0]}-{content_range[1]}/' \
+                                        f'{total_count if total_count is not None else "*"}'
+    if limit and len(infos) == limit:
+        response.headers[consts.NEXT_CURSOR_HEADER] = encode_cursor(order_by_list, content_range[1],
+                                                                    publication_infos_whole['last_ordering_values'])
     return response
@@ -3,11 +3,10 @@ import traceback
 from collections import defaultdict
 
 from urllib import parse
-import requests
 from requests.structures import CaseInsensitiveDict
 from lxml import etree as ET
 
-from flask import Blueprint, g, current_app as app, request, Response
+from flask import Blueprint, g, current_app as app, request, Response, stream_with_context
 
 import crs as crs_def
 from geoserver.util import reset as gs_reset
@@ -16,13 +15,17 @@ from layman.authn import authenticate, is_user_with_name
 from layman.layer import db
 from layman.layer.layer_class import Layer
 from layman.layer.geoserver import geoserver_layername_to_uuid
+from layman.layer.prime_db_schema import file_data
 from layman.layer.qgis import wms as qgis_wms
 from layman.layer.util import patch_after_feature_change
 from layman.util import WORKSPACE_NAME_ONLY_PATTERN
+from requests_util.pool import get_pooled_session
 
 
 bp = Blueprint('geoserver_proxy_bp', __name__)
 
+GML_NAMESPACES = {'http://www.opengis.net/gml', 'http://www.opengis.net/gml/3.2', }
+
 
 @bp.before_request
 @authenticate
@@ -170,22 +173,31 @@ def extract_attributes_from_wfs_t_update(action, xml_tree, major_version="2"):
     return attribs
 
 
+def extract_layer_info_from_wfs_t_insert_replace(layer, action):
+    result = (None, None)
+    layer_qname = ET.QName(layer)
+    ws_namespace = layer_qname.namespace
+    ws_match = re.match(r"^http://(" + WORKSPACE_NAME_ONLY_PATTERN + ")$", ws_namespace)
+    if ws_match:
+        ws_name = ws_match.group(1)
+    else:
+        if ws_namespace != 'http://www.opengis.net/ogc' and not ws_namespace.startswith('http://www.opengis.net/fes/'):
+            app.logger.warning(f"WFS Proxy: skipping due to wrong namespace name. Namespace={ws_namespace}, action={ET.QName(action)}")
+        return result
+    gs_layer_name = layer_qname.localname
+    layer_uuid = geoserver_layername_to_uuid(geoserver_workspace=ws_name, geoserver_name=gs_layer_name)
+    if not layer_uuid:
+        app.logger.warning(f"WFS Proxy: skipping due to wrong layer name. Layer name={gs_layer_name}")
+        return result
+    result = (ws_namespace, layer_uuid)
+    return result
+
+
 def extract_attributes_from_wfs_t_insert_replace(action):
     attribs = set()
     for layer in action:
-        layer_qname = ET.QName(layer)
-        ws_namespace = layer_qname.namespace
-        ws_match = re.match(r"^http://(" + WORKSPACE_NAME_ONLY_PATTERN + ")$", ws_namespace)
-        if ws_match:
-            ws_name = ws_match.group(1)
-        else:
-            if ws_namespace != 'http://www.opengis.net/ogc' and not ws_namespace.startswith('http://www.opengis.net/fes/'):
-                app.logger.warning(f"WFS Proxy: skipping due to wrong namespace name. Namespace={ws_namespace}, action={ET.QName(action)}")
-            continue
-        gs_layer_name = layer_qname.localname
-        layer_uuid = geoserver_layername_to_uuid(geoserver_workspace=ws_name, geoserver_name=gs_layer_name)
+        ws_namespace, layer_uuid = extract_layer_info_from_wfs_t_insert_replace(layer, action)
         if not layer_uuid:
-            app.logger.warning(f"WFS Proxy: skipping due to wrong layer name. Layer name={gs_layer_name}")
             continue
         for attrib in layer:
             attrib_qname = ET.QName(attrib)
@@ -200,6 +212,52 @@ def extract_attributes_from_wfs_t_insert_replace(action):
     return attribs
 
 
+def extract_gml_geometries(element):
+    return [ET.tostring(child, encoding='unicode')
+            for child in element.iter()
+            if isinstance(child.tag, str) and ET.QName(child).namespace in GML_NAMESPACES
+            and ET.QName(child.getparent()).namespace not in GML_NAMESPACES]
+
+
+def extract_geometries_from_wfs_t(binary_data):
+    """Return GML geometries of inserted, replaced and updated features, grouped by layer UUID."""
+    xml_tree = ET.XML(binary_data)
+    geometries = defaultdict(list)
+    if xml_tree.get('service').upper() != 'WFS':
+        return geometries
+    for action in xml_tree:
+        action_qname = ET.QName(action)
+        if action_qname.localname in ('Insert', 'Replace',):
+            for layer in action:
+                _, layer_uuid = extract_layer_info_from_wfs_t_insert_replace(layer, action)
+                if layer_uuid:
+                    geometries[layer_uuid].extend(extract_gml_geometries(layer))
+        elif action_qname.localname in ('Update',):
+            _, layer_uuid = extract_layer_info_from_wfs_t_update_delete(action)
+            if layer_uuid:
+                properties = [child for child in action if ET.QName(child).localname == 'Property']
+                geometries[layer_uuid].extend(geometry for prop in properties
+                                              for geometry in extract_gml_geometries(prop))
+    return geometries
+
+
+def get_changed_bbox(layer, gml_geometries):
+    """Return bbox of edited geometries in native CRS of the layer, or None if it can not be computed.
+
+    Empty bbox is returned if no geometry was inserted or updated, e.g. by delete-only transaction.
+    """
+    if not gml_geometries:
+        return (None, None, None, None)
+    table_uri = layer.table_uri
+    try:
+        srid = db.get_column_srid(table_uri.schema, table_uri.table, table_uri.geo_column, uri_str=table_uri.db_uri_str)
+        bbox = db.get_gml_geometries_bbox(gml_geometries, srid=srid, uri_str=table_uri.db_uri_str)
+    except BaseException as err:
+        app.logger.warning(f"WFS Proxy: bbox of edited geometries not computed, layer={layer.uuid}, error={err}")
+        bbox = None
+    return bbox
+
+
 def extract_workspace_from_url(url):
     parts = url.split('/')
     workspace = parts[0] if len(parts) == 2 else None
@@ -238,7 +296,9 @@ def proxy(subpath):
     # ensure layer attributes in case of WFS-T
     app.logger.info(f"{request.method} GeoServer proxy, headers_req={headers_req}, url={url}")
     wfs_t_layers = set()
-    if data is not None and len(data) > 0:
+    # None means that edited geometries are not known, so full extent of changed layers is computed
+    wfs_t_geometries = None
+    if request.method == 'POST' and data is not None and len(data) > 0:
         try:
             wfs_t_attribs, wfs_t_layers = extract_attributes_and_layers_from_wfs_t(data)
             if wfs_t_attribs:
@@ -247,6 +307,11 @@ def proxy(subpath):
             raise err
         except BaseException as err:
             app.logger.warning(f"WFS Proxy: error={err}, trace={traceback.format_exc()}")
+        if wfs_t_layers:
+            try:
+                wfs_t_geometries = extract_geometries_from_wfs_t(data)
+            except BaseException as err:
+                app.logger.warning(f"WFS Proxy: edited geometries not extracted, error={err}, trace={traceback.format_exc()}")
 
     query_params = CaseInsensitiveDict(request.args.to_dict())
 
@@ -282,25 +347,46 @@ def proxy(subpath):
 
     app.logger.info(f"{request.method} GeoServer proxy, final_url={url}")
 
-    response = requests.request(method=request.method,
-                                url=url,
-                                data=data,
-                                headers=headers_req,
-                                cookies=request.cookies,
-                                allow_redirects=False,
-                                timeout=settings.DEFAULT_CONNECTION_TIMEOUT,
-                                )
-
-    if response.status_code == 200:
-        for layer_uuid in wfs_t_layers:
-            layer = Layer(uuid=layer_uuid)
-            if authz.can_i_edit(uuid=layer_uuid) and layer.geodata_type == settings.GEODATA_TYPE_VECTOR:
-                patch_after_feature_change(layer.workspace, layer.name)
+    session = get_pooled_session('geoserver_proxy',
+                                 pool_connections=settings.LAYMAN_GS_PROXY_POOL_SIZE,
+                                 pool_maxsize=settings.LAYMAN_GS_PROXY_POOL_SIZE)
+    response = session.request(method=request.method,
+                               url=url,
+                               data=data,
+                               headers=headers_req,
+                               cookies=request.cookies,
+                               allow_redirects=False,
+                               timeout=settings.DEFAULT_CONNECTION_TIMEOUT,
+                               stream=True,
+                               )
+
+    try:
+        if response.status_code == 200:
+            for layer_uuid in wfs_t_layers:
+                layer = Layer(uuid=layer_uuid)
+                if authz.can_i_edit(uuid=layer_uuid) and layer.geodata_type == settings.GEODATA_TYPE_VECTOR:
+                    changed_bbox = get_changed_bbox(layer, wfs_t_geometries.get(layer_uuid, [])) \
+                        if wfs_t_geometries is not None else None
+                    file_data.add_changed_bbox(layer_uuid, changed_bbox)
+                    patch_after_feature_change(layer.workspace, layer.name)
+    except BaseException:
+        response.close()
+        raise
 
     excluded_headers = ['content-encoding', 'content-length', 'transfer-encoding', 'connection']
     headers = {key: value for (key, value) in response.headers.items() if key.lower() not in excluded_headers}
 
-    final_response = Response(response.content,
+    final_response = Response(stream_with_context(_iter_response_content(response)),
                               response.status_code,
                               headers)
     return final_response
+
+
+def _iter_response_content(response):
+    try:
+        # decode_content=True, because content-encoding header is not passed to the client
+        for chunk in response.iter_content(chunk_size=settings.LAYMAN_GS_PROXY_CHUNK_SIZE):
+            yield chunk
+    finally:
+        # returns connection to the pool
+        response.close()
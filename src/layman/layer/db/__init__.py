@@ -10,7 +10,7 @@ from psycopg2 import sql
 from psycopg2.errors import InsufficientPrivilege
 
 from db import util as db_util
-from layman.common import empty_method
+from layman.common import empty_method, process as process_util, bbox as bbox_util
 from layman.common.language import get_languages_iso639_2
 from layman.http import LaymanError
 from layman import settings
@@ -44,11 +44,9 @@ def get_usernames():
 
 def import_vector_file_to_internal_table(schema, table, main_filepath, crs_id):
     process = import_vector_file_to_internal_table_async(schema, table, main_filepath, crs_id)
-    while process.poll() is None:
-        pass
-    return_code = process.poll()
-    if return_code != 0:
-        pg_error = str(process.stdout.read())
+    process_result = process_util.supervise(process)
+    if process_result.return_code != 0:
+        pg_error = str(process_result.output)
         raise LaymanError(11, private_data=pg_error)
 
 
@@ -478,6 +476,64 @@ def get_bbox(schema, table_name, uri_str=None, column=settings.OGR_DEFAULT_GEOME
     return result
 
 
+def get_gml_geometries_bbox(gml_geometries, *, srid, uri_str=None):
+    """Return bbox of GML geometries transformed to `srid`. Geometries without srsName are considered to be in `srid`."""
+    query = '''
+    with geoms as (select ST_GeomFromGML(gml) as geom
+                   from unnest(%s::text[]) gml
+    ), tmp as (select ST_Extent(ST_Transform(case when ST_SRID(geom) = 0 then ST_SetSRID(geom, %s) else geom end,
+                                             %s)) as bbox
+               from geoms
+    )
+    select st_xmin(bbox),
+           st_ymin(bbox),
+           st_xmax(bbox),
+           st_ymax(bbox)
+    from tmp
+    '''
+    result = db_util.run_query(query, (list(gml_geometries), srid, srid), uri_str=uri_str)[0]
+    return result
+
+
+def get_bbox_after_feature_change(schema, table_name, bbox, changed_bboxes, *, uri_str=None,
+                                  column=settings.OGR_DEFAULT_GEOMETRY_COLUMN):
+    """Return bbox of the table from its bbox before feature change and bboxes of inserted or updated features.
+
+    Full-table ST_Extent is computed only if bbox of some feature change is not known, or if some edge of the
+    resulting bbox is not touched by any feature anymore, i.e. feature defining it was deleted or moved. Edges are
+    checked by `&&` operator that is able to use spatial index.
+    """
+    if bbox_util.is_empty(bbox) or any(changed_bbox is None for changed_bbox in changed_bboxes):
+        return get_bbox(schema, table_name, uri_str=uri_str, column=column)
+    for changed_bbox in changed_bboxes:
+        if not bbox_util.is_empty(changed_bbox):
+            bbox = (
+                min(bbox[0], changed_bbox[0]),
+                min(bbox[1], changed_bbox[1]),
+                max(bbox[2], changed_bbox[2]),
+                max(bbox[3], changed_bbox[3]),
+            )
+    xmin, ymin, xmax, ymax = bbox
+    srid = get_column_srid(schema, table_name, column, uri_str=uri_str)
+    edge_query = sql.SQL('''exists(select from {table} l where l.{column} && ST_MakeEnvelope(%s, %s, %s, %s, %s))''').format(
+        table=sql.Identifier(schema, table_name),
+        column=sql.Identifier(column),
+    )
+    query = sql.SQL('select ') + sql.SQL(' and ').join([edge_query] * 4)
+    edges = [
+        (xmin, ymin, xmin, ymax),
+        (xmin, ymin, xmax, ymin),
+        (xmax, ymin, xmax, ymax),
+        (xmin, ymax, xmax, ymax),
+    ]
+    params = tuple(coord for edge in edges for coord in edge + (srid,))
+    all_edges_touched = db_util.run_query(query, params, uri_str=uri_str)[0][0]
+    if not all_edges_touched:
+        logger.info(f"Some edge of bbox {bbox} of {schema}.{table_name} is not touched by any feature, computing full extent")
+        bbox = get_bbox(schema, table_name, uri_str=uri_str, column=column)
+    return bbox
+
+
 def get_table_crs(schema, table_name, uri_str=None, column=settings.OGR_DEFAULT_GEOMETRY_COLUMN, *, use_internal_srid):
     srid = get_column_srid(schema, table_name, column, uri_str=uri_str)
     crs = db_util.get_crs_from_srid(srid, uri_str, use_internal_srid=use_internal_srid)
@@ -5,7 +5,8 @@ import sys
 import uuid
 
 import pytest
-from db import TableUri
+from psycopg2 import sql
+from db import TableUri, util as db_util
 
 del sys.modules['layman']
 
@@ -321,3 +322,55 @@ def test_single_point_table_bbox(single_point_table: TableUri):
     with layman.app_context():
         bbox = db.get_bbox(single_point_table.schema, single_point_table.table, column=single_point_table.geo_column)
     assert bbox[0] == bbox[2] and bbox[1] == bbox[3], bbox
+
+
+def test_bbox_after_feature_change(populated_places_table: TableUri):
+    table_uri = populated_places_table
+    with layman.app_context():
+        bbox = db.get_bbox(table_uri.schema, table_uri.table, column=table_uri.geo_column)
+        inner_bbox = ((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2, (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2)
+        outer_bbox = (bbox[0] - 1, bbox[1] - 1, bbox[2] + 1, bbox[3] + 1)
+        for changed_bboxes in [
+            [],
+            [(None, None, None, None)],
+            [None],
+            [inner_bbox],
+            [outer_bbox],
+        ]:
+            result = db.get_bbox_after_feature_change(table_uri.schema, table_uri.table, bbox, changed_bboxes,
+                                                      column=table_uri.geo_column)
+            assert tuple(result) == tuple(bbox), changed_bboxes
+
+
+@pytest.mark.parametrize("posted_layer", [
+    pytest.param(('bbox_after_insert', 'tmp/naturalearth/110m/cultural/ne_110m_populated_places.geojson'),
+                 id='populated_places'),
+], indirect=["posted_layer"])
+def test_bbox_after_feature_change_insert_and_delete(posted_layer: TableUri):
+    table_uri = posted_layer
+    table = sql.Identifier(table_uri.schema, table_uri.table)
+    column = sql.Identifier(table_uri.geo_column)
+    with layman.app_context():
+        bbox = db.get_bbox(table_uri.schema, table_uri.table, column=table_uri.geo_column)
+        srid = db.get_column_srid(table_uri.schema, table_uri.table, table_uri.geo_column)
+        new_x, new_y = bbox[0] - 0.5, bbox[1] - 0.5
+
+        # insert outside of current bbox
+        db_util.run_statement(sql.SQL('insert into {table} ({column}) values (ST_SetSRID(ST_MakePoint(%s, %s), %s))').format(
+            table=table, column=column), (new_x, new_y, srid))
+        gml_point = f'<gml:Point xmlns:gml="http://www.opengis.net/gml"><gml:coordinates>{new_x},{new_y}</gml:coordinates></gml:Point>'
+        changed_bbox = db.get_gml_geometries_bbox([gml_point], srid=srid)
+        assert tuple(changed_bbox) == (new_x, new_y, new_x, new_y)
+        exp_bbox = (new_x, new_y, bbox[2], bbox[3])
+        for changed_bboxes in [[changed_bbox], [None]]:
+            result = db.get_bbox_after_feature_change(table_uri.schema, table_uri.table, bbox, changed_bboxes,
+                                                      column=table_uri.geo_column)
+            assert tuple(result) == exp_bbox, changed_bboxes
+        assert tuple(db.get_bbox(table_uri.schema, table_uri.table, column=table_uri.geo_column)) == exp_bbox
+
+        # delete feature defining two edges of bbox
+        db_util.run_statement(sql.SQL('delete from {table} where ST_X({column}) = %s and ST_Y({column}) = %s').format(
+            table=table, column=column), (new_x, new_y))
+        result = db.get_bbox_after_feature_change(table_uri.schema, table_uri.table, exp_bbox,
+                                                  [(None, None, None, None)], column=table_uri.geo_column)
+        assert tuple(result) == tuple(bbox)
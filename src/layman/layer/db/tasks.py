@@ -2,7 +2,7 @@ from celery.utils.log import get_task_logger
 
 import crs as crs_def
 from layman.celery import AbortedException
-from layman.common import empty_method_returns_true
+from layman.common import empty_method_returns_true, process as process_util
 from layman import celery_app, util as layman_util, settings
 from layman.http import LaymanError
 from layman.layer import db
@@ -62,30 +62,25 @@ def refresh_table(
                                                                                  main_filepath,
                                                                                  crs_id,
                                                                                  )
-        process = processes[-1]
-        stdout, stderr = process.communicate()
-        return_code = process.poll()
-        if self.is_aborted():
-            logger.info(f'terminating {layer.workspace} {layer.name}')
-            for proc in processes:
-                proc.terminate()
+        process_result = process_util.supervise(processes, is_aborted=self.is_aborted)
+        if process_result.aborted:
+            logger.info(f'terminated {layer.workspace} {layer.name}')
             logger.info(f'deleting {layer.workspace} {layer.name}')
             table.delete_layer(layer=layer)
             raise AbortedException
-        if return_code != 0 or stdout or stderr:
+        stdout = process_result.output
+        if process_result.return_code != 0 or stdout:
             info = table.get_layer_info(layer.workspace, layer.name)
             if not info:
-                str_error = str(stderr)
                 str_out = str(stdout)
-                logger.error(f"STDOUT: {str(stdout)}")
-                logger.error(f"STDERR: {str_error}")
+                logger.error(f"STDOUT: {str_out}")
                 if "ERROR:  zero-length delimited identifier at or near" in str_out:
                     err_code = 28
                 elif 'ERROR:  invalid byte sequence for encoding "UTF8":' in str_out:
                     continue
                 else:
                     err_code = 11
-                raise LaymanError(err_code, private_data=str_error)
+                raise LaymanError(err_code, private_data=str_out)
         break
 
     crs = db.get_table_crs(db_names.schema, db_names.table, use_internal_srid=True)
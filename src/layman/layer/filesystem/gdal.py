@@ -3,6 +3,8 @@ import os
 import shutil
 import subprocess
 import logging
+from dataclasses import dataclass
+from cacheout import Cache
 from lxml import etree as ET
 from osgeo import gdal, gdalconst, osr
 from layman import patch_mode, settings, LaymanError
@@ -15,6 +17,29 @@ from ..layer_class import Layer
 PATCH_MODE = patch_mode.DELETE_IF_DEPENDANT
 logger = logging.getLogger(__name__)
 
+# Properties of raster files keyed by file path and version (mtime and size), so that each file is inspected only once
+RASTER_INFO_CACHE = Cache(maxsize=4096, ttl=60 * 60)
+
+ALL_MASK_FLAGS = [
+    gdalconst.GMF_ALL_VALID,
+    gdalconst.GMF_ALPHA,
+    gdalconst.GMF_NODATA,
+    gdalconst.GMF_PER_DATASET,
+]
+
+
+@dataclass(frozen=True)
+# pylint: disable=too-many-instance-attributes
+class RasterInfo:
+    driver_short_name: str
+    raster_size: tuple
+    geo_transform: tuple
+    color_interpretations: tuple
+    overview_counts: tuple
+    nodata_values: tuple
+    data_type_names: tuple
+    mask_flags: tuple
+
 
 def get_layer_info(workspace, layername, *, extra_keys=None):
     publ_uuid = get_publication_uuid(workspace, LAYER_TYPE, layername)
@@ -95,24 +120,59 @@ def check_bbox_and_extent(filepath):
         raise LaymanError(53)
 
 
-def get_color_interpretations(filepath):
-    dataset = open_raster_file(filepath)
-    result = []
-    for band_id in range(1, dataset.RasterCount + 1):
-        band = dataset.GetRasterBand(band_id)
-        color_interpretation = gdal.GetColorInterpretationName(band.GetColorInterpretation())
-        result.append(color_interpretation)
+def get_file_version(filepath):
+    try:
+        stat = os.stat(util.get_deepest_real_file(filepath))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def memoize_by_file(kind, filepath, compute_fn, *, extra_key=()):
+    version = get_file_version(filepath)
+    if version is None:
+        return compute_fn()
+    key = (kind, filepath, *version, *extra_key)
+    result = RASTER_INFO_CACHE.get(key)
+    if result is None:
+        result = compute_fn()
+        RASTER_INFO_CACHE.set(key, result)
     return result
 
 
-def get_overview_counts(filepath):
+def inspect_raster_file(filepath):
     dataset = open_raster_file(filepath)
-    result = []
-    for band_id in range(1, dataset.RasterCount + 1):
-        band = dataset.GetRasterBand(band_id)
-        overview_count = band.GetOverviewCount()
-        result.append(overview_count)
-    return result
+    bands = [dataset.GetRasterBand(band_id) for band_id in range(1, dataset.RasterCount + 1)]
+    mask_flags = []
+    for band in bands:
+        # About GDAL and mask flags:
+        #   https://github.com/rasterio/rasterio/issues/1178#issuecomment-338798556
+        # GDAL recognizes GMF_ALPHA flag only if Alpha band is Byte or UInt16:
+        #   https://github.com/OSGeo/gdal/pull/742#issuecomment-462805377
+        mask_flags_int = band.GetMaskFlags()
+        mask_flags.append(frozenset(mask_flag_int for mask_flag_int in ALL_MASK_FLAGS if mask_flag_int & mask_flags_int))
+    return RasterInfo(
+        driver_short_name=dataset.GetDriver().ShortName,
+        raster_size=(dataset.RasterXSize, dataset.RasterYSize),
+        geo_transform=tuple(dataset.GetGeoTransform()),
+        color_interpretations=tuple(gdal.GetColorInterpretationName(band.GetColorInterpretation()) for band in bands),
+        overview_counts=tuple(band.GetOverviewCount() for band in bands),
+        nodata_values=tuple(band.GetNoDataValue() for band in bands),
+        data_type_names=tuple(gdal.GetDataTypeName(band.DataType) for band in bands),
+        mask_flags=tuple(mask_flags),
+    )
+
+
+def get_raster_info(filepath):
+    return memoize_by_file('info', filepath, lambda: inspect_raster_file(filepath))
+
+
+def get_color_interpretations(filepath):
+    return list(get_raster_info(filepath).color_interpretations)
+
+
+def get_overview_counts(filepath):
+    return list(get_raster_info(filepath).overview_counts)
 
 
 def assert_valid_raster(input_path):
@@ -134,13 +194,7 @@ def assert_valid_raster(input_path):
 
 
 def get_nodata_values(filepath):
-    dataset = open_raster_file(filepath, gdal.GA_ReadOnly)
-    result = []
-    for band_id in range(1, dataset.RasterCount + 1):
-        band = dataset.GetRasterBand(band_id)
-        nodata_value = band.GetNoDataValue()
-        result.append(nodata_value)
-    return result
+    return list(get_raster_info(filepath).nodata_values)
 
 
 def to_one_value(list_of_values):
@@ -155,13 +209,7 @@ def get_nodata_value(filepath):
 
 
 def get_data_type_names(filepath):
-    dataset = open_raster_file(filepath, gdal.GA_ReadOnly)
-    result = []
-    for band_id in range(1, dataset.RasterCount + 1):
-        band = dataset.GetRasterBand(band_id)
-        data_type = gdal.GetDataTypeName(band.DataType)
-        result.append(data_type)
-    return result
+    return list(get_raster_info(filepath).data_type_names)
 
 
 def get_data_type_name(filepath):
@@ -170,40 +218,19 @@ def get_data_type_name(filepath):
 
 
 def get_mask_flags(filepath):
-    # About GDAL and mask flags:
-    #   https://github.com/rasterio/rasterio/issues/1178#issuecomment-338798556
-    # GDAL recognizes GMF_ALPHA flag only if Alpha band is Byte or UInt16:
-    #   https://github.com/OSGeo/gdal/pull/742#issuecomment-462805377
-    dataset = open_raster_file(filepath, gdal.GA_ReadOnly)
-    all_mask_flags = [
-        gdalconst.GMF_ALL_VALID,
-        gdalconst.GMF_ALPHA,
-        gdalconst.GMF_NODATA,
-        gdalconst.GMF_PER_DATASET,
-    ]
-    result = []
-    for band_id in range(1, dataset.RasterCount + 1):
-        band = dataset.GetRasterBand(band_id)
-        mask_flags_int = band.GetMaskFlags()
-        mask_flag_set = frozenset(mask_flag_int for mask_flag_int in all_mask_flags if mask_flag_int & mask_flags_int)
-        result.append(mask_flag_set)
-    return result
+    return list(get_raster_info(filepath).mask_flags)
 
 
 def get_pixel_size(filepath):
-    dataset = open_raster_file(filepath, gdal.GA_ReadOnly)
-    geo_transform = dataset.GetGeoTransform()
+    geo_transform = get_raster_info(filepath).geo_transform
     return [geo_transform[1], geo_transform[5]]
 
 
 def get_raster_size(filepath):
-    dataset = open_raster_file(filepath, gdal.GA_ReadOnly)
-    x_size = dataset.RasterXSize
-    y_size = dataset.RasterYSize
-    return [x_size, y_size]
+    return list(get_raster_info(filepath).raster_size)
 
 
-def get_statistics(filepath):
+def compute_statistics(filepath):
     # If Nodata is set and it's lowest value in dataset and at least one pixel has Nodata value,
     # GetStatistics does not return Nodata value as MIN, but lowest value that is not Nodata value.
     # It's probably similar for MAX.
@@ -214,8 +241,13 @@ def get_statistics(filepath):
         stats = band.GetStatistics(False, True)  # (approx_ok, force), see
         # https://gdal.org/doxygen/classGDALRasterBand.html#a6aa58b6f0a0c17722b9bf763a96ff069
         # stats = [min, max, mean, stddev]
-        result.append(stats[:2])
-    return result
+        result.append(tuple(stats[:2]))
+    return tuple(result)
+
+
+def get_statistics(filepath):
+    stats = memoize_by_file('statistics', filepath, lambda: compute_statistics(filepath))
+    return [list(band_stats) for band_stats in stats]
 
 
 def get_file_list_statistics(filepaths):
@@ -227,8 +259,19 @@ def get_file_list_statistics(filepaths):
 
 
 def get_driver_short_name(filepath):
-    dataset = open_raster_file(filepath, gdal.GA_ReadOnly)
-    result = dataset.GetDriver().ShortName
+    return get_raster_info(filepath).driver_short_name
+
+
+def compute_is_nodata_out_of_min_max(filepath, *, nodata_values):
+    base_name = os.path.splitext(util.get_deepest_real_file(filepath))[0]
+    vrt_file_path = base_name + '.ignore_nodata.vrt'
+    vrt_options = gdal.BuildVRTOptions(hideNodata=True)
+    gdal.BuildVRT(vrt_file_path, [filepath], options=vrt_options)
+    stats = compute_statistics(vrt_file_path)
+    result = any(nodata_val < stats[band_idx][0]  # nodata_val < min
+                 or nodata_val > stats[band_idx][1]  # nodata_val > max
+                 for band_idx, nodata_val in enumerate(nodata_values) if nodata_val is not None)
+    os.remove(vrt_file_path)
     return result
 
 
@@ -236,15 +279,9 @@ def is_nodata_out_of_min_max(filepath, *, nodata_values):
     if to_one_value(nodata_values) is None:
         result = False
     else:
-        base_name = os.path.splitext(util.get_deepest_real_file(filepath))[0]
-        vrt_file_path = base_name + '.ignore_nodata.vrt'
-        vrt_options = gdal.BuildVRTOptions(hideNodata=True)
-        gdal.BuildVRT(vrt_file_path, [filepath], options=vrt_options)
-        stats = get_statistics(vrt_file_path)
-        result = any(nodata_val < stats[band_idx][0]  # nodata_val < min
-                     or nodata_val > stats[band_idx][1]  # nodata_val > max
-                     for band_idx, nodata_val in enumerate(nodata_values) if nodata_val is not None)
-        os.remove(vrt_file_path)
+        result = memoize_by_file('is_nodata_out_of_min_max', filepath,
+                                 lambda: compute_is_nodata_out_of_min_max(filepath, nodata_values=nodata_values),
+                                 extra_key=(tuple(nodata_values),))
     return result
 
 
@@ -436,12 +473,13 @@ def ensure_normalized_raster_layer_dir(publ_uuid):
 
 
 def get_bbox_from_file(filepath):
-    data = open_raster_file(filepath, gdalconst.GA_ReadOnly)
-    geo_transform = data.GetGeoTransform()
+    raster_info = get_raster_info(filepath)
+    geo_transform = raster_info.geo_transform
+    x_size, y_size = raster_info.raster_size
     minx = geo_transform[0]
     maxy = geo_transform[3]
-    maxx = minx + geo_transform[1] * data.RasterXSize
-    miny = maxy + geo_transform[5] * data.RasterYSize
+    maxx = minx + geo_transform[1] * x_size
+    miny = maxy + geo_transform[5] * y_size
     result = (minx, miny, maxx, maxy)
     return result
 
@@ -1,4 +1,5 @@
 import os
+import shutil
 from contextlib import nullcontext as does_not_raise
 from osgeo import gdalconst
 import pytest
@@ -239,3 +240,18 @@ def test_get_data_type_name(file_path, exp_result):
 def test_get_bbox_from_files(file_path, exp_result):
     data_type_name = gdal.get_bbox_from_files(file_path)
     assert data_type_name == exp_result
+
+
+def test_raster_info_cache(tmp_path):
+    file_path = str(tmp_path / 'raster.tif')
+    shutil.copyfile('sample/layman.layer/sample_tif_rgb_nodata.tif', file_path)
+
+    raster_info = gdal.get_raster_info(file_path)
+    assert gdal.get_raster_info(file_path) is raster_info
+    assert gdal.get_nodata_values(file_path) == [0, 0, 0]
+    assert gdal.get_color_interpretations(file_path) == ['Red', 'Green', 'Blue']
+
+    shutil.copyfile('sample/layman.layer/sample_tif_colortable_nodata_opaque.tif', file_path)
+    assert gdal.get_raster_info(file_path) is not raster_info
+    assert gdal.get_nodata_values(file_path) == [255]
+    assert gdal.get_color_interpretations(file_path) == ['Palette']
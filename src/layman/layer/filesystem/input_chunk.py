@@ -7,6 +7,7 @@ import pathlib
 import shutil
 
 from flask import current_app
+from redis.exceptions import LockError
 
 from layman import LaymanError
 from layman import settings, patch_mode
@@ -21,6 +22,9 @@ LAYER_SUBDIR = __name__.rsplit('.', maxsplit=1)[-1]
 PATCH_MODE = patch_mode.DELETE_IF_DEPENDANT
 logger = logging.getLogger(__name__)
 
+# max time (in seconds) one process can hold lock for appending chunks of one file
+CHUNK_ASSEMBLY_LOCK_TIMEOUT = 5 * 60  # 5 minutes
+
 get_metadata_comparison = empty_method_returns_dict
 pre_publication_action_check = empty_method
 post_layer = empty_method
@@ -40,8 +44,13 @@ def ensure_layer_resumable_dir(publ_uuid):
 
 def delete_layer(layer: Layer):
     util.delete_layer_subdir(layer.uuid, LAYER_SUBDIR)
-    chunk_key = get_layer_redis_total_chunks_key(layer.uuid)
-    settings.LAYMAN_REDIS.delete(chunk_key)
+    settings.LAYMAN_REDIS.delete(
+        get_layer_redis_total_chunks_key(layer.uuid),
+        get_layer_redis_received_chunks_key(layer.uuid),
+        get_layer_redis_assembled_chunks_key(layer.uuid),
+        get_layer_redis_saved_files_key(layer.uuid),
+        get_layer_redis_chunk_events_key(layer.uuid),
+    )
 
 
 def save_layer_files_str(publ_uuid, input_files, check_crs, *, name_input_file_by_layer=True):
@@ -86,6 +95,47 @@ def get_layer_redis_total_chunks_key(publ_uuid):
     return f'layman.layers.{publ_uuid}.total_chunks'
 
 
+def get_layer_redis_received_chunks_key(publ_uuid):
+    return f'layman.layers.{publ_uuid}.received_chunks'
+
+
+def get_layer_redis_assembled_chunks_key(publ_uuid):
+    return f'layman.layers.{publ_uuid}.assembled_chunks'
+
+
+def get_layer_redis_saved_files_key(publ_uuid):
+    return f'layman.layers.{publ_uuid}.saved_files'
+
+
+def get_layer_redis_chunk_events_key(publ_uuid):
+    return f'layman.layers.{publ_uuid}.chunk_events'
+
+
+def get_layer_redis_chunk_assembly_lock_key(publ_uuid, file_key):
+    return f'layman.layers.{publ_uuid}.chunk_assembly_lock.{file_key}'
+
+
+def _get_file_key(file_info):
+    return f'{file_info["layman_original_parameter"]}:{file_info["target_file"]}'
+
+
+def _get_file_info(files_to_upload, parameter_name, filename):
+    file_info = next(
+        (
+            fi for fi in files_to_upload
+            if fi['input_file'] == filename and fi[
+                'layman_original_parameter'] == parameter_name
+        ),
+        None
+    )
+    if file_info is None:
+        raise LaymanError(21, {
+            'file': filename,
+            'layman_original_parameter': parameter_name,
+        })
+    return file_info
+
+
 def save_layer_file_chunk(publ_uuid, parameter_name, filename, chunk,
                           chunk_number, total_chunks):
     resumable_dir = get_layer_resumable_dir(publ_uuid)
@@ -94,36 +144,112 @@ def save_layer_file_chunk(publ_uuid, parameter_name, filename, chunk,
     if os.path.isfile(info_path):
         with open(info_path, 'r', encoding="utf-8") as info_file:
             info = json.load(info_file)
-            files_to_upload = info['files_to_upload']
-            file_info = next(
-                (
-                    fi for fi in files_to_upload
-                    if fi['input_file'] == filename and fi[
-                        'layman_original_parameter'] == parameter_name
-                ),
-                None
-            )
-            if file_info is None:
-                raise LaymanError(21, {
-                    'file': filename,
-                    'layman_original_parameter': parameter_name,
-                })
-            settings.LAYMAN_REDIS.hset(
-                get_layer_redis_total_chunks_key(publ_uuid),
-                f'{parameter_name}:{file_info["target_file"]}',
-                total_chunks
-            )
+        file_info = _get_file_info(info['files_to_upload'], parameter_name, filename)
+        file_key = _get_file_key(file_info)
+        rds = settings.LAYMAN_REDIS
+        rds.hset(get_layer_redis_total_chunks_key(publ_uuid), file_key, total_chunks)
+        assembled_chunks = int(rds.hget(get_layer_redis_assembled_chunks_key(publ_uuid), file_key) or 0)
+        if chunk_number > assembled_chunks:
             target_filename = os.path.basename(file_info['target_file'])
             chunk_name = _get_chunk_name(target_filename, chunk_number)
             chunk_path = os.path.join(chunk_dir, chunk_name)
             chunk_path_inter = chunk_path + '_part'
             chunk.save(chunk_path_inter)
             shutil.move(chunk_path_inter, chunk_path)
+            rds.hset(get_layer_redis_received_chunks_key(publ_uuid), f'{file_key}:{chunk_number}', 1)
             current_app.logger.info(f'Resumable chunk saved to: {chunk_path}')
+            assemble_contiguous_chunks(publ_uuid, file_info, total_chunks)
+        events_key = get_layer_redis_chunk_events_key(publ_uuid)
+        with rds.pipeline() as pipe:
+            pipe.rpush(events_key, file_key)
+            pipe.expire(events_key, settings.UPLOAD_MAX_INACTIVITY_TIME)
+            pipe.execute()
     else:
         raise LaymanError(20)
 
 
+def _copy_file_content(source_fd, target_fd, count, target_offset):
+    copied = 0
+    try:
+        while copied < count:
+            # server-side copy without passing data through user space, if supported by filesystem
+            copied_now = os.copy_file_range(source_fd, target_fd, count - copied, copied, target_offset + copied)
+            if copied_now == 0:
+                break
+            copied += copied_now
+    except (AttributeError, OSError):
+        os.lseek(source_fd, copied, os.SEEK_SET)
+        os.lseek(target_fd, target_offset + copied, os.SEEK_SET)
+        with os.fdopen(source_fd, 'rb', closefd=False) as source_file, \
+                os.fdopen(target_fd, 'wb', closefd=False) as target_file:
+            shutil.copyfileobj(source_file, target_file)
+
+
+def _append_chunk(target_path, target_size, chunk_path):
+    # File is truncated to already assembled size, because previous attempt could fail in the middle of appending
+    target_fd = os.open(target_path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(target_fd, target_size)
+        with open(chunk_path, 'rb') as chunk_file:
+            chunk_size = os.fstat(chunk_file.fileno()).st_size
+            _copy_file_content(chunk_file.fileno(), target_fd, chunk_size, target_size)
+    finally:
+        os.close(target_fd)
+    return target_size + chunk_size
+
+
+def assemble_contiguous_chunks(publ_uuid, file_info, total_chunks):
+    """Append all received chunks that follow already assembled chunks to the file, in order.
+
+    Only one process appends chunks of one file at a time. Processes that do not obtain the lock rely on the lock
+    holder, which checks for newly received chunks after releasing the lock.
+    """
+    rds = settings.LAYMAN_REDIS
+    file_key = _get_file_key(file_info)
+    received_key = get_layer_redis_received_chunks_key(publ_uuid)
+    assembled_key = get_layer_redis_assembled_chunks_key(publ_uuid)
+    lock_key = get_layer_redis_chunk_assembly_lock_key(publ_uuid, file_key)
+    chunk_dir = os.path.join(get_layer_resumable_dir(publ_uuid), 'chunks')
+    target_fp = file_info['target_file']
+    target_fn = os.path.basename(target_fp)
+    assembling_fp = os.path.join(chunk_dir, f'{target_fn}_assembled')
+
+    while True:
+        # token-checked lock, so that lock that expired and was obtained by another process is not released here
+        lock = rds.lock(lock_key, timeout=CHUNK_ASSEMBLY_LOCK_TIMEOUT)
+        if not lock.acquire(blocking=False):
+            return
+        try:
+            assembled_chunks = int(rds.hget(assembled_key, file_key) or 0)
+            assembled_size = int(rds.hget(assembled_key, f'{file_key}:size') or 0)
+            while assembled_chunks < total_chunks \
+                    and rds.hexists(received_key, f'{file_key}:{assembled_chunks + 1}'):
+                chunk_path = os.path.join(chunk_dir, _get_chunk_name(target_fn, assembled_chunks + 1))
+                assembled_size = _append_chunk(assembling_fp, assembled_size, chunk_path)
+                assembled_chunks += 1
+                rds.hset(assembled_key, mapping={
+                    file_key: assembled_chunks,
+                    f'{file_key}:size': assembled_size,
+                })
+                os.unlink(chunk_path)
+            if assembled_chunks == total_chunks:
+                if not os.path.exists(target_fp):
+                    current_app.logger.info('file_upload_complete ' + target_fn)
+                    input_file.ensure_layer_input_file_dir(publ_uuid)
+                    shutil.move(assembling_fp, target_fp)
+                    current_app.logger.info('Resumable file saved to: %s', target_fp)
+                # also when previous attempt failed after the file was moved
+                rds.sadd(get_layer_redis_saved_files_key(publ_uuid), file_key)
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                logger.warning(f'Chunk assembly lock {lock_key} expired before it was released')
+        if assembled_chunks >= total_chunks \
+                or not rds.hexists(received_key, f'{file_key}:{assembled_chunks + 1}'):
+            return
+
+
 def get_info_json(publ_uuid):
     resumable_dir = get_layer_resumable_dir(publ_uuid)
     info_path = os.path.join(resumable_dir, 'info.json')
@@ -157,88 +283,47 @@ def get_layer_info_by_uuid(publ_uuid):
 def layer_file_chunk_exists(publ_uuid, parameter_name, filename,
                             chunk_number):
     info = get_info_json(publ_uuid)
-    resumable_dir = get_layer_resumable_dir(publ_uuid)
-    chunk_dir = os.path.join(resumable_dir, 'chunks')
     if info:
-        files_to_upload = info['files_to_upload']
-        file_info = next(
-            (
-                fi for fi in files_to_upload
-                if fi['input_file'] == filename and fi[
-                    'layman_original_parameter'] == parameter_name
-            ),
-            None
-        )
-        if file_info is None:
-            raise LaymanError(21, {
-                'file': filename,
-                'layman_original_parameter': parameter_name,
-            })
-        target_filepath = file_info['target_file']
-        target_filename = os.path.basename(target_filepath)
-        chunk_name = _get_chunk_name(target_filename, chunk_number)
-        chunk_path = os.path.join(chunk_dir, chunk_name)
-        return os.path.exists(chunk_path) or os.path.exists(
-            target_filepath)
+        file_info = _get_file_info(info['files_to_upload'], parameter_name, filename)
+        received_key = get_layer_redis_received_chunks_key(publ_uuid)
+        return settings.LAYMAN_REDIS.hexists(received_key, f'{_get_file_key(file_info)}:{chunk_number}') \
+            or os.path.exists(file_info['target_file'])
     raise LaymanError(20)
 
 
 def layer_file_chunk_info(publ_uuid):
-    # print('print layer_file_chunk_info')
     layer = Layer(uuid=publ_uuid)
-    resumable_dir = get_layer_resumable_dir(publ_uuid)
-    info_path = os.path.join(resumable_dir, 'info.json')
-    chunk_dir = os.path.join(resumable_dir, 'chunks')
-    if os.path.isfile(info_path):
-        # print('print layer_file_chunk_info info_path')
-        with open(info_path, 'r', encoding="utf-8") as info_file:
-            info = json.load(info_file)
-            files_to_upload = info['files_to_upload']
-
-            r_key = get_layer_redis_total_chunks_key(publ_uuid)
-            for file in files_to_upload:
-                rh_key = f'{file["layman_original_parameter"]}:{file["target_file"]}'
-                total_chunks = settings.LAYMAN_REDIS.hget(r_key, rh_key)
-                # print(f'file {rh_key} {total_chunks}')
-                if total_chunks is None:
-                    continue
-                total_chunks = int(total_chunks)
-                target_fn = os.path.basename(file['target_file'])
-                chunk_paths = [
-                    os.path.join(chunk_dir, _get_chunk_name(target_fn, x))
-                    for x in range(1, total_chunks + 1)
-                ]
-                file_upload_complete = \
-                    all(os.path.exists(p) for p in chunk_paths)
-                if file_upload_complete:
-                    current_app.logger.info(
-                        'file_upload_complete ' + target_fn)
-                    target_fp = file['target_file']
-                    input_file.ensure_layer_input_file_dir(publ_uuid)
-                    with open(target_fp, "ab") as target_file:
-                        for chunk_path in chunk_paths:
-                            with open(chunk_path, 'rb') as stored_chunk_file:
-                                target_file.write(stored_chunk_file.read())
-                            os.unlink(chunk_path)
-                    target_file.close()
-                    settings.LAYMAN_REDIS.hdel(r_key, rh_key)
-                    current_app.logger.info('Resumable file saved to: %s',
-                                            target_fp)
-
-            num_files_saved = len([
-                fi for fi in files_to_upload
-                if os.path.exists(fi['target_file'])
-            ])
-            all_files_saved = num_files_saved == len(files_to_upload)
-            if all_files_saved:
-                delete_layer(layer)
-                num_chunks_saved = 0
-            else:
-                num_chunks_saved = len(os.listdir(chunk_dir))
-
-            return all_files_saved, num_files_saved, num_chunks_saved
-    else:
-        raise LaymanError(20)
+    info = get_info_json(publ_uuid)
+    if info:
+        files_to_upload = info['files_to_upload']
+        rds = settings.LAYMAN_REDIS
+        saved_files_key = get_layer_redis_saved_files_key(publ_uuid)
+        total_chunks_key = get_layer_redis_total_chunks_key(publ_uuid)
+        saved_file_keys = rds.smembers(saved_files_key)
+        for file_info in files_to_upload:
+            file_key = _get_file_key(file_info)
+            if file_key in saved_file_keys:
+                continue
+            total_chunks = rds.hget(total_chunks_key, file_key)
+            if total_chunks is None:
+                continue
+            # resume assembling interrupted e.g. by restart of the process that received the last chunk
+            assemble_contiguous_chunks(publ_uuid, file_info, int(total_chunks))
+
+        num_files_saved = rds.scard(saved_files_key)
+        all_files_saved = num_files_saved == len(files_to_upload)
+        if all_files_saved:
+            delete_layer(layer)
+            num_chunks_saved = 0
+        else:
+            num_chunks_saved = rds.hlen(get_layer_redis_received_chunks_key(publ_uuid))
+
+        return all_files_saved, num_files_saved, num_chunks_saved
+    raise LaymanError(20)
+
+
+def wait_for_chunk_event(publ_uuid, *, timeout):
+    settings.LAYMAN_REDIS.blpop(get_layer_redis_chunk_events_key(publ_uuid), timeout=timeout)
 
 
 def _get_chunk_name(uploaded_filename, chunk_number):
@@ -0,0 +1,129 @@
+import io
+import json
+import os
+import uuid
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from layman import app, settings
+from . import input_chunk, input_file
+
+PARAMETER_NAME = 'file'
+FILENAME = 'layer.geojson'
+CHUNKS = [b'{"type": "FeatureCollection", ', b'"features": ', b'[]}']
+
+
+@pytest.fixture()
+def upload(tmp_path, monkeypatch):
+    publ_uuid = str(uuid.uuid4())
+    resumable_dir = tmp_path / 'resumable'
+    input_file_dir = tmp_path / 'input_file'
+    monkeypatch.setattr(input_chunk, 'get_layer_resumable_dir', lambda _: str(resumable_dir))
+    monkeypatch.setattr(input_file, 'ensure_layer_input_file_dir', lambda _: input_file_dir.mkdir(exist_ok=True))
+    (resumable_dir / 'chunks').mkdir(parents=True)
+    file_info = {
+        'input_file': FILENAME,
+        'target_file': str(input_file_dir / f'{publ_uuid}.geojson'),
+        'layman_original_parameter': PARAMETER_NAME,
+    }
+    with open(resumable_dir / 'info.json', 'w', encoding="utf-8") as file:
+        json.dump({'files_to_upload': [file_info], 'check_crs': True}, file)
+    with app.app_context():
+        yield publ_uuid, file_info
+    settings.LAYMAN_REDIS.delete(
+        input_chunk.get_layer_redis_total_chunks_key(publ_uuid),
+        input_chunk.get_layer_redis_received_chunks_key(publ_uuid),
+        input_chunk.get_layer_redis_assembled_chunks_key(publ_uuid),
+        input_chunk.get_layer_redis_saved_files_key(publ_uuid),
+        input_chunk.get_layer_redis_chunk_events_key(publ_uuid),
+        input_chunk.get_layer_redis_chunk_assembly_lock_key(publ_uuid, input_chunk._get_file_key(file_info)),  # pylint: disable=protected-access
+    )
+
+
+def save_chunk(publ_uuid, chunk_number):
+    chunk = FileStorage(stream=io.BytesIO(CHUNKS[chunk_number - 1]), filename=FILENAME)
+    input_chunk.save_layer_file_chunk(publ_uuid, PARAMETER_NAME, FILENAME, chunk, chunk_number, len(CHUNKS))
+
+
+def get_assembled_chunks(publ_uuid, file_info):
+    assembled_key = input_chunk.get_layer_redis_assembled_chunks_key(publ_uuid)
+    return int(settings.LAYMAN_REDIS.hget(assembled_key, input_chunk._get_file_key(file_info)) or 0)  # pylint: disable=protected-access
+
+
+def is_file_saved(publ_uuid, file_info):
+    saved_files_key = input_chunk.get_layer_redis_saved_files_key(publ_uuid)
+    return settings.LAYMAN_REDIS.sismember(saved_files_key, input_chunk._get_file_key(file_info))  # pylint: disable=protected-access
+
+
+def read_file(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def test_out_of_order_chunks(upload):
+    publ_uuid, file_info = upload
+
+    save_chunk(publ_uuid, 3)
+    assert get_assembled_chunks(publ_uuid, file_info) == 0
+    save_chunk(publ_uuid, 1)
+    assert get_assembled_chunks(publ_uuid, file_info) == 1
+    assert not is_file_saved(publ_uuid, file_info)
+    save_chunk(publ_uuid, 2)
+    assert get_assembled_chunks(publ_uuid, file_info) == 3
+    assert is_file_saved(publ_uuid, file_info)
+    assert read_file(file_info['target_file']) == b''.join(CHUNKS)
+
+
+def test_retried_chunk_after_file_was_moved(upload):
+    publ_uuid, file_info = upload
+    for chunk_number in range(1, len(CHUNKS) + 1):
+        save_chunk(publ_uuid, chunk_number)
+    assert is_file_saved(publ_uuid, file_info)
+
+    # process failed after the file was moved to input directory, but before it was marked as saved
+    settings.LAYMAN_REDIS.delete(input_chunk.get_layer_redis_saved_files_key(publ_uuid))
+    save_chunk(publ_uuid, len(CHUNKS))
+    assert is_file_saved(publ_uuid, file_info)
+    assert read_file(file_info['target_file']) == b''.join(CHUNKS)
+
+
+def test_completion_is_resumed_by_chunk_info(upload, monkeypatch):
+    publ_uuid, file_info = upload
+    monkeypatch.setattr(input_chunk, 'Layer', lambda **_: None)
+    monkeypatch.setattr(input_chunk, 'delete_layer', lambda _: None)
+
+    # last chunk received, but process was interrupted before assembling it
+    save_chunk(publ_uuid, 1)
+    save_chunk(publ_uuid, 2)
+    chunk_path = os.path.join(input_chunk.get_layer_resumable_dir(publ_uuid), 'chunks',
+                              input_chunk._get_chunk_name(os.path.basename(file_info['target_file']), 3))  # pylint: disable=protected-access
+    FileStorage(stream=io.BytesIO(CHUNKS[2]), filename=FILENAME).save(chunk_path)
+    settings.LAYMAN_REDIS.hset(input_chunk.get_layer_redis_received_chunks_key(publ_uuid),
+                               f'{input_chunk._get_file_key(file_info)}:3', 1)  # pylint: disable=protected-access
+    assert not is_file_saved(publ_uuid, file_info)
+
+    all_files_saved, num_files_saved, _ = input_chunk.layer_file_chunk_info(publ_uuid)
+    assert all_files_saved
+    assert num_files_saved == 1
+    assert read_file(file_info['target_file']) == b''.join(CHUNKS)
+
+
+def test_expired_lock_of_other_process_is_kept(upload, monkeypatch):
+    publ_uuid, file_info = upload
+    lock_key = input_chunk.get_layer_redis_chunk_assembly_lock_key(publ_uuid, input_chunk._get_file_key(file_info))  # pylint: disable=protected-access
+    append_chunk = input_chunk._append_chunk  # pylint: disable=protected-access
+
+    def append_chunk_after_lock_expired(*args):
+        # lock of this process expired and other process obtained it
+        settings.LAYMAN_REDIS.set(lock_key, 'other_process_token')
+        return append_chunk(*args)
+
+    monkeypatch.setattr(input_chunk, '_append_chunk', append_chunk_after_lock_expired)
+    save_chunk(publ_uuid, 1)
+    assert get_assembled_chunks(publ_uuid, file_info) == 1
+    assert settings.LAYMAN_REDIS.get(lock_key) == 'other_process_token'
+
+    # chunks are not assembled while other process holds the lock
+    monkeypatch.setattr(input_chunk, '_append_chunk', append_chunk)
+    save_chunk(publ_uuid, 2)
+    assert get_assembled_chunks(publ_uuid, file_info) == 1
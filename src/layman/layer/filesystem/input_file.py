@@ -1,4 +1,5 @@
 import glob
+import hashlib
 import os
 import pathlib
 import logging
@@ -21,6 +22,11 @@ PATCH_MODE = patch_mode.DELETE_IF_DEPENDANT
 logger = logging.getLogger(__name__)
 
 TIMESERIES_FILENAME_PATTERN = r"^(?![.])[a-zA-Z0-9_.-]+$"
+ARCHIVES_DIR = os.path.join(settings.LAYMAN_DATA_DIR, 'archives')
+ARCHIVES_LOCK_KEY = f'{__name__}:ARCHIVES_LOCK'
+# layer UUID -> path to archive stored for the layer in ARCHIVES_DIR
+ARCHIVES_KEY = f'{__name__}:ARCHIVES'
+ARCHIVES_LOCK_TIMEOUT = 60
 
 pre_publication_action_check = empty_method
 post_layer = empty_method
@@ -41,6 +47,83 @@ def ensure_layer_input_file_dir(publ_uuid):
 
 def delete_layer(layer: Layer):
     util.delete_layer_subdir(layer.uuid, LAYER_SUBDIR)
+    delete_unused_stored_archive(layer.uuid)
+
+
+def get_file_checksum(filepath):
+    file_hash = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def store_archive(publ_uuid, filepath, *, checksum=None):
+    """Replace archive in layer input directory by hard link to immutable content-addressed copy in ARCHIVES_DIR.
+
+    Archive of the same content that is already stored is reused, so duplicate uploads share one file. Archive
+    members are read by GDAL/OGR through /vsizip/ as before. Path to stored archive is recorded for the layer in
+    ARCHIVES_KEY and returned, None is returned if archive store is disabled by LAYMAN_CONTENT_ADDRESSED_ARCHIVES
+    or file is not archive.
+    """
+    compress_type = get_compressed_main_file_extension(filepath)
+    if not settings.LAYMAN_CONTENT_ADDRESSED_ARCHIVES or not compress_type:
+        return None
+    checksum = checksum or get_file_checksum(filepath)
+    archive_path = os.path.join(ARCHIVES_DIR, checksum + compress_type)
+    pathlib.Path(ARCHIVES_DIR).mkdir(parents=True, exist_ok=True)
+    with settings.LAYMAN_REDIS.lock(ARCHIVES_LOCK_KEY, timeout=ARCHIVES_LOCK_TIMEOUT):
+        try:
+            try:
+                os.link(filepath, archive_path)
+                os.chmod(archive_path, 0o444)
+            except FileExistsError:
+                link_path = filepath + '.link'
+                os.link(archive_path, link_path)
+                os.replace(link_path, filepath)
+                logger.info(f"Archive {filepath} deduplicated with {archive_path}")
+        except OSError as exc:
+            logger.warning(f"Archive {filepath} not stored in {ARCHIVES_DIR}, error={exc}")
+            return None
+        settings.LAYMAN_REDIS.hset(ARCHIVES_KEY, publ_uuid, archive_path)
+    return archive_path
+
+
+def get_sent_archive_checksum(input_files):
+    """Return checksum computed while the only sent archive was being received, if available."""
+    if not input_files.is_one_archive or not input_files.sent_streams:
+        return None
+    return getattr(input_files.sent_streams[0].stream, 'checksum', None)
+
+
+def store_layer_archive(publ_uuid, *, checksum=None):
+    """Store archive that is the only input file in layer input directory, see `store_archive`.
+
+    Archive is stored only after it was checked and saved in layer input directory, so that failed request does not
+    leave unused archive in ARCHIVES_DIR.
+    """
+    input_files = get_layer_input_files(publ_uuid)
+    if input_files.is_one_archive:
+        store_archive(publ_uuid, input_files.saved_paths_to_archives[0], checksum=checksum)
+
+
+def delete_unused_stored_archive(publ_uuid):
+    """Delete archive stored for the layer if it is not linked from any layer input directory anymore.
+
+    It is called after input directory of the layer is deleted, under the same lock as `store_archive`, so that
+    layers sharing one archive and deleted in parallel can not miss each other's link.
+    """
+    rds = settings.LAYMAN_REDIS
+    with rds.lock(ARCHIVES_LOCK_KEY, timeout=ARCHIVES_LOCK_TIMEOUT):
+        archive_path = rds.hget(ARCHIVES_KEY, publ_uuid)
+        if archive_path is None:
+            return
+        try:
+            if os.stat(archive_path).st_nlink == 1:
+                os.remove(archive_path)
+        except FileNotFoundError:
+            pass
+        rds.hdel(ARCHIVES_KEY, publ_uuid)
 
 
 def get_compressed_main_file_extension(filepath):
@@ -139,7 +222,7 @@ def check_vector_main_file(main_filepath, *, check_crs=True):
 
 def check_raster_main_files(main_filepaths, *, check_crs=True):
     for main_filepath in main_filepaths:
-        fs_gdal.open_raster_file(main_filepath)
+        fs_gdal.get_raster_info(main_filepath)
         fs_gdal.assert_valid_raster(main_filepath)
         if check_crs:
             check_raster_layer_crs(main_filepath)
@@ -416,6 +499,7 @@ def save_layer_files(publ_uuid, input_files, check_crs, overview_resampling, *,
         main_filenames = input_files.raw_paths_to_archives
     else:
         main_filenames = input_files.raw_or_archived_main_file_paths
+    is_layer_input_file_dir = output_dir is None
     output_dir = output_dir or ensure_layer_input_file_dir(publ_uuid)
     _, filepath_mapping = get_file_name_mappings(
         input_files.raw_paths, main_filenames, publ_uuid, output_dir, name_input_file_by_layer=name_input_file_by_layer
@@ -427,6 +511,10 @@ def save_layer_files(publ_uuid, input_files, check_crs, overview_resampling, *,
     gdal_main_filepaths = [gdal_path for filepath in filepaths for gdal_path in get_gdal_format_file_paths(filepath)]
     check_main_files(gdal_main_filepaths, check_crs=check_crs, overview_resampling=overview_resampling)
 
+    # archive saved in other output directory is stored by caller once the directory is moved to layer input directory
+    if is_layer_input_file_dir:
+        store_layer_archive(publ_uuid, checksum=get_sent_archive_checksum(input_files))
+
 
 def slugify_timeseries_filename(filename):
     slug = ''.join(c for c in unicodedata.normalize('NFD', filename) if unicodedata.category(c) != 'Mn')
@@ -1,4 +1,6 @@
 from contextlib import nullcontext as does_not_raise
+import os
+import uuid
 import pytest
 from layman.http import LaymanError
 
@@ -206,3 +208,50 @@ def test_slugify_timeseries_filename_pattern(pattern, exp_result):
 ])
 def test_is_safe_timeseries_filename(filename, exp_result):
     assert is_safe_timeseries_filename(filename) == exp_result
+
+
+def test_store_archive(tmp_path, monkeypatch):
+    from layman import settings
+    from . import input_file
+    monkeypatch.setattr(settings, 'LAYMAN_CONTENT_ADDRESSED_ARCHIVES', True)
+    monkeypatch.setattr(input_file, 'ARCHIVES_DIR', str(tmp_path / 'archives'))
+    monkeypatch.setattr(input_file, 'ARCHIVES_KEY', f'{input_file.ARCHIVES_KEY}:test_store_archive')
+    publ_uuids = [str(uuid.uuid4()), str(uuid.uuid4())]
+    paths = [tmp_path / 'layer1.zip', tmp_path / 'layer2.zip']
+    for path in paths:
+        path.write_bytes(b'PK\x05\x06' + bytes(18))
+
+    archive_paths = [input_file.store_archive(publ_uuid, str(path)) for publ_uuid, path in zip(publ_uuids, paths)]
+    assert archive_paths[0] == archive_paths[1]
+    assert archive_paths[0] == str(tmp_path / 'archives' / (input_file.get_file_checksum(str(paths[0])) + '.zip'))
+    assert all(path.stat().st_ino == os.stat(archive_paths[0]).st_ino for path in paths)
+    assert settings.LAYMAN_REDIS.hgetall(input_file.ARCHIVES_KEY) == {publ_uuid: archive_paths[0] for publ_uuid in publ_uuids}
+    assert input_file.store_archive(str(uuid.uuid4()), str(tmp_path / 'layer1.shp')) is None
+    settings.LAYMAN_REDIS.delete(input_file.ARCHIVES_KEY)
+
+
+def test_delete_unused_stored_archive(tmp_path, monkeypatch):
+    from layman import settings
+    from . import input_file
+    monkeypatch.setattr(settings, 'LAYMAN_CONTENT_ADDRESSED_ARCHIVES', True)
+    monkeypatch.setattr(input_file, 'ARCHIVES_DIR', str(tmp_path / 'archives'))
+    monkeypatch.setattr(input_file, 'ARCHIVES_KEY', f'{input_file.ARCHIVES_KEY}:test_delete_unused_stored_archive')
+    publ_uuids = [str(uuid.uuid4()), str(uuid.uuid4())]
+    paths = [tmp_path / 'layer1.zip', tmp_path / 'layer2.zip']
+    for path in paths:
+        path.write_bytes(b'PK\x05\x06' + bytes(18))
+    archive_path = [input_file.store_archive(publ_uuid, str(path)) for publ_uuid, path in zip(publ_uuids, paths)][0]
+
+    paths[0].unlink()
+    input_file.delete_unused_stored_archive(publ_uuids[0])
+    assert os.path.exists(archive_path)
+    assert not settings.LAYMAN_REDIS.hexists(input_file.ARCHIVES_KEY, publ_uuids[0])
+
+    # layer without stored archive
+    input_file.delete_unused_stored_archive(str(uuid.uuid4()))
+    assert os.path.exists(archive_path)
+
+    paths[1].unlink()
+    input_file.delete_unused_stored_archive(publ_uuids[1])
+    assert not os.path.exists(archive_path)
+    assert not settings.LAYMAN_REDIS.exists(input_file.ARCHIVES_KEY)
@@ -1,12 +1,14 @@
 import os
+import threading
 import time
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from celery.utils.log import get_task_logger
 
 from layman import celery_app, settings, util as layman_util
 from layman.celery import AbortedException
-from layman.common import empty_method_returns_true
+from layman.common import empty_method_returns_true, process as process_util
 from layman.http import LaymanError
 from . import input_file, input_chunk, thumbnail, gdal
 from .. import LAYER_TYPE
@@ -43,7 +45,7 @@ def refresh_input_chunk(self, workspace, layername, *, uuid, check_crs=True, ove
                 f'UPLOAD_MAX_INACTIVITY_TIME reached {workspace}.{layername}')
             input_file.delete_layer(layer)
             raise LaymanError(22)
-        time.sleep(0.5)
+        input_chunk.wait_for_chunk_event(uuid, timeout=1)
         if self.is_aborted():
             logger.info(f'Aborting for layer {workspace}.{layername}')
             input_file.delete_layer(layer)
@@ -79,6 +81,9 @@ def refresh_input_chunk(self, workspace, layername, *, uuid, check_crs=True, ove
     if file_type == settings.GEODATA_TYPE_RASTER and style_type_for_check == 'qml':
         raise LaymanError(48, f'Raster layers are not allowed to have QML style.')
 
+    # checksum of archive assembled from chunks is computed here rather than while holding chunk assembly lock
+    input_file.store_layer_archive(uuid)
+
 
 @celery_app.task(
     name='layman.layer.filesystem.gdal.refresh',
@@ -92,49 +97,27 @@ def refresh_gdal(self, workspace, layername,
                  name_normalized_tif_by_layer=True,
                  original_data_source=settings.EnumOriginalDataSource.FILE.value,
                  ):
-    def finish_gdal_process(process):
-        if self.is_aborted():
-            logger.info(f'terminating GDAL process workspace.layer={workspace}.{layername}')
-            process.terminate()
+    stop_event = threading.Event()
+
+    def is_aborted():
+        return stop_event.is_set() or self.is_aborted()
+
+    def finish_gdal_process(process_result):
+        if process_result.aborted:
             logger.info(f'terminated GDAL process workspace.layer={workspace}.{layername}')
-            gdal.delete_layer(layer)
             raise AbortedException
-        return_code = process.poll()
-        if return_code != 0:
-            gdal_error = str(process.stdout.read())
+        if process_result.return_code != 0:
+            gdal_error = str(process_result.output)
             logger.error(f"STDOUT: {gdal_error}")
             raise LaymanError(50, private_data=gdal_error)
 
-    if self.is_aborted():
-        raise AbortedException
-    if original_data_source == settings.EnumOriginalDataSource.TABLE.value:
-        return
-    layer = Layer(uuid=uuid)
-    layer_info = layman_util.get_publication_info(workspace, LAYER_TYPE, layername, context={'keys': ['file']})
-    file_type = layer_info['_file']['file_type']
-    if file_type != settings.GEODATA_TYPE_RASTER:
-        return
-
-    gdal.ensure_normalized_raster_layer_dir(uuid)
-
-    if self.is_aborted():
-        raise AbortedException
-
-    input_paths = list(path['gdal'] for path in layer_info['_file']['paths'].values())
-    if not name_normalized_tif_by_layer:
-        timeseries_filename_mapping, _ = input_file.get_file_name_mappings(
-            input_paths, input_paths, uuid, output_dir='', name_input_file_by_layer=False)
-    else:
-        assert len(input_paths) == 1
-        timeseries_filename_mapping = None
-
-    for input_path in input_paths:
+    def normalize_file(input_path):
         vrt_file_path = gdal.create_vrt_file_if_needed(input_path)
-        tmp_vrt_file = tempfile.mkstemp(suffix='.vrt')[1]
+        tmp_vrt_fd, tmp_vrt_file = tempfile.mkstemp(suffix='.vrt')
+        os.close(tmp_vrt_fd)
         process = gdal.normalize_raster_file_async(vrt_file_path or input_path, crs_id, output_file=tmp_vrt_file)
-        while process.poll() is None and not self.is_aborted():
-            pass
-        finish_gdal_process(process)
+        process_result = process_util.supervise(process, is_aborted=is_aborted)
+        finish_gdal_process(process_result)
         gdal.check_bbox_and_extent(tmp_vrt_file)
         nodata_value = gdal.get_nodata_value(vrt_file_path or input_path)
         gdal.correct_nodata_value_in_vrt(tmp_vrt_file, nodata_value=nodata_value)
@@ -149,8 +132,7 @@ def refresh_gdal(self, workspace, layername,
                                                            nodata_value=nodata_value,
                                                            data_type_name=data_type_name,
                                                            )
-        while process.poll() is None and not self.is_aborted():
-            pass
+        process_result = process_util.supervise(process, is_aborted=is_aborted)
         if vrt_file_path:
             try:
                 os.remove(vrt_file_path)
@@ -160,12 +142,50 @@ def refresh_gdal(self, workspace, layername,
             os.remove(tmp_vrt_file)
         except OSError:
             pass
-        finish_gdal_process(process)
+        finish_gdal_process(process_result)
 
         process = gdal.add_overview_async(filepath=normalize_file_path, overview_resampling=overview_resampling, )
-        while process.poll() is None and not self.is_aborted():
-            pass
-        finish_gdal_process(process)
+        process_result = process_util.supervise(process, is_aborted=is_aborted)
+        finish_gdal_process(process_result)
+
+    if self.is_aborted():
+        raise AbortedException
+    if original_data_source == settings.EnumOriginalDataSource.TABLE.value:
+        return
+    layer = Layer(uuid=uuid)
+    layer_info = layman_util.get_publication_info(workspace, LAYER_TYPE, layername, context={'keys': ['file']})
+    file_type = layer_info['_file']['file_type']
+    if file_type != settings.GEODATA_TYPE_RASTER:
+        return
+
+    gdal.ensure_normalized_raster_layer_dir(uuid)
+
+    if self.is_aborted():
+        raise AbortedException
+
+    input_paths = list(path['gdal'] for path in layer_info['_file']['paths'].values())
+    if not name_normalized_tif_by_layer:
+        timeseries_filename_mapping, _ = input_file.get_file_name_mappings(
+            input_paths, input_paths, uuid, output_dir='', name_input_file_by_layer=False)
+    else:
+        assert len(input_paths) == 1
+        timeseries_filename_mapping = None
+
+    # Heavy lifting is done by GDAL subprocesses, threads only supervise them, so files are normalized in parallel
+    max_workers = max(1, min(settings.LAYMAN_GDAL_PARALLELISM, len(input_paths)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(normalize_file, input_path) for input_path in input_paths]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException as exc:
+            stop_event.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            if isinstance(exc, AbortedException):
+                gdal.delete_layer(layer)
+            raise
 
 
 @celery_app.task(
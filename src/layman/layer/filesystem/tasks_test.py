@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+import pytest
+
+from layman import settings, util as layman_util, LaymanError
+from layman.celery import AbortedException
+from layman.common import process as process_util
+from . import tasks, gdal, input_file
+
+WORKSPACE = 'test_refresh_gdal_workspace'
+LAYERNAME = 'test_refresh_gdal_layer'
+FAILING_FILE = '/data/failing.tif'
+
+
+# pylint: disable=too-many-instance-attributes
+class GdalMock:
+    def __init__(self, *, file_duration=0.2):
+        self.file_duration = file_duration
+        self.input_paths = []
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+        self.aborted = []
+        self.deleted = False
+        self.start_event = threading.Event()
+
+    def supervise(self, input_path, *, is_aborted):
+        with self.lock:
+            self.started.append(input_path)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            self.start_event.set()
+            if input_path == FAILING_FILE:
+                return process_util.ProcessResult(return_code=1, output=b'GDAL failed', aborted=False)
+            start = time.monotonic()
+            while time.monotonic() - start < self.file_duration:
+                if is_aborted():
+                    with self.lock:
+                        self.aborted.append(input_path)
+                    return process_util.ProcessResult(return_code=None, output=b'', aborted=True)
+                time.sleep(0.01)
+            return process_util.ProcessResult(return_code=0, output=b'', aborted=False)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def delete_layer(self, _):
+        self.deleted = True
+
+
+@pytest.fixture()
+def gdal_mock(monkeypatch):
+    mock = GdalMock()
+
+    def get_publication_info(*_, **__):
+        return {'_file': {'file_type': settings.GEODATA_TYPE_RASTER,
+                          'paths': {idx: {'gdal': path} for idx, path in enumerate(mock.input_paths)}}}
+
+    monkeypatch.setattr(layman_util, 'get_publication_info', get_publication_info)
+    monkeypatch.setattr(tasks, 'Layer', lambda **_: None)
+    monkeypatch.setattr(input_file, 'get_file_name_mappings',
+                        lambda input_paths, *_, **__: ({path: os.path.basename(path) for path in input_paths}, None))
+    monkeypatch.setattr(process_util, 'supervise', lambda process, *, is_aborted: mock.supervise(process, is_aborted=is_aborted))
+    monkeypatch.setattr(gdal, 'delete_layer', mock.delete_layer)
+    monkeypatch.setattr(gdal, 'ensure_normalized_raster_layer_dir', lambda _: None)
+    monkeypatch.setattr(gdal, 'create_vrt_file_if_needed', lambda _: None)
+    monkeypatch.setattr(gdal, 'normalize_raster_file_async', lambda input_path, *_, **__: input_path)
+    monkeypatch.setattr(gdal, 'check_bbox_and_extent', lambda _: None)
+    monkeypatch.setattr(gdal, 'get_nodata_value', lambda _: None)
+    monkeypatch.setattr(gdal, 'correct_nodata_value_in_vrt', lambda *_, **__: None)
+    monkeypatch.setattr(gdal, 'get_normalized_raster_layer_main_filepath', lambda *_, source_file: source_file)
+    monkeypatch.setattr(gdal, 'get_color_interpretations', lambda _: None)
+    monkeypatch.setattr(gdal, 'get_data_type_name', lambda _: None)
+    monkeypatch.setattr(gdal, 'compress_and_mask_raster_file_async', lambda *, input_file_path, output_file, **__: output_file)
+    monkeypatch.setattr(gdal, 'add_overview_async', lambda *, filepath, **__: filepath)
+    monkeypatch.setattr(tasks.refresh_gdal, 'is_aborted', lambda: False)
+    yield mock
+
+
+def refresh_gdal():
+    tasks.refresh_gdal.apply(args=[WORKSPACE, LAYERNAME], kwargs={'uuid': 'test_refresh_gdal_uuid',
+                                                                  'name_normalized_tif_by_layer': False,
+                                                                  }, throw=True)
+
+
+@pytest.mark.parametrize('parallelism, num_files, exp_max_running', [
+    pytest.param(1, 3, 1, id='sequential'),
+    pytest.param(2, 3, 2, id='parallel'),
+    pytest.param(4, 3, 3, id='more_workers_than_files'),
+    pytest.param(2, 0, 0, id='no_files'),
+])
+def test_files_normalized_in_parallel(gdal_mock, monkeypatch, parallelism, num_files, exp_max_running):
+    monkeypatch.setattr(settings, 'LAYMAN_GDAL_PARALLELISM', parallelism)
+    gdal_mock.input_paths = [f'/data/file_{idx}.tif' for idx in range(num_files)]
+
+    refresh_gdal()
+    # each file is supervised twice, once for normalization and once for overviews
+    assert sorted(gdal_mock.started) == sorted(gdal_mock.input_paths + [os.path.basename(path) for path in gdal_mock.input_paths])
+    assert gdal_mock.max_running == exp_max_running
+    assert not gdal_mock.aborted
+    assert not gdal_mock.deleted
+
+
+def test_other_files_stopped_on_failure(gdal_mock, monkeypatch):
+    monkeypatch.setattr(settings, 'LAYMAN_GDAL_PARALLELISM', 2)
+    gdal_mock.file_duration = 10
+    gdal_mock.input_paths = ['/data/slow.tif', FAILING_FILE, '/data/pending_1.tif', '/data/pending_2.tif']
+
+    start = time.monotonic()
+    with pytest.raises(LaymanError) as exc_info:
+        refresh_gdal()
+    assert exc_info.value.code == 50
+    assert time.monotonic() - start < gdal_mock.file_duration
+    assert FAILING_FILE in gdal_mock.started
+    assert '/data/slow.tif' in gdal_mock.aborted
+    assert set(gdal_mock.started) - {FAILING_FILE} == set(gdal_mock.aborted)
+    assert len(gdal_mock.started) < len(gdal_mock.input_paths)
+    assert not gdal_mock.deleted
+
+
+def test_all_files_stopped_on_abort(gdal_mock, monkeypatch):
+    monkeypatch.setattr(settings, 'LAYMAN_GDAL_PARALLELISM', 2)
+    gdal_mock.file_duration = 10
+    gdal_mock.input_paths = ['/data/slow_1.tif', '/data/slow_2.tif', '/data/pending_1.tif', '/data/pending_2.tif']
+    # aborted as soon as first file is being normalized
+    monkeypatch.setattr(tasks.refresh_gdal, 'is_aborted', gdal_mock.start_event.is_set)
+
+    start = time.monotonic()
+    with pytest.raises(AbortedException):
+        refresh_gdal()
+    assert time.monotonic() - start < gdal_mock.file_duration
+    # no file got to overviews
+    assert sorted(gdal_mock.started) == sorted(gdal_mock.aborted)
+    assert set(gdal_mock.started) <= set(gdal_mock.input_paths)
+    assert gdal_mock.deleted
@@ -1,3 +1,6 @@
+import hashlib
+import json
+import logging
 import os
 import pathlib
 
@@ -10,6 +13,7 @@ from .. import LAYER_TYPE
 from ..layer_class import Layer
 
 LAYER_SUBDIR = __name__.rsplit('.', maxsplit=1)[-1]
+logger = logging.getLogger(__name__)
 
 PATCH_MODE = patch_mode.DELETE_IF_DEPENDANT
 
@@ -60,7 +64,54 @@ def get_layer_thumbnail_path(publ_uuid):
     return os.path.join(thumbnail_dir, publ_uuid + '.png')
 
 
-def generate_layer_thumbnail(publ_uuid):
+def get_layer_thumbnail_properties_path(publ_uuid):
+    thumbnail_dir = get_layer_thumbnail_dir(publ_uuid)
+    return os.path.join(thumbnail_dir, publ_uuid + '.json')
+
+
+def get_layer_thumbnail_properties(publ_uuid):
+    try:
+        with open(get_layer_thumbnail_properties_path(publ_uuid), encoding="utf-8") as props_file:
+            return json.load(props_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_layer_data_version(publ_uuid):
+    """Versions (mtime and size) of all layer files except thumbnail, i.e. input files, style, normalized rasters."""
+    layer_dir = util.get_layer_dir(publ_uuid)
+    thumbnail_dir = get_layer_thumbnail_dir(publ_uuid)
+    result = []
+    for dirpath, dirnames, filenames in os.walk(layer_dir):
+        if dirpath == thumbnail_dir:
+            dirnames.clear()
+            continue
+        for filename in filenames:
+            stat = os.stat(os.path.join(dirpath, filename))
+            result.append((os.path.relpath(os.path.join(dirpath, filename), layer_dir), stat.st_mtime_ns, stat.st_size))
+    return sorted(result)
+
+
+def get_layer_thumbnail_fingerprint(publ_uuid, *, gs_layername, bbox, crs):
+    """Fingerprint of everything the rendered thumbnail depends on, or None if it can not be determined."""
+    layer_info = get_publication_info_by_uuid(publ_uuid, context={'keys': ['original_data_source', ]})
+    if layer_info.get('original_data_source') != settings.EnumOriginalDataSource.FILE.value:
+        # data of external table can be changed anytime by anybody
+        return None
+    fingerprint_input = {
+        'layer': gs_layername,
+        'bbox': list(bbox),
+        'crs': crs,
+        'data_version': get_layer_data_version(publ_uuid),
+    }
+    return hashlib.sha256(json.dumps(fingerprint_input).encode()).hexdigest()
+
+
+def generate_layer_thumbnail(publ_uuid, *, force=False):
+    """Render thumbnail by WMS GetMap, unless nothing changed since last rendering and `force` is False.
+
+    Data changed in DB table (e.g. by WFS-T) are not covered by fingerprint, so `force` has to be set in such case.
+    """
     headers = {
         settings.LAYMAN_GS_AUTHN_HTTP_HEADER_ATTRIBUTE: settings.LAYMAN_GS_USER,
     }
@@ -74,6 +125,12 @@ def generate_layer_thumbnail(publ_uuid):
     ensure_layer_thumbnail_dir(publ_uuid)
     tn_path = get_layer_thumbnail_path(publ_uuid)
 
+    fingerprint = get_layer_thumbnail_fingerprint(publ_uuid, gs_layername=gs_layername, bbox=tn_bbox, crs=native_crs)
+    if not force and fingerprint is not None and os.path.exists(tn_path) \
+            and get_layer_thumbnail_properties(publ_uuid).get('fingerprint') == fingerprint:
+        logger.info(f'Thumbnail of layer {publ_uuid} is up to date, rendering skipped.')
+        return
+
     from layman.layer.geoserver.wms import VERSION
     response = gs_util.get_layer_thumbnail(wms_url, gs_layername, tn_bbox, native_crs, headers=headers, wms_version=VERSION)
     if "png" not in response.headers['content-type'].lower():
@@ -81,3 +138,8 @@ def generate_layer_thumbnail(publ_uuid):
     response.raise_for_status()
     with open(tn_path, "wb") as out_file:
         out_file.write(response.content)
+    with open(get_layer_thumbnail_properties_path(publ_uuid), "w", encoding="utf-8") as props_file:
+        json.dump({
+            'fingerprint': fingerprint,
+            'etag': hashlib.sha256(response.content).hexdigest(),
+        }, props_file)
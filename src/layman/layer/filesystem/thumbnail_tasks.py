@@ -18,7 +18,7 @@ def patch_after_feature_change(self, workspace, layer):
     if self.is_aborted():
         raise AbortedException
     publ_uuid = get_publication_uuid(workspace, LAYER_TYPE, layer)
-    thumbnail.generate_layer_thumbnail(publ_uuid)
+    thumbnail.generate_layer_thumbnail(publ_uuid, force=True)
 
     if self.is_aborted():
         raise AbortedException
@@ -1,6 +1,10 @@
+import os
 import pytest
+import requests
 
+from layman import app, settings
 from test_tools import process_client
+from test_tools.util import url_for
 
 headers_sld = {
     'Accept': 'application/vnd.ogc.sld+xml',
@@ -41,3 +45,32 @@ def test_wrong_sld_causes_no_thumbnail():
     assert layer_info['thumbnail']['error']['code'] == -1
 
     process_client.delete_layer(uuid)
+
+
+@pytest.mark.usefixtures('ensure_layman')
+def test_thumbnail_not_rendered_again_and_etag():
+    workspace = 'test_thumbnail_not_rendered_again_workspace'
+    layer = 'test_thumbnail_not_rendered_again_layer'
+
+    resp = process_client.publish_workspace_layer(workspace, layer)
+    uuid = resp['uuid']
+    thumbnail_path = os.path.join(settings.LAYMAN_DATA_DIR, process_client.get_layer(uuid)['thumbnail']['path'])
+    mtime = os.stat(thumbnail_path).st_mtime_ns
+
+    with app.app_context():
+        thumbnail_url = url_for('rest_layer_thumbnail.get', uuid=uuid)
+    response = requests.get(thumbnail_url, timeout=process_client.HTTP_TIMEOUT)
+    assert response.status_code == 200, response.text
+    etag = response.headers['ETag']
+
+    response = requests.get(thumbnail_url, headers={'If-None-Match': etag}, timeout=process_client.HTTP_TIMEOUT)
+    assert response.status_code == 304
+    assert not response.content
+
+    process_client.patch_layer(uuid, title='New title')
+    assert os.stat(thumbnail_path).st_mtime_ns == mtime
+
+    response = requests.get(thumbnail_url, headers={'If-None-Match': etag}, timeout=process_client.HTTP_TIMEOUT)
+    assert response.status_code == 304
+
+    process_client.delete_layer(uuid)
@@ -42,6 +42,16 @@ def delete_whole_user(username, auth=settings.LAYMAN_GS_AUTH):
     gs_util.delete_user(username, auth)
 
 
+def delete_security_rules_of_layers(uuids, auth=settings.LAYMAN_GS_AUTH):
+    rules = [
+        f"{gs_ids.workspace}.{gs_ids.name}.{right_type}"
+        for uuid in uuids
+        for gs_ids in [GeoserverIds(uuid=uuid).wfs, GeoserverIds(uuid=uuid).wms]
+        for right_type in ['r', 'w']
+    ]
+    gs_util.delete_security_rules(rules, auth)
+
+
 def get_all_rules(auth):
     key = FLASK_RULES_KEY
     if key not in g:
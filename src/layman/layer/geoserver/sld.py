@@ -29,7 +29,7 @@ def delete_layer(layer: Layer):
     if layer:
         gs_style_name = layer.gs_ids.sld
         sld_stream = gs_util.delete_workspace_style(gs_style_name.workspace, gs_style_name.name, auth=settings.LAYMAN_GS_AUTH)
-        wms.clear_cache()
+        wms.clear_cache(layer.gs_ids.wms)
     if sld_stream:
         result = {
             'style': {
@@ -112,7 +112,7 @@ def create_layer_style(*, layer: Layer):
                                      style_file,
                                      launder_attribute_name,
                                      )
-    wms.clear_cache()
+    wms.clear_cache(layer.gs_ids.wms)
 
 
 def get_style_response(*, uuid, headers=None, auth=None):
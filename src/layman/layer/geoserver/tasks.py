@@ -101,7 +101,7 @@ def refresh_wms(
                        auth=settings.LAYMAN_GS_AUTH,
                        )
 
-    wms.clear_cache()
+    wms.clear_cache(gs_layername)
 
     if self.is_aborted():
         wms.delete_layer(layer=layer)
@@ -151,7 +151,7 @@ def refresh_wfs(
                        access_rights=access_rights,
                        auth=settings.LAYMAN_GS_AUTH,
                        )
-    wfs.clear_cache()
+    wfs.clear_cache(gs_layername)
 
     if self.is_aborted():
         wfs.delete_layer(layer=layer)
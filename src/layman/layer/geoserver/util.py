@@ -1,3 +1,4 @@
+import json
 import logging
 from urllib.parse import urlparse
 
@@ -5,12 +6,14 @@ import crs as crs_def
 from geoserver import util as gs_util
 from layman import settings, util as layman_util
 from layman.common import bbox as bbox_util, geoserver as gs_common
-from layman.layer.geoserver import wms
+from layman.layer import LAYER_TYPE
+from layman.layer.geoserver import wms, GeoserverIds
 from layman.layer.layer_class import Layer
 from layman.util import XForwardedClass
 
 logger = logging.getLogger(__name__)
 CACHE_GS_PROXY_BASE_URL_KEY = f'{__name__}:GS_PROXY_BASE_URL'
+LAYER_CAPABILITIES_KEY = f'{__name__}:LAYER_CAPABILITIES:{{workspace}}:{{name}}'
 DEFAULT_EXTERNAL_DB_STORE_PREFIX = 'external_db'
 DEFAULT_INTERNAL_DB_STORE = 'postgresql'
 
@@ -24,6 +27,47 @@ def get_gs_proxy_server_url(*, x_forwarded_items=None):
     return proxy_base_url
 
 
+def get_layer_capabilities_key(gs_layername):
+    return LAYER_CAPABILITIES_KEY.format(workspace=gs_layername.workspace, name=gs_layername.name)
+
+
+def get_layer_capabilities(gs_layername, create_props):
+    """Return capabilities properties of one GeoServer layer from per-layer index in Redis.
+
+    Missing entry is created by `create_props` callback, that is expected to parse capabilities of GeoServer's
+    layer virtual service, so that size of the document does not depend on number of layers.
+    """
+    key = get_layer_capabilities_key(gs_layername)
+    string_value = settings.LAYMAN_REDIS.get(key)
+    if string_value is not None:
+        return json.loads(string_value)
+    props = create_props()
+    if props is not None:
+        settings.LAYMAN_REDIS.set(key, json.dumps(props), ex=settings.LAYMAN_CACHE_GS_LAYER_CAPABILITIES_TIMEOUT)
+    return props
+
+
+def delete_layer_capabilities(gs_layername):
+    settings.LAYMAN_REDIS.delete(get_layer_capabilities_key(gs_layername))
+
+
+def _replace_last(string, old, new):
+    head, sep, tail = string.rpartition(old)
+    return f'{head}{new}{tail}' if sep else string
+
+
+def get_layer_service_url(workspace_service_url, gs_layername):
+    """Return URL of GeoServer's layer virtual service, e.g. http://geoserver:8080/geoserver/layman_wms/l_abc/ows"""
+    return _replace_last(workspace_service_url, f'/{gs_layername.workspace}/',
+                         f'/{gs_layername.workspace}/{gs_layername.name}/')
+
+
+def get_workspace_service_url(layer_service_url, gs_layername):
+    """Inverse of get_layer_service_url, used for URLs published in capabilities of layer virtual service."""
+    return _replace_last(layer_service_url, f'/{gs_layername.workspace}/{gs_layername.name}/',
+                         f'/{gs_layername.workspace}/') if layer_service_url else layer_service_url
+
+
 def wms_proxy(wms_url, xml=None, version=None, headers=None):
     from layman.layer.geoserver.wms import VERSION
     version = version or VERSION
@@ -112,15 +156,34 @@ def create_external_db_store(workspace, *, uuid, table_uri, auth=settings.LAYMAN
     return store_name
 
 
+def get_layer_security_rules(gs_names, access_rights):
+    """Return GeoServer ACL rules (rule -> set of GeoServer roles) of the layer for access rights that are set."""
+    rules = {}
+    for right_type, rule_type in [('read', 'r'), ('write', 'w')]:
+        if access_rights and access_rights.get(right_type):
+            rule = gs_util.get_layer_security_rule(gs_names.workspace, gs_names.name, rule_type)
+            rules[rule] = gs_common.layman_users_and_roles_to_geoserver_roles(access_rights[right_type])
+    return rules
+
+
 def set_security_rules(*, layer: Layer, gs_names, access_rights, auth, ):
     read_roles = access_rights.get('read') if access_rights and access_rights.get('read') else layer.access_rights['read']
     write_roles = access_rights.get('write') if access_rights and access_rights.get('write') else layer.access_rights['write']
 
-    security_read_roles = gs_common.layman_users_and_roles_to_geoserver_roles(read_roles)
-    gs_util.ensure_layer_security_roles(gs_names.workspace, gs_names.name, security_read_roles, 'r', auth)
+    rules = get_layer_security_rules(gs_names, {'read': read_roles, 'write': write_roles})
+    gs_util.ensure_security_rules(rules, auth)
+
 
-    security_write_roles = gs_common.layman_users_and_roles_to_geoserver_roles(write_roles)
-    gs_util.ensure_layer_security_roles(gs_names.workspace, gs_names.name, security_write_roles, 'w', auth)
+def sync_all_security_rules(auth=settings.LAYMAN_GS_AUTH):
+    """Ensure GeoServer ACL rules of all layers according to their access rights, using one batched update."""
+    rules = {}
+    for pub_info in layman_util.get_publication_infos(publ_type=LAYER_TYPE).values():
+        gs_ids = GeoserverIds(uuid=pub_info['uuid'])
+        rules.update(get_layer_security_rules(gs_ids.wms, pub_info['access_rights']))
+        if pub_info['geodata_type'] == settings.GEODATA_TYPE_VECTOR:
+            rules.update(get_layer_security_rules(gs_ids.wfs, pub_info['access_rights']))
+    gs_util.ensure_security_rules(rules, auth)
+    return rules
 
 
 def get_layer_bbox(*, layer: Layer):
@@ -1,6 +1,8 @@
+import pytest
+
 from layman import settings
-from . import get_usernames
-from .util import image_mosaic_granules_to_wms_time_key
+from . import get_usernames, GeoserverIdsForSource
+from .util import image_mosaic_granules_to_wms_time_key, get_layer_service_url, get_workspace_service_url
 
 
 def test_layman_gs_user_not_in_get_usernames():
@@ -60,3 +62,14 @@ def test_image_mosaic_granules_to_wms_time_key():
         'values': ['2022-03-16T00:00:00.000Z', '2022-03-19T00:00:00.000Z'],
         'default': '2022-03-19T00:00:00.000Z',
     }
+
+
+@pytest.mark.parametrize('workspace_service_url, layer_service_url', [
+    pytest.param('http://geoserver:8080/geoserver/layman_wms/ows', 'http://geoserver:8080/geoserver/layman_wms/l_abc/ows', id='wms'),
+    pytest.param('http://layman/geoserver/layman/wfs', 'http://layman/geoserver/layman/l_abc/wfs', id='wfs_host_equal_to_workspace'),
+])
+def test_layer_service_url(workspace_service_url, layer_service_url):
+    gs_layername = GeoserverIdsForSource(workspace=workspace_service_url.split('/')[-2], name='l_abc')
+    assert get_layer_service_url(workspace_service_url, gs_layername) == layer_service_url
+    assert get_workspace_service_url(layer_service_url, gs_layername) == workspace_service_url
+    assert get_workspace_service_url(f'{layer_service_url}?SERVICE=WMS&', gs_layername) == f'{workspace_service_url}?SERVICE=WMS&'
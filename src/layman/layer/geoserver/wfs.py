@@ -1,17 +1,19 @@
 from urllib.parse import urljoin
 from flask import current_app
+from owslib.util import ServiceException
 
 from geoserver import util as gs_util
-from layman import settings, patch_mode
+from layman import settings, patch_mode, celery as celery_util
 from layman.cache import mem_redis
-from layman.common import geoserver as gs_common, empty_method
+from layman.common import empty_method
 from layman.layer.geoserver import GEOSERVER_WFS_WORKSPACE, GeoserverIds
-from layman.layer.util import is_layer_chain_ready
 from layman import util as layman_util
 from layman.layer import LAYER_TYPE
 from layman.layer.layer_class import Layer
 import requests_util.retry
-from .util import get_gs_proxy_server_url, get_external_db_store_name, get_db_store_name, DEFAULT_INTERNAL_DB_STORE
+from .util import get_gs_proxy_server_url, get_external_db_store_name, get_db_store_name, DEFAULT_INTERNAL_DB_STORE, \
+    get_layer_capabilities, delete_layer_capabilities, get_layer_service_url, get_workspace_service_url, \
+    get_layer_security_rules
 from . import wms
 
 FLASK_PROXY_KEY = f'{__name__}:PROXY:{{workspace}}'
@@ -38,27 +40,25 @@ def patch_layer(layer: Layer):
 
     store_name = get_db_store_name(uuid=layer.uuid, original_data_source=layer.original_data_source.value)
     gs_util.patch_feature_type(gs_layer_ids.workspace, gs_layer_ids.name, store_name=store_name, title=layer.title, description=layer.description, auth=settings.LAYMAN_GS_AUTH)
-    clear_cache()
+    clear_cache(gs_layer_ids)
 
-    if layer.access_rights and layer.access_rights.get('read'):
-        security_read_roles = gs_common.layman_users_and_roles_to_geoserver_roles(layer.access_rights['read'])
-        gs_util.ensure_layer_security_roles(gs_layer_ids.workspace, gs_layer_ids.name, security_read_roles, 'r', settings.LAYMAN_GS_AUTH)
+    security_rules = get_layer_security_rules(gs_layer_ids, layer.access_rights)
+    if security_rules:
+        gs_util.ensure_security_rules(security_rules, settings.LAYMAN_GS_AUTH)
 
-    if layer.access_rights and layer.access_rights.get('write'):
-        security_write_roles = gs_common.layman_users_and_roles_to_geoserver_roles(layer.access_rights['write'])
-        gs_util.ensure_layer_security_roles(gs_layer_ids.workspace, gs_layer_ids.name, security_write_roles, 'w', settings.LAYMAN_GS_AUTH)
 
-
-def delete_layer(layer: Layer):
+def delete_layer(layer: Layer, is_part_of_bulk_delete=False):
     db_store_name = DEFAULT_INTERNAL_DB_STORE
     gs_layername = layer.gs_ids.wfs
     gs_util.delete_feature_type(gs_layername.workspace, gs_layername.name, settings.LAYMAN_GS_AUTH, store=db_store_name)
     gs_util.delete_feature_type(gs_layername.workspace, gs_layername.name, settings.LAYMAN_GS_AUTH, store=get_external_db_store_name(uuid=layer.uuid))
     gs_util.delete_db_store(gs_layername.workspace, settings.LAYMAN_GS_AUTH, store_name=get_external_db_store_name(uuid=layer.uuid))
-    clear_cache()
+    clear_cache(gs_layername)
 
-    gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.r", settings.LAYMAN_GS_AUTH)
-    gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.w", settings.LAYMAN_GS_AUTH)
+    # ACL rules of layers deleted in bulk are deleted later by `delete_security_rules_of_layers`
+    if not is_part_of_bulk_delete:
+        gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.r", settings.LAYMAN_GS_AUTH)
+        gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.w", settings.LAYMAN_GS_AUTH)
     return {}
 
 
@@ -70,20 +70,7 @@ def get_wfs_url(external_url=False, *, x_forwarded_items=None):
     return urljoin(base_url, workspace + '/wfs')
 
 
-def get_wfs_direct():
-    headers = {
-        settings.LAYMAN_GS_AUTHN_HTTP_HEADER_ATTRIBUTE: settings.LAYMAN_GS_USER,
-    }
-    ows_url = get_wfs_url()
-    from geoserver.util import wfs_direct
-    key = get_flask_proxy_key()
-    redis_obj = settings.LAYMAN_REDIS.hgetall(key)
-    string_value = redis_obj['value'] if redis_obj else None
-    return wfs_direct(ows_url, xml=string_value, headers=headers)
-
-
 def get_wfs_proxy():
-    workspace = GEOSERVER_WFS_WORKSPACE
     headers = {
         settings.LAYMAN_GS_AUTHN_HTTP_HEADER_ATTRIBUTE: settings.LAYMAN_GS_USER,
         'X-Forwarded-Proto': settings.LAYMAN_PUBLIC_URL_SCHEME,
@@ -116,21 +103,18 @@ def get_wfs_proxy():
         return wfs_proxy
 
     def currently_changing():
-        layerinfos = layman_util.get_publication_infos(workspace, LAYER_TYPE)
-        result = any((
-            not is_layer_chain_ready(workspace, layername)
-            for (_, _, layername) in layerinfos
-        ))
-        return result
+        return celery_util.is_any_publication_chain_running(LAYER_TYPE)
 
     wfs_proxy = mem_redis.get(key, create_string_value, mem_value_from_string_value, currently_changing)
 
     return wfs_proxy
 
 
-def clear_cache():
+def clear_cache(gs_layername=None):
     key = get_flask_proxy_key()
     mem_redis.delete(key)
+    if gs_layername is not None:
+        delete_layer_capabilities(gs_layername)
 
 
 def get_layer_info(workspace, layername, *, x_forwarded_items=None):
@@ -160,16 +144,17 @@ def get_layer_info_by_uuid(*, uuid, x_forwarded_items=None):
     }
 
 
-def get_metadata_comparison(layer: Layer):
-    gs_layername = layer.gs_ids.wfs
-    if layer.geodata_type in (settings.GEODATA_TYPE_RASTER, settings.GEODATA_TYPE_UNKNOWN):
-        return {}
-    if layer.geodata_type != settings.GEODATA_TYPE_VECTOR:
-        raise NotImplementedError(f"Unknown geodata type: {layer.geodata_type}")
-
-    wfs = get_wfs_direct()
+def create_layer_capabilities_props(gs_layername):
+    headers = {
+        settings.LAYMAN_GS_AUTHN_HTTP_HEADER_ATTRIBUTE: settings.LAYMAN_GS_USER,
+    }
+    layer_wfs_url = get_layer_service_url(get_wfs_url(), gs_layername)
+    try:
+        wfs = gs_util.wfs_direct(layer_wfs_url, headers=headers)
+    except ServiceException:
+        wfs = None
     if wfs is None:
-        return {}
+        return None
     cap_op = wfs.getOperationByName('GetCapabilities')
     wfs_url = next(
         (
@@ -179,7 +164,9 @@ def get_metadata_comparison(layer: Layer):
         ), None
     )
     wfs_layername = f"{gs_layername.workspace}:{gs_layername.name}"
-    wfs_layer = wfs.contents.get(wfs_layername, None)
+    wfs_layer = wfs.contents.get(wfs_layername) or wfs.contents.get(gs_layername.name)
+    if wfs_layer is None:
+        return None
     try:
         title = wfs_layer.title
     except BaseException:
@@ -200,13 +187,27 @@ def get_metadata_comparison(layer: Layer):
     except BaseException as exception:
         current_app.logger.error(exception)
         reference_system = None
-    props = {
-        'wfs_url': wfs_url,
+    return {
+        'wfs_url': get_workspace_service_url(wfs_url, gs_layername),
         'title': title,
         'abstract': abstract,
         'extent': extent,
         'reference_system': reference_system,
     }
+
+
+def get_metadata_comparison(layer: Layer):
+    gs_layername = layer.gs_ids.wfs
+    if layer.geodata_type in (settings.GEODATA_TYPE_RASTER, settings.GEODATA_TYPE_UNKNOWN):
+        return {}
+    if layer.geodata_type != settings.GEODATA_TYPE_VECTOR:
+        raise NotImplementedError(f"Unknown geodata type: {layer.geodata_type}")
+
+    props = get_layer_capabilities(gs_layername, lambda: create_layer_capabilities_props(gs_layername))
+    if props is None:
+        return {}
+    if props['extent'] is not None:
+        props['extent'] = tuple(props['extent'])
     # current_app.logger.info(f"props:\n{json.dumps(props, indent=2)}")
     url = get_capabilities_url()
     return {
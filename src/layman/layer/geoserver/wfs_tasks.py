@@ -33,7 +33,7 @@ def patch_after_feature_change(
     gs_layername = layer_data.gs_ids.wfs
     gs_util.patch_feature_type(gs_layername.workspace, gs_layername.name, auth=settings.LAYMAN_GS_AUTH, bbox=bbox, crs=layer_data.native_crs,
                                store_name=store_name)
-    wfs.clear_cache()
+    wfs.clear_cache(gs_layername)
 
     if self.is_aborted():
         raise AbortedException
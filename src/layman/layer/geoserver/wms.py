@@ -5,20 +5,21 @@ import itertools
 import logging
 import os
 from flask import current_app
+from owslib.util import ServiceException
 
 import layman.layer.geoserver
 from geoserver import util as gs_util
-from layman import settings, patch_mode, util as layman_util
+from layman import settings, patch_mode, celery as celery_util, util as layman_util
 from layman.cache import mem_redis
-from layman.common import geoserver as gs_common, empty_method
-from layman.layer.util import is_layer_chain_ready
+from layman.common import empty_method
 from layman.layer import LAYER_TYPE
 from layman.layer.filesystem import gdal
 from layman.layer.layer_class import Layer
 import requests_util.retry
 from . import GeoserverIds
 from .util import get_gs_proxy_server_url, get_external_db_store_name, image_mosaic_granules_to_wms_time_key, \
-    get_db_store_name, DEFAULT_INTERNAL_DB_STORE
+    get_db_store_name, DEFAULT_INTERNAL_DB_STORE, get_layer_capabilities, delete_layer_capabilities, \
+    get_layer_service_url, get_workspace_service_url, get_layer_security_rules
 
 FLASK_PROXY_KEY = f'{__name__}:PROXY:{{workspace}}'
 DEFAULT_WMS_QGIS_STORE_PREFIX = 'qgis'
@@ -58,18 +59,14 @@ def patch_layer(layer: Layer):
         gs_util.patch_coverage(gs_layer_ids.workspace, gs_layer_ids.name, store, title=layer.title, description=layer.description, auth=settings.LAYMAN_GS_AUTH)
     else:
         raise NotImplementedError(f"Unknown geodata type: {geodata_type}")
-    clear_cache()
+    clear_cache(gs_layer_ids)
 
-    if layer.access_rights and layer.access_rights.get('read'):
-        security_read_roles = gs_common.layman_users_and_roles_to_geoserver_roles(layer.access_rights['read'])
-        gs_util.ensure_layer_security_roles(gs_layer_ids.workspace, gs_layer_ids.name, security_read_roles, 'r', settings.LAYMAN_GS_AUTH)
+    security_rules = get_layer_security_rules(gs_layer_ids, layer.access_rights)
+    if security_rules:
+        gs_util.ensure_security_rules(security_rules, settings.LAYMAN_GS_AUTH)
 
-    if layer.access_rights and layer.access_rights.get('write'):
-        security_write_roles = gs_common.layman_users_and_roles_to_geoserver_roles(layer.access_rights['write'])
-        gs_util.ensure_layer_security_roles(gs_layer_ids.workspace, gs_layer_ids.name, security_write_roles, 'w', settings.LAYMAN_GS_AUTH)
 
-
-def delete_layer(layer: Layer):
+def delete_layer(layer: Layer, is_part_of_bulk_delete=False):
     db_store_name = DEFAULT_INTERNAL_DB_STORE
     gs_layername = layer.gs_ids.wms
     gs_util.delete_feature_type(gs_layername.workspace, gs_layername.name, settings.LAYMAN_GS_AUTH, store=db_store_name)
@@ -79,10 +76,12 @@ def delete_layer(layer: Layer):
     gs_util.delete_coverage_store(gs_layername.workspace, settings.LAYMAN_GS_AUTH, get_geotiff_store_name(uuid=layer.uuid))
     gs_util.delete_coverage_store(gs_layername.workspace, settings.LAYMAN_GS_AUTH, get_image_mosaic_store_name(uuid=layer.uuid))
     gs_util.delete_db_store(gs_layername.workspace, settings.LAYMAN_GS_AUTH, store_name=get_external_db_store_name(uuid=layer.uuid))
-    clear_cache()
+    clear_cache(gs_layername)
 
-    gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.r", settings.LAYMAN_GS_AUTH)
-    gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.w", settings.LAYMAN_GS_AUTH)
+    # ACL rules of layers deleted in bulk are deleted later by `delete_security_rules_of_layers`
+    if not is_part_of_bulk_delete:
+        gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.r", settings.LAYMAN_GS_AUTH)
+        gs_util.delete_security_roles(f"{gs_layername.workspace}.{gs_layername.name}.w", settings.LAYMAN_GS_AUTH)
     return {}
 
 
@@ -94,18 +93,6 @@ def get_wms_url(external_url=False, *, x_forwarded_items=None):
     return urljoin(base_url, workspace + '/ows')
 
 
-def get_wms_direct():
-    headers = {
-        settings.LAYMAN_GS_AUTHN_HTTP_HEADER_ATTRIBUTE: settings.LAYMAN_GS_USER,
-    }
-    ows_url = get_wms_url()
-    from geoserver.util import wms_direct
-    key = get_flask_proxy_key()
-    redis_obj = settings.LAYMAN_REDIS.hgetall(key)
-    string_value = redis_obj['value'] if redis_obj else None
-    return wms_direct(ows_url, xml=string_value, headers=headers)
-
-
 def get_wms_proxy():
     headers = {
         settings.LAYMAN_GS_AUTHN_HTTP_HEADER_ATTRIBUTE: settings.LAYMAN_GS_USER,
@@ -139,20 +126,17 @@ def get_wms_proxy():
         return wms_proxy
 
     def currently_changing():
-        layerinfos = layman_util.get_publication_infos(publ_type=LAYER_TYPE)
-        result = any((
-            not is_layer_chain_ready(workspace, layername)
-            for (workspace, _, layername) in layerinfos
-        ))
-        return result
+        return celery_util.is_any_publication_chain_running(LAYER_TYPE)
 
     wms_proxy = mem_redis.get(key, create_string_value, mem_value_from_string_value, currently_changing)
     return wms_proxy
 
 
-def clear_cache():
+def clear_cache(gs_layername=None):
     key = get_flask_proxy_key()
     mem_redis.delete(key)
+    if gs_layername is not None:
+        delete_layer_capabilities(gs_layername)
 
 
 def get_timeregex_props(layer_dir):
@@ -217,11 +201,17 @@ def get_layer_info_by_uuid(*, uuid, x_forwarded_items=None):
     return result
 
 
-def get_metadata_comparison(layer: Layer):
-    gs_layername = layer.gs_ids.wms
-    wms = get_wms_direct()
+def create_layer_capabilities_props(gs_layername):
+    headers = {
+        settings.LAYMAN_GS_AUTHN_HTTP_HEADER_ATTRIBUTE: settings.LAYMAN_GS_USER,
+    }
+    layer_ows_url = get_layer_service_url(get_wms_url(), gs_layername)
+    try:
+        wms = gs_util.wms_direct(layer_ows_url, headers=headers)
+    except ServiceException:
+        wms = None
     if wms is None:
-        return {}
+        return None
     cap_op = wms.getOperationByName('GetCapabilities')
     wms_url = next(
         (
@@ -230,7 +220,9 @@ def get_metadata_comparison(layer: Layer):
             if m.get("type").lower() == 'get'
         ), None
     )
-    wms_layer = wms.contents.get(gs_layername.name, None)
+    wms_layer = wms.contents.get(gs_layername.name) or wms.contents.get(f"{gs_layername.workspace}:{gs_layername.name}")
+    if wms_layer is None:
+        return None
     try:
         title = wms_layer.title
     except BaseException:
@@ -253,16 +245,25 @@ def get_metadata_comparison(layer: Layer):
         current_app.logger.error(exc)
         reference_system = None
 
-    temporal_extent = wms.contents[gs_layername.name].dimensions['time']['values'] if gs_layername.name in wms.contents and 'time' in wms.contents[gs_layername.name].dimensions else None
+    temporal_extent = wms_layer.dimensions['time']['values'] if 'time' in wms_layer.dimensions else None
 
-    props = {
-        'wms_url': wms_url,
+    return {
+        'wms_url': get_workspace_service_url(wms_url, gs_layername),
         'title': title,
         'abstract': abstract,
         'extent': extent,
         'reference_system': reference_system,
         'temporal_extent': temporal_extent,
     }
+
+
+def get_metadata_comparison(layer: Layer):
+    gs_layername = layer.gs_ids.wms
+    props = get_layer_capabilities(gs_layername, lambda: create_layer_capabilities_props(gs_layername))
+    if props is None:
+        return {}
+    if props['extent'] is not None:
+        props['extent'] = tuple(props['extent'])
     # current_app.logger.info(f"props:\n{json.dumps(props, indent=2)}")
     url = get_capabilities_url()
     return {
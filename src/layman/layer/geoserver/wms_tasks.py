@@ -36,7 +36,7 @@ def patch_after_feature_change(
                                        lat_lon_bbox=lat_lon_bbox, store_name=store_name)
         elif layer_data.style_type == 'qml':
             gs_util.patch_wms_layer(wms_layername.workspace, wms_layername.name, auth=settings.LAYMAN_GS_AUTH, bbox=bbox, crs=layer_data.native_crs, lat_lon_bbox=lat_lon_bbox)
-        wms.clear_cache()
+        wms.clear_cache(wms_layername)
     elif layer_data.style_type != settings.GEODATA_TYPE_RASTER:
         raise NotImplementedError(f"Unknown geodata type: {layer_data.geodata_type}")
 
@@ -17,6 +17,8 @@ from ..common.micka import MickaIds
 class Layer(Publication):
     _class_publication_type_for_create: ClassVar[str] = LAYER_TYPE
     _class_init_tuple_name: ClassVar[str] = 'layer_tuple'
+    _class_load_keys: ClassVar[list] = Publication._class_load_keys + ['geodata_type', 'style_type', 'original_data_source',
+                                                                       'table_uri', 'image_mosaic', ]
 
     geodata_type: Literal["vector", "raster", "unknown"]
     style_type: str
@@ -26,12 +26,11 @@ post_layer = empty_method
 
 def get_layer_info(workspace, layername, *, x_forwarded_items=None):
     layer = Layer(layer_tuple=(workspace, layername))
+    if not layer or settings.CSW_URL is None:
+        return {}
+    muuid = layer.micka_ids.id
     try:
-        csw = common_util.create_csw()
-        if not layer or csw is None:
-            return {}
-        muuid = layer.micka_ids.id
-        csw.getrecordbyid(id=[muuid], esn='brief')
+        record_exists = muuid in common_util.get_existing_record_ids([muuid])
     except HTTPError as exc:
         current_app.logger.info(f'traceback={traceback.format_exc()},\n'
                                 f'response={exc.response.text},\n'
@@ -40,7 +39,7 @@ def get_layer_info(workspace, layername, *, x_forwarded_items=None):
     except ConnectionError:
         current_app.logger.info(traceback.format_exc())
         return {}
-    if muuid in csw.records:
+    if record_exists:
         return {
             'metadata': {
                 'identifier': muuid,
@@ -7,6 +7,7 @@ import pytest
 from layman import app, LaymanError
 from layman import settings
 from layman.layer.layer_class import Layer
+from layman.common.micka import util as common_util, requests as micka_requests
 from test_tools import process, process_client
 from test_tools.mock.micka import run
 from .csw import get_layer_info, delete_layer
@@ -125,3 +126,18 @@ def test_public_metadata(provide_layer):
     response = requests.get(micka_url, timeout=settings.DEFAULT_CONNECTION_TIMEOUT)
     response.raise_for_status()
     assert muuid in response.text, f"Metadata record {muuid} is not public!"
+
+
+@pytest.mark.usefixtures('ensure_layman')
+def test_record_presence_cache(provide_layer):
+    muuid = provide_layer.micka_ids.id
+    unknown_muuid = 'm-00000000-0000-0000-0000-000000000000'
+    with app.app_context():
+        assert micka_requests.is_record_present(muuid), 'presence is remembered on insert'
+
+        micka_requests.delete_record_presence(muuid)
+        assert common_util.get_existing_record_ids([muuid, unknown_muuid]) == {muuid}
+        assert micka_requests.is_record_present(muuid)
+        assert not micka_requests.is_record_present(unknown_muuid)
+
+        assert get_layer_info(provide_layer.workspace, provide_layer.name)['metadata']['identifier'] == muuid
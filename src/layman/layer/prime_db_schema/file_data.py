@@ -1,3 +1,5 @@
+import json
+
 from layman import patch_mode, settings
 from layman.common import empty_method, empty_method_returns_dict
 from layman.common.prime_db_schema import publications
@@ -10,8 +12,43 @@ get_layer_info = empty_method_returns_dict
 pre_publication_action_check = empty_method
 get_metadata_comparison = empty_method_returns_dict
 
+CHANGED_BBOXES_KEY = f'{__name__}:CHANGED_BBOXES'
+
+
+def get_changed_bboxes_key(uuid):
+    return f'{CHANGED_BBOXES_KEY}:{uuid}'
+
+
+def add_changed_bbox(uuid, bbox):
+    """Record bbox of features inserted or updated by one feature change of the layer.
+
+    Empty bbox means that no geometry was inserted or updated, None means that bbox is not known.
+    """
+    settings.LAYMAN_REDIS.rpush(get_changed_bboxes_key(uuid), json.dumps(bbox))
+
+
+def get_changed_bboxes(uuid):
+    """Return recorded bboxes without removing them, see `trim_changed_bboxes`."""
+    values = settings.LAYMAN_REDIS.lrange(get_changed_bboxes_key(uuid), 0, -1)
+    return [json.loads(value) for value in values]
+
+
+def trim_changed_bboxes(uuid, count):
+    """Remove first `count` recorded bboxes, i.e. the ones already reflected in stored bbox. Bboxes recorded in the
+    meantime are kept for next run."""
+    settings.LAYMAN_REDIS.ltrim(get_changed_bboxes_key(uuid), count, -1)
+
+
+def pop_changed_bboxes(uuid):
+    with settings.LAYMAN_REDIS.pipeline() as pipe:
+        pipe.lrange(get_changed_bboxes_key(uuid), 0, -1)
+        pipe.delete(get_changed_bboxes_key(uuid))
+        values, _ = pipe.execute()
+    return [json.loads(value) for value in values]
+
 
 def delete_layer(layer: Layer):
+    pop_changed_bboxes(layer.uuid)
     publications.set_bbox(layer.workspace, layer.type, layer.name, bbox=(None, None, None, None, ), crs=None)
     if layer.original_data_source == settings.EnumOriginalDataSource.FILE:
         publications.set_geodata_type(layer.workspace, layer.type, layer.name, settings.GEODATA_TYPE_UNKNOWN, )
@@ -3,7 +3,8 @@ from celery.utils.log import get_task_logger
 from layman.celery import AbortedException
 from layman import celery_app, util as layman_util, settings
 from .. import LAYER_TYPE
-from ..db import get_bbox as db_get_bbox
+from ..db import get_bbox_after_feature_change as db_get_bbox_after_feature_change
+from . import file_data
 from ...common.prime_db_schema.publications import set_bbox
 
 logger = get_task_logger(__name__)
@@ -23,18 +24,25 @@ def patch_after_feature_change(
         raise AbortedException
 
     info = layman_util.get_publication_info(username, LAYER_TYPE, layername,
-                                            context={'keys': ['geodata_type', 'native_crs', 'table_uri']})
+                                            context={'keys': ['uuid', 'geodata_type', 'native_crs', 'native_bounding_box',
+                                                              'table_uri']})
     geodata_type = info['geodata_type']
     crs = info['native_crs']
     assert geodata_type == settings.GEODATA_TYPE_VECTOR
 
     table_uri = info['_table_uri']
-    bbox = db_get_bbox(table_uri.schema, table_uri.table, uri_str=table_uri.db_uri_str, column=table_uri.geo_column)
+    # bboxes are removed only after the new bbox is stored, so aborted or failed run does not lose them
+    recorded_bboxes = file_data.get_changed_bboxes(info['uuid'])
+    # without recorded bboxes the source of the change is unknown, so None forces full-table extent
+    changed_bboxes = recorded_bboxes or [None]
+    bbox = db_get_bbox_after_feature_change(table_uri.schema, table_uri.table, info['native_bounding_box'],
+                                            changed_bboxes, uri_str=table_uri.db_uri_str, column=table_uri.geo_column)
 
     if self.is_aborted():
         raise AbortedException
 
     set_bbox(username, LAYER_TYPE, layername, bbox, crs)
+    file_data.trim_changed_bboxes(info['uuid'], len(recorded_bboxes))
 
     if self.is_aborted():
         raise AbortedException
@@ -0,0 +1,54 @@
+import pytest
+from psycopg2 import sql
+
+from db import util as db_util
+from layman import app, util as layman_util
+from layman.celery import AbortedException
+from test_tools import process_client
+from . import file_data, file_data_tasks
+from .. import LAYER_TYPE, db
+
+WORKSPACE = 'test_file_data_tasks_workspace'
+
+
+def get_bbox(layername):
+    with app.app_context():
+        info = layman_util.get_publication_info(WORKSPACE, LAYER_TYPE, layername,
+                                                context={'keys': ['native_bounding_box']})
+    return tuple(info['native_bounding_box'])
+
+
+@pytest.mark.usefixtures('ensure_layman')
+def test_aborted_patch_after_feature_change_keeps_changed_bboxes(monkeypatch):
+    layername = 'test_aborted_feature_change_layer'
+    layer_uuid = process_client.publish_workspace_layer(WORKSPACE, layername)['uuid']
+    bbox = get_bbox(layername)
+    with app.app_context():
+        info = layman_util.get_publication_info(WORKSPACE, LAYER_TYPE, layername, context={'keys': ['table_uri']})
+    table_uri = info['_table_uri']
+    new_x, new_y = bbox[0] - 1, bbox[1] - 1
+
+    with app.app_context():
+        srid = db.get_column_srid(table_uri.schema, table_uri.table, table_uri.geo_column)
+        db_util.run_statement(sql.SQL('insert into {table} ({column}) values (ST_SetSRID(ST_MakePoint(%s, %s), %s))').format(
+            table=sql.Identifier(table_uri.schema, table_uri.table),
+            column=sql.Identifier(table_uri.geo_column),
+        ), (new_x, new_y, srid))
+    file_data.add_changed_bbox(layer_uuid, (new_x, new_y, new_x, new_y))
+
+    # aborted after the new bbox was computed, but before it was stored
+    is_aborted_results = iter([False, True])
+    monkeypatch.setattr(file_data_tasks.patch_after_feature_change, 'is_aborted', lambda: next(is_aborted_results))
+    with app.app_context():
+        with pytest.raises(AbortedException):
+            file_data_tasks.patch_after_feature_change.apply(args=[WORKSPACE, layername], throw=True)
+    assert get_bbox(layername) == bbox
+    assert file_data.get_changed_bboxes(layer_uuid) == [[new_x, new_y, new_x, new_y]]
+
+    monkeypatch.setattr(file_data_tasks.patch_after_feature_change, 'is_aborted', lambda: False)
+    with app.app_context():
+        file_data_tasks.patch_after_feature_change.apply(args=[WORKSPACE, layername], throw=True)
+    assert get_bbox(layername) == (new_x, new_y, bbox[2], bbox[3])
+    assert file_data.get_changed_bboxes(layer_uuid) == []
+
+    process_client.delete_layer(layer_uuid)
@@ -10,7 +10,11 @@ PATCH_MODE = patch_mode.DELETE_IF_DEPENDANT
 get_metadata_comparison = empty_method_returns_dict
 
 
-def get_layer_info(workspace, layername):
+def get_layer_info(workspace, layername, keys=None):
+    if pubs_util.is_lookup_enough(keys):
+        layers = pubs_util.get_publication_lookup_infos(workspace, LAYER_TYPE, pub_name=layername, keys=keys)
+        return layers.get((workspace, LAYER_TYPE, layername), {})
+
     layers = pubs_util.get_publication_infos(workspace, LAYER_TYPE, pub_name=layername)
     info = layers.get((workspace, LAYER_TYPE, layername), {})
     if info:
@@ -29,8 +33,8 @@ def get_layer_info(workspace, layername):
     return info
 
 
-def delete_layer(layer: Layer):
-    return pubs_util.delete_publication(layer.workspace, layer.type, layer.name)
+def delete_layer(layer: Layer, is_part_of_bulk_delete=False):
+    return pubs_util.delete_publication(layer.workspace, layer.type, layer.name, is_part_of_bulk_delete=is_part_of_bulk_delete)
 
 
 def patch_layer(layer: Layer,
@@ -6,6 +6,7 @@ from layman.common.prime_db_schema import publications
 from layman import celery_app, util as layman_util, settings
 from .. import LAYER_TYPE
 from ..db import get_bbox as db_get_bbox, get_table_crs
+from .file_data import pop_changed_bboxes
 from ..filesystem.gdal import get_bbox as gdal_get_bbox, get_crs as gdal_get_crs
 from ...common.prime_db_schema.publications import set_bbox, set_geodata_type
 
@@ -43,6 +44,7 @@ def refresh_file_data(
             # because for compressed files sent with chunks file_type would be UNKNOWN and table_uri not set
             publ_info = layman_util.get_publication_info(username, LAYER_TYPE, layername, context={'keys': ['table_uri']})
         table_uri = publ_info['_table_uri']
+        pop_changed_bboxes(uuid)
         bbox = db_get_bbox(table_uri.schema, table_uri.table, uri_str=table_uri.db_uri_str, column=table_uri.geo_column)
         crs = get_table_crs(table_uri.schema, table_uri.table, uri_str=table_uri.db_uri_str, column=table_uri.geo_column, use_internal_srid=True)
     elif geodata_type == settings.GEODATA_TYPE_RASTER:
@@ -1,5 +1,6 @@
 from db import util as db_util
 from layman import patch_mode, settings
+from layman.cache import request as request_cache
 from layman.common import empty_method, empty_method_returns_dict
 from .. import LAYER_TYPE
 
@@ -15,6 +16,7 @@ post_layer = empty_method
 delete_layer = empty_method
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def set_after_restart():
     query = f'''update {DB_SCHEMA}.publications set
     wfs_wms_status = %s
@@ -1,9 +1,9 @@
 import shutil
-import tempfile
 import logging
 from flask import Blueprint, jsonify, request, current_app as app, g
 
 from layman.common import rest as rest_util
+from layman.common.filesystem import upload
 from layman.common.prime_db_schema import publications
 from layman.http import LaymanError
 from layman.util import check_uuid_decorator
@@ -170,7 +170,7 @@ def patch(uuid):
                                        name_input_file_by_layer=name_input_file_by_layer)
         # file checks
         if not use_chunk_upload:
-            temp_dir = tempfile.mkdtemp(prefix="layman_")
+            temp_dir = upload.mkdtemp()
             input_file.save_layer_files(info['uuid'], input_files, check_crs, overview_resampling, output_dir=temp_dir, name_input_file_by_layer=name_input_file_by_layer)
 
     if input_files.raw_paths:
@@ -240,6 +240,7 @@ def patch(uuid):
                 })
             elif input_files:
                 shutil.move(temp_dir, input_file.get_layer_input_file_dir(info['uuid']))
+                input_file.store_layer_archive(info['uuid'], checksum=input_file.get_sent_archive_checksum(input_files))
         publications.set_wfs_wms_status(info['_workspace'], LAYER_TYPE, info['name'], settings.EnumWfsWmsStatus.PREPARING)
     else:
         delete_from = 'layman.layer.micka.soap'
@@ -23,6 +23,8 @@ def get(uuid):
     thumbnail_info = thumbnail.get_layer_info_by_uuid(uuid)
     if thumbnail_info:
         thumbnail_path = thumbnail_info['_thumbnail']['path']
-        return send_file(thumbnail_path, mimetype='image/png')
+        # If-None-Match requests are answered by 304 Not Modified
+        return send_file(thumbnail_path, mimetype='image/png', conditional=True,
+                         etag=thumbnail.get_layer_thumbnail_properties(uuid).get('etag', True))
 
     raise LaymanError(16, {'uuid': uuid})
@@ -112,8 +112,7 @@ def post():
         unsafe_layername = input_file.get_unsafe_layername(input_files) if input_files else external_table_uri.table
     layername = util.to_safe_layer_name(unsafe_layername)
     util.check_layername(layername)
-    info = layman_util.get_publication_info(workspace, LAYER_TYPE, layername)
-    if info:
+    if layman_util.publication_exists(workspace, LAYER_TYPE, layername):
         raise LaymanError(17, {'layername': layername})
 
     # Timeseries regex
@@ -10,12 +10,13 @@ from layman import LaymanError, patch_mode, util as layman_util, settings
 from layman.util import call_modules_fn, get_providers_from_source_names, get_internal_sources, \
     to_safe_name, url_for
 from layman import celery as celery_util, common
-from layman.common import redis as redis_util, tasks as tasks_util, metadata as metadata_common
+from layman.common import redis as redis_util, tasks as tasks_util, metadata as metadata_common, feature_change
 from layman.common.prime_db_schema import publications
 from layman.common.util import clear_publication_info as common_clear_publication_info
 from . import get_layer_sources, LAYER_TYPE, get_layer_type_def, get_layer_info_keys, LAYERNAME_PATTERN, \
     LAYERNAME_MAX_LENGTH, SAFE_PG_IDENTIFIER_PATTERN
 from .db import get_all_table_column_names, get_table_crs
+from .geoserver import delete_security_rules_of_layers
 from .layer_class import Layer
 from ..uuid import delete_publication_uuid_from_redis
 
@@ -193,11 +194,11 @@ TASKS_TO_LAYER_INFO_KEYS = {
 }
 
 
-def patch_after_feature_change(workspace, layername, **kwargs):
-    layman_util.patch_after_feature_change(workspace, LAYER_TYPE, layername, **kwargs)
+def patch_after_feature_change(workspace, layername):
+    feature_change.schedule_patch_after_feature_change(workspace, LAYER_TYPE, layername)
 
 
-def delete_layer(layer: Layer, source=None, http_method='delete', *, x_forwarded_items=None):
+def delete_layer(layer: Layer, source=None, http_method='delete', *, kwargs=None, x_forwarded_items=None):
     sources = get_sources()
     source_idx = next((
         idx for idx, m in enumerate(sources) if m.__name__ == source
@@ -212,7 +213,7 @@ def delete_layer(layer: Layer, source=None, http_method='delete', *, x_forwarded
     # print(f"delete_layer {username}.{layername} using {len(sources)} sources: {[s.__name__ for s in sources]}")
 
     delete_info = {}
-    results = call_modules_fn(sources, 'delete_layer', [layer])
+    results = call_modules_fn(sources, 'delete_layer', [layer], kwargs=kwargs)
     for partial_result in results.values():
         if partial_result is not None:
             delete_info.update(partial_result)
@@ -226,6 +227,11 @@ def delete_layer(layer: Layer, source=None, http_method='delete', *, x_forwarded
     return result
 
 
+def finish_bulk_delete_layers(uuids):
+    delete_security_rules_of_layers(uuids)
+    publications.delete_publications(uuids)
+
+
 def get_layer_chain(workspace, layername):
     chain_info = celery_util.get_publication_chain_info(workspace, LAYER_TYPE, layername)
     return chain_info
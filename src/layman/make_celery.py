@@ -2,6 +2,7 @@ import importlib.util
 from celery import Celery, signals
 from celery.contrib import abortable
 from layman import settings
+from layman.cache import request as request_cache
 from .util import get_modules_from_names
 
 
@@ -28,11 +29,13 @@ def make_celery(app):
     class Task(celery_app.Task):
         def __call__(self, *args, **kwargs):
             with app.app_context():
+                request_cache.enable()
                 return self.run(*args, **kwargs)
 
     class AbortableTask(abortable.AbortableTask):
         def __call__(self, *args, **kwargs):
             with app.app_context():
+                request_cache.enable()
                 return self.run(*args, **kwargs)
 
     celery_app.Task = Task
@@ -41,7 +44,7 @@ def make_celery(app):
 
 
 def get_task_modules():
-    task_modules = []
+    task_modules = ['layman.common.feature_change_tasks', 'layman.common.bulk_delete_tasks']
     for publ_module in get_modules_from_names(settings.PUBLICATION_MODULES):
         for type_def in publ_module.PUBLICATION_TYPES.values():
             task_modules += type_def['task_modules']
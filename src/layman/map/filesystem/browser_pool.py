@@ -0,0 +1,109 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
+from layman import settings
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SIZE = (500, 500)
+
+# Process-wide counters, render times are in seconds
+STATISTICS = {
+    'browsers_started': 0,
+    'browsers_recycled': 0,
+    'renders': 0,
+    'failed_renders': 0,
+    'render_time_total': 0.0,
+    'render_time_last': None,
+}
+
+
+# pylint: disable=too-few-public-methods
+class BrowserSession:
+    def __init__(self):
+        firefox_options = Options()
+        firefox_options.headless = True
+        desired_capabilities = DesiredCapabilities.FIREFOX.copy()
+        desired_capabilities['loggingPrefs'] = {'browser': 'ALL'}
+        self.browser = webdriver.Firefox(
+            options=firefox_options,
+            desired_capabilities=desired_capabilities,
+        )
+        self.browser.set_window_size(*WINDOW_SIZE)
+        self.renders = 0
+        STATISTICS['browsers_started'] += 1
+
+    def quit(self):
+        try:
+            self.browser.quit()
+        except WebDriverException as exc:
+            logger.warning(f"Error when quitting browser: {exc}")
+
+
+class BrowserPool:
+    """Bounded pool of warm headless browsers, reused across thumbnail renders within one process.
+
+    Session is recycled after `max_renders` renders or after any error.
+    """
+
+    def __init__(self, *, size, max_renders):
+        self.max_renders = max_renders
+        self._idle_sessions = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def session(self):
+        self._slots.acquire()  # pylint: disable=consider-using-with
+        session = None
+        healthy = False
+        start = time.monotonic()
+        try:
+            try:
+                session = self._idle_sessions.get_nowait()
+            except queue.Empty:
+                session = BrowserSession()
+            start = time.monotonic()
+            yield session
+            healthy = True
+        finally:
+            if session is not None:
+                render_time = time.monotonic() - start
+                session.renders += 1
+                STATISTICS['renders'] += 1
+                STATISTICS['render_time_total'] += render_time
+                STATISTICS['render_time_last'] = render_time
+                logger.info(f"Browser session used for {render_time:.2f} s, renders={session.renders}, healthy={healthy}")
+                if not healthy:
+                    STATISTICS['failed_renders'] += 1
+                if healthy and session.renders < self.max_renders:
+                    self._idle_sessions.put(session)
+                else:
+                    STATISTICS['browsers_recycled'] += 1
+                    session.quit()
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                session = self._idle_sessions.get_nowait()
+            except queue.Empty:
+                break
+            session.quit()
+
+
+POOL = BrowserPool(size=settings.LAYMAN_TIMGEN_BROWSER_POOL_SIZE,
+                   max_renders=settings.LAYMAN_TIMGEN_BROWSER_MAX_RENDERS)
+atexit.register(POOL.close)
+
+
+def get_statistics():
+    return dict(STATISTICS)
@@ -0,0 +1,49 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from . import browser_pool
+
+
+class WebDriverMock:
+    def __init__(self, **_):
+        self.quit_count = 0
+
+    def set_window_size(self, *_):
+        pass
+
+    def quit(self):
+        self.quit_count += 1
+
+
+@pytest.fixture()
+def pool(monkeypatch):
+    monkeypatch.setattr(browser_pool.webdriver, 'Firefox', WebDriverMock)
+    browser_pool_obj = browser_pool.BrowserPool(size=1, max_renders=2)
+    yield browser_pool_obj
+    browser_pool_obj.close()
+
+
+def test_session_recycled_after_max_renders(pool):
+    with pool.session() as session1:
+        pass
+    with pool.session() as session2:
+        pass
+    assert session2 is session1
+    assert session1.browser.quit_count == 1
+
+    with pool.session() as session3:
+        pass
+    assert session3 is not session1
+    assert session3.browser.quit_count == 0
+
+
+def test_unhealthy_session_quit(pool):
+    with pytest.raises(WebDriverException):
+        with pool.session() as session1:
+            raise WebDriverException('Browser crashed')
+    assert session1.browser.quit_count == 1
+
+    with pool.session() as session2:
+        pass
+    assert session2 is not session1
+    assert session2.browser.quit_count == 0
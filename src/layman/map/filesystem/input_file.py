@@ -7,6 +7,7 @@ from layman.common import empty_method, empty_method_returns_dict
 from layman.common.filesystem import input_file as common
 from layman.map import MAP_TYPE
 from layman.map.map_class import Map
+from layman.map.prime_db_schema import util as map_db_util
 from layman.util import url_for, get_publication_uuid
 from layman import settings
 from . import util
@@ -30,6 +31,7 @@ def ensure_map_input_file_dir(publ_uuid):
 
 def delete_map(map: Map):
     util.delete_map_subdir(map.uuid, MAP_SUBDIR)
+    map_db_util.delete_map_references(map.uuid)
 
 
 def get_map_file(publ_uuid):
@@ -78,6 +80,9 @@ def save_map_files(publ_uuid, files):
     # print('filepath_mapping', filepath_mapping)
     common.save_files(files, filepath_mapping)
 
+    from layman.map.util import get_layer_references_from_json
+    map_db_util.ensure_map_references(publ_uuid, get_layer_references_from_json(get_map_json(publ_uuid)))
+
     target_file_paths = [
         fp for k, fp in filepath_mapping.items() if fp is not None
     ]
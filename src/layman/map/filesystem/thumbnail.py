@@ -2,18 +2,15 @@ import base64
 import os
 import pathlib
 import re
-import time
 from urllib.parse import urlencode
 from flask import current_app
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from selenium.common.exceptions import TimeoutException
 
 from layman import settings, LaymanError
 from layman.authn import is_user_with_name
 from layman.common import empty_method, empty_method_returns_dict
 from layman.util import url_for, get_publication_uuid, get_publication_info_by_uuid
-from . import util
+from . import util, browser_pool
 from .. import MAP_TYPE
 from ..map_class import Map
 
@@ -23,6 +20,22 @@ pre_publication_action_check = empty_method
 post_map = empty_method
 patch_map = empty_method
 
+# max time (in seconds) to wait for Timgen to render the map
+THUMBNAIL_TIMEOUT = 20
+WAIT_FOR_TIMGEN_SCRIPT = '''
+const done = arguments[arguments.length - 1];
+const get_result = () => ({
+    canvas_data_url: window.canvas_data_url || null,
+    canvas_data_url_error: window.canvas_data_url_error || null,
+    layman_logs: window.layman_logs || [],
+});
+if (window.canvas_data_url || window.canvas_data_url_error) {
+    done(get_result());
+} else {
+    window.addEventListener('timgen_done', () => done(get_result()), {once: true});
+}
+'''
+
 
 def get_map_thumbnail_dir(publ_uuid):
     thumbnail_dir = os.path.join(util.get_map_dir(publ_uuid), 'thumbnail')
@@ -82,56 +95,36 @@ def generate_map_thumbnail(publ_uuid, *, editor):
     timgen_url = f"{settings.LAYMAN_TIMGEN_URL}?{params}"
     current_app.logger.info(f"Timgen URL: {timgen_url}")
 
-    firefox_options = Options()
-    firefox_options.headless = True
-    desired_capabilities = DesiredCapabilities.FIREFOX
-    desired_capabilities['loggingPrefs'] = {'browser': 'ALL'}
-    browser = webdriver.Firefox(
-        options=firefox_options,
-        desired_capabilities=desired_capabilities,
-    )
-    browser.set_window_size(500, 500)
-
-    browser.get(timgen_url)
+    with browser_pool.POOL.session() as session:
+        browser = session.browser
+        browser.set_script_timeout(THUMBNAIL_TIMEOUT)
+        browser.get(timgen_url)
+        try:
+            # resolved by Timgen's `timgen_done` event, no polling is needed
+            result = browser.execute_async_script(WAIT_FOR_TIMGEN_SCRIPT)
+            layman_logs = result['layman_logs']
+        except TimeoutException:
+            result = None
+            layman_logs = browser.execute_script('''return window.layman_logs || [];''')
 
-    def show_timgen_logs(*, start_at_idx=0):
-        layman_logs = browser.execute_script('''return window.layman_logs;''')
         current_app.logger.info(f"number of layman_logs: {len(layman_logs)}")
-        for idx in range(start_at_idx, len(layman_logs)):
-            layman_log = layman_logs[idx]
-            current_app.logger.info(f"layman_log {idx+1}: {layman_log}")
-        return len(layman_logs)
-
-    max_attempts = 40
-    attempts = 0
-    data_url = browser.execute_script('''return window.canvas_data_url;''')
-    data_url_error = browser.execute_script('''return window.canvas_data_url_error;''')
-    already_shown_layman_logs = 0
-    while data_url is None and data_url_error is None and attempts < max_attempts:
-        current_app.logger.info(f"waiting for entries, data_url={data_url}, attempts={attempts}")
-        already_shown_layman_logs = show_timgen_logs(start_at_idx=already_shown_layman_logs)
-        time.sleep(0.5)
-        attempts += 1
-        data_url = browser.execute_script('''return window.canvas_data_url;''')
-        data_url_error = browser.execute_script('''return window.canvas_data_url_error;''')
-
-    show_timgen_logs(start_at_idx=already_shown_layman_logs)
-
-    # browser.save_screenshot(f'/code/tmp/{workspace}.{mapname}.png')
-    browser.close()
-    browser.quit()
+        for idx, layman_log in enumerate(layman_logs):
+            current_app.logger.info(f"layman_log {idx + 1}: {layman_log}")
 
+        if result is None:
+            # raised within the session, so that possibly stuck browser is not reused
+            current_app.logger.info(f"timeout reached")
+            current_app.logger.info(f"Map thumbnail: {publ_uuid}, editor={editor}")
+            raise LaymanError(51, data="Timeout reached when generating thumbnail")
+
+    data_url = result['canvas_data_url']
+    data_url_error = result['canvas_data_url_error']
     if data_url_error:
         raise LaymanError(51, data={
             'reason': 'Error when requesting layer through WMS',
             'timgen_log': data_url_error,
         })
 
-    if attempts >= max_attempts:
-        current_app.logger.info(f"max attempts reach")
-        current_app.logger.info(f"Map thumbnail: {publ_uuid}, editor={editor}")
-        raise LaymanError(51, data="Max attempts reached when generating thumbnail")
-
     match = re.match(r'^data:image/png;base64,(.+)$', data_url)
     groups = match.groups()
     base64_image = groups[0]
@@ -12,6 +12,7 @@ from ..common.micka import MickaIds
 class Map(Publication):
     _class_publication_type_for_create: ClassVar[str] = MAP_TYPE
     _class_init_tuple_name: ClassVar[str] = 'map_tuple'
+    _class_load_keys: ClassVar[list] = Publication._class_load_keys + ['map_layers', ]
 
     map_layers: list
 
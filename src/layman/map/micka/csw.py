@@ -20,12 +20,11 @@ post_map = empty_method
 
 def get_map_info(workspace, mapname, *, x_forwarded_items=None):
     publication = Map(map_tuple=(workspace, mapname))
+    if not publication or settings.CSW_URL is None:
+        return {}
+    muuid = publication.micka_ids.id
     try:
-        csw = common_util.create_csw()
-        if not publication or csw is None:
-            return {}
-        muuid = publication.micka_ids.id
-        csw.getrecordbyid(id=[muuid], esn='brief')
+        record_exists = muuid in common_util.get_existing_record_ids([muuid])
     except HTTPError as exc:
         current_app.logger.info(f'traceback={traceback.format_exc()},\n'
                                 f'response={exc.response.text},\n'
@@ -34,7 +33,7 @@ def get_map_info(workspace, mapname, *, x_forwarded_items=None):
     except ConnectionError:
         current_app.logger.info(traceback.format_exc())
         return {}
-    if muuid in csw.records:
+    if record_exists:
         return {
             'metadata': {
                 'identifier': muuid,
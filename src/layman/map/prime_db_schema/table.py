@@ -7,8 +7,12 @@ from ..map_class import Map
 get_metadata_comparison = empty_method_returns_dict
 
 
-def get_map_info(workspace, mapname):
-    maps = pubs_util.get_publication_infos(workspace, MAP_TYPE, pub_name=mapname)
+def get_map_info(workspace, mapname, keys=None):
+    if pubs_util.is_lookup_enough(keys):
+        keys = set(keys) - {'geodata_type', 'original_data_source', 'wfs_wms_status', }
+        maps = pubs_util.get_publication_lookup_infos(workspace, MAP_TYPE, pub_name=mapname, keys=keys)
+    else:
+        maps = pubs_util.get_publication_infos(workspace, MAP_TYPE, pub_name=mapname)
     info = maps.get((workspace, MAP_TYPE, mapname), {})
     if info:
         info.pop('_table_uri', None)
@@ -75,6 +79,6 @@ def post_map(workspace,
     pubs_util.insert_publication(workspace, db_info)
 
 
-def delete_map(map: Map):
+def delete_map(map: Map, is_part_of_bulk_delete=False):
     util.delete_internal_layer_relations(map.workspace, map.name, )
-    return pubs_util.delete_publication(map.workspace, map.type, map.name)
+    return pubs_util.delete_publication(map.workspace, map.type, map.name, is_part_of_bulk_delete=is_part_of_bulk_delete)
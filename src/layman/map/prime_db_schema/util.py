@@ -1,11 +1,13 @@
 from db import util as db_util
 from layman import settings
+from layman.cache import request as request_cache
 from layman.util import get_publication_info
 from .. import MAP_TYPE
 
 DB_SCHEMA = settings.LAYMAN_PRIME_SCHEMA
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def ensure_internal_layers(workspace, mapname, layers):
     map_info = get_publication_info(workspace, MAP_TYPE, mapname, context={'keys': ['id', 'map_layers'], })
     map_id = map_info['id']
@@ -31,6 +33,7 @@ def ensure_internal_layers(workspace, mapname, layers):
         db_util.run_statement(delete_query, (map_id, layer_uuid, layer_index,))
 
 
+@request_cache.invalidating(request_cache.PUBLICATION_INFOS)
 def delete_internal_layer_relations(workspace, mapname):
     map_id = get_publication_info(workspace, MAP_TYPE, mapname, context={'keys': ['id'], })['id']
 
@@ -38,3 +41,45 @@ def delete_internal_layer_relations(workspace, mapname):
     delete from {DB_SCHEMA}.map_layer where id_map = %s;
     '''
     db_util.run_statement(delete_query, (map_id, ))
+
+
+def ensure_map_references(map_uuid, references):
+    """Replace indexed layer references of the map by `references`, i.e. list of layman.map.util.MapReference."""
+    statement = f'''
+    delete from {DB_SCHEMA}.map_reference where map_uuid = %s;
+    insert into {DB_SCHEMA}.map_reference (map_uuid, layer_index, url, layer_workspace, layer_name)
+    select %s::uuid, ref.layer_index, ref.url, ref.layer_workspace, ref.layer_name
+    from unnest(%s::integer[], %s::text[], %s::text[], %s::text[])
+        as ref(layer_index, url, layer_workspace, layer_name);
+    '''
+    db_util.run_statement(statement, (
+        map_uuid,
+        map_uuid,
+        [ref.layer_index for ref in references],
+        [ref.url for ref in references],
+        [ref.layer_workspace for ref in references],
+        [ref.layer_name for ref in references],
+    ))
+
+
+def delete_map_references(map_uuid):
+    statement = f'''delete from {DB_SCHEMA}.map_reference where map_uuid = %s;'''
+    db_util.run_statement(statement, (map_uuid, ))
+
+
+def find_maps_by_reference(*, url=None, layer_workspace=None, layer_name=None):
+    """Return set of (workspace, mapname) of maps whose map file references given URL, layer workspace and/or layer name."""
+    assert any(value is not None for value in [url, layer_workspace, layer_name])
+    where_parts = [
+        f'mr.{column} = %s' for column, value in [('url', url), ('layer_workspace', layer_workspace), ('layer_name', layer_name)]
+        if value is not None
+    ]
+    query = f'''
+    select distinct w.name, p.name
+    from {DB_SCHEMA}.map_reference mr inner join
+         {DB_SCHEMA}.publications p on p.uuid = mr.map_uuid inner join
+         {DB_SCHEMA}.workspaces w on w.id = p.id_workspace
+    where {' and '.join(where_parts)}
+    ;'''
+    rows = db_util.run_query(query, tuple(value for value in [url, layer_workspace, layer_name] if value is not None))
+    return {(row[0], row[1]) for row in rows}
@@ -0,0 +1,87 @@
+import io
+import json
+import uuid
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from layman import settings, app
+from layman.common.prime_db_schema import publications, workspaces
+from layman.map import MAP_TYPE
+from layman.map.filesystem import input_file, util as fs_util
+from . import util as map_db_util
+
+
+class TestFindMapsByReference:
+    workspace = 'test_find_maps_by_reference_workspace'
+    mapname = 'test_find_maps_by_reference_map'
+    map_uuid = uuid.uuid4()
+    layer_workspace = 'test_find_maps_by_reference_layer_workspace'
+    wms_url = f'http://localhost:8600/geoserver/{layer_workspace}{settings.LAYMAN_GS_WMS_WORKSPACE_POSTFIX}/ows'
+    wfs_url = f'http://localhost:8600/geoserver/{layer_workspace}/wfs'
+    external_url = 'https://example.com/mapserv?map=/data/orto.map'
+    map_json = {
+        'name': mapname,
+        'title': mapname,
+        'abstract': None,
+        'layers': [
+            {
+                'className': 'HSLayers.Layer.WMS',
+                'url': wms_url,
+                'params': {'LAYERS': 'wms_layer'},
+            },
+            {
+                'className': 'OpenLayers.Layer.Vector',
+                'name': f'{layer_workspace}{settings.LAYMAN_GS_WMS_WORKSPACE_POSTFIX}:wfs_layer',
+                'protocol': {'url': wfs_url, 'format': 'hs.format.WFS'},
+            },
+            {
+                'className': 'HSLayers.Layer.WMS',
+                'url': external_url,
+                'params': {'LAYERS': 'orto'},
+            },
+        ],
+    }
+
+    @pytest.fixture(scope="class", autouse=True)
+    def provide_data(self, request):
+        with app.app_context():
+            workspaces.ensure_workspace(self.workspace)
+            publications.insert_publication(self.workspace, {
+                "name": self.mapname,
+                "title": self.mapname,
+                "publ_type_name": MAP_TYPE,
+                "uuid": self.map_uuid,
+                "actor_name": settings.ANONYM_USER,
+                "access_rights": {
+                    "read": {settings.RIGHTS_EVERYONE_ROLE, },
+                    "write": {settings.RIGHTS_EVERYONE_ROLE, },
+                },
+                'image_mosaic': False,
+            })
+            map_file = FileStorage(stream=io.BytesIO(json.dumps(self.map_json).encode()), filename='map.json')
+            input_file.save_map_files(str(self.map_uuid), [map_file])
+        yield
+        if request.node.session.testsfailed == 0:
+            with app.app_context():
+                fs_util.delete_map_subdir(str(self.map_uuid), input_file.MAP_SUBDIR)
+                map_db_util.delete_map_references(str(self.map_uuid))
+                publications.delete_publication(self.workspace, MAP_TYPE, self.mapname)
+                workspaces.delete_workspace(self.workspace)
+
+    @pytest.mark.parametrize('query, exp_found', [
+        pytest.param({'url': wms_url}, True, id='wms_url'),
+        pytest.param({'url': wfs_url}, True, id='wfs_url'),
+        pytest.param({'url': external_url, 'layer_name': 'orto'}, True, id='external_url_and_name'),
+        pytest.param({'layer_workspace': layer_workspace}, True, id='workspace'),
+        pytest.param({'layer_workspace': layer_workspace, 'layer_name': 'wms_layer'}, True, id='workspace_from_wms_url'),
+        pytest.param({'layer_workspace': layer_workspace, 'layer_name': 'wfs_layer'}, True, id='workspace_from_wms_layer_name'),
+        pytest.param({'layer_name': 'wfs_layer'}, True, id='name'),
+        pytest.param({'layer_workspace': f'{layer_workspace}{settings.LAYMAN_GS_WMS_WORKSPACE_POSTFIX}'}, False,
+                     id='wms_workspace'),
+        pytest.param({'url': external_url, 'layer_name': 'wms_layer'}, False, id='name_from_other_url'),
+        pytest.param({'layer_name': 'test_find_maps_by_reference_unknown'}, False, id='unknown_name'),
+    ])
+    def test_find_maps_by_reference(self, query, exp_found):
+        with app.app_context():
+            result = map_db_util.find_maps_by_reference(**query)
+        assert ((self.workspace, self.mapname) in result) == exp_found
@@ -57,8 +57,7 @@ def post(workspace):
         unsafe_mapname = input_file.get_unsafe_mapname(file_json)
     mapname = util.to_safe_map_name(unsafe_mapname)
     util.check_mapname(mapname)
-    info = util.get_map_info(workspace, mapname)
-    if info:
+    if layman_util.publication_exists(workspace, MAP_TYPE, mapname):
         raise LaymanError(24, {'mapname': mapname})
 
     # TITLE
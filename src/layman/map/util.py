@@ -1,8 +1,8 @@
+from dataclasses import dataclass
 from functools import wraps, partial
 import json
 import os
 import re
-import subprocess
 from urllib.parse import urlparse
 import requests
 from jsonschema import validate, Draft7Validator
@@ -13,6 +13,7 @@ from layman import LaymanError, util as layman_util, celery as celery_util, sett
 from layman.authn.prime_db_schema import get_authn_info
 from layman.common.micka import util as micka_util
 from layman.common import redis as redis_util, tasks as tasks_util, metadata as metadata_common
+from layman.common.prime_db_schema import publications
 from layman.common.util import PUBLICATION_NAME_PATTERN, PUBLICATION_MAX_LENGTH, clear_publication_info as common_clear_publication_info
 from layman.layer.geoserver import geoserver_layername_to_uuid
 from layman.layer.geoserver.util import get_gs_proxy_server_url
@@ -152,6 +153,10 @@ def delete_map(map: Map, kwargs=None, *, x_forwarded_items=None):
     return result
 
 
+def finish_bulk_delete_maps(uuids):
+    publications.delete_publications(uuids)
+
+
 def clear_publication_info(layer_info):
     clear_info = common_clear_publication_info(layer_info)
     clear_info.pop('image_mosaic')
@@ -456,17 +461,6 @@ def get_map_file_json(publ_uuid, *, adjust_urls=True, x_forwarded_items=None):
     return map_json
 
 
-def find_maps_by_grep(regexp):
-    data_dir = settings.LAYMAN_DATA_DIR
-    grep_cmd = f"grep -r -E '{regexp}' {data_dir} || [ $? = 1 ]"
-    grep_process = subprocess.check_output(grep_cmd, shell=True,).decode('ascii')
-    map_paths = [line.split(':')[0] for line in grep_process.split('\n')
-                 if line.split(':')[0]]
-
-    maps = {(map_path.split('/')[-5], map_path.split('/')[-3]) for map_path in map_paths}
-    return maps
-
-
 def _get_layer_url_from_wms_json(map_layer):
     return map_layer.get('url')
 
@@ -538,6 +532,65 @@ def get_internal_gs_layers_from_json(map_json, *, x_forwarded_items=None):
     return found_layers
 
 
+# GeoServer workspace of OGC service URL, e.g. http://example.com/geoserver/<workspace>/wms
+SERVICE_URL_WORKSPACE_PATTERN = re.compile(r'^[a-z]+://[^/]+/[^?#]*/(?P<workspace>[^/?#]+)/(?:ows|wms|wfs)(?:[?#].*)?$', re.IGNORECASE)
+
+
+def _get_layer_workspace_from_gs_workspace(gs_workspace):
+    """WMS of workspace `<workspace>` is published in GeoServer workspace `<workspace>_wms`, see
+    LAYMAN_GS_WMS_WORKSPACE_POSTFIX, so the postfix is removed to get the same workspace for WMS and WFS references."""
+    postfix = settings.LAYMAN_GS_WMS_WORKSPACE_POSTFIX
+    if gs_workspace and gs_workspace.endswith(postfix) and len(gs_workspace) > len(postfix):
+        return gs_workspace[:-len(postfix)]
+    return gs_workspace
+
+
+@dataclass(frozen=True)
+class MapReference:
+    layer_index: int
+    url: str
+    layer_workspace: str = None
+    layer_name: str = None
+
+
+def get_layer_references_from_json(map_json):
+    """Return all WMS and WFS layer references of map file, both internal and external ones.
+
+    Layer workspace is taken from layer name (`<workspace>:<name>`) or from service URL, without
+    LAYMAN_GS_WMS_WORKSPACE_POSTFIX, i.e. `<workspace>_wms` is recorded as `<workspace>`.
+    """
+    map_json = input_file.unquote_urls(map_json)
+    references = []
+    for layer_idx, map_layer in enumerate(map_json['layers']):
+        class_name = map_layer.get('className', '').split('.')[-1]
+        layer_url_getter = {
+            'WMS': _get_layer_url_from_wms_json,
+            'Vector': _get_layer_url_from_vector_json,
+        }.get(class_name)
+        if not layer_url_getter:
+            continue
+        layer_url = layer_url_getter(map_layer)
+        if not layer_url:
+            continue
+        layer_names_getter = {
+            'WMS': _get_layer_names_from_wms_json,
+            'Vector': _get_layer_names_from_vector_json,
+        }.get(class_name)
+        layer_names = layer_names_getter(map_layer)
+        url_match = SERVICE_URL_WORKSPACE_PATTERN.match(layer_url)
+        url_workspace = _get_layer_workspace_from_gs_workspace(url_match.group('workspace')) if url_match else None
+        if not layer_names:
+            references.append(MapReference(layer_index=layer_idx, url=layer_url, layer_workspace=url_workspace))
+        for full_layername in layer_names:
+            layer_workspace, _, layer_name = full_layername.rpartition(':')
+            references.append(MapReference(layer_index=layer_idx,
+                                           url=layer_url,
+                                           layer_workspace=_get_layer_workspace_from_gs_workspace(layer_workspace) or url_workspace,
+                                           layer_name=layer_name,
+                                           ))
+    return references
+
+
 def get_layers_from_json(map_json, *, x_forwarded_items=None):
     found_gs_layer = get_internal_gs_layers_from_json(map_json, x_forwarded_items=x_forwarded_items)
     found_layers = []
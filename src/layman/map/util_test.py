@@ -39,3 +39,25 @@ def test_get_layers_from_json(json_path, exp_result):
     x_forwarded_items = XForwardedClass(proto='https', host='laymanproxy.com', prefix='/some-proxy-path')
     result = map_util.get_layers_from_json(map_json, x_forwarded_items=x_forwarded_items)
     assert result == exp_result
+
+
+def test_get_layer_references_from_json():
+    with open('sample/layman.map/full.json', 'r', encoding="utf-8") as map_file:
+        with app.app_context():
+            map_json = map_util.check_file(map_file)
+    result = map_util.get_layer_references_from_json(map_json)
+    liberec_raster_reference = {
+        'url': 'https://hub4everybody.com/geoserver/layman_test_cases/wms',
+        'layer_workspace': 'layman_test_cases',
+        'layer_name': 'liberec_raster',
+    }
+    assert result == [
+        map_util.MapReference(layer_index=0,
+                              url='https://geoportal.kraj-lbc.cz/cgi-bin/mapserv?map=/data/gis/MapServer/projects/wms/atlas/zabaged_2017_wms.map',
+                              layer_name='podkladova_mapa'),
+        map_util.MapReference(layer_index=1,
+                              url='https://geoportal.kraj-lbc.cz/cgi-bin/mapserv?map=/data/gis/MapServer/projects/wms/orto.map',
+                              layer_name='stinovany_relief'),
+    ] + [
+        map_util.MapReference(layer_index=layer_index, **liberec_raster_reference) for layer_index in range(2, 6)
+    ]
@@ -13,6 +13,9 @@ class Publication(ABC):
     _subclasses: ClassVar[Dict[str, Type[Publication]]] = {}
     _class_publication_type_for_create: ClassVar[str]
     _class_init_tuple_name: ClassVar[str]
+    # all info keys read by `load`, so that key-aware lookup of prime DB schema does not return truncated info
+    _class_load_keys: ClassVar[List[str]] = ['id', 'uuid', 'workspace', 'type', 'name', 'access_rights', 'description',
+                                             'title', 'created_at', 'native_bounding_box', 'native_crs', ]
 
     workspace: str
     type: str
@@ -46,7 +49,7 @@ class Publication(ABC):
             self.load()
 
     def load(self):
-        context = {'keys': ['id']}
+        context = {'keys': self._class_load_keys}
         if hasattr(self, 'uuid'):
             info = util.get_publication_info_by_uuid(uuid=self.uuid, context=context)
         else:
@@ -1,12 +1,13 @@
 def update_related_publications_after_change(workspace, publication_type, publication):
     from layman.layer import LAYER_TYPE
     from layman.map import MAP_TYPE
-    from layman.util import patch_after_feature_change, get_publication_info
+    from layman.util import get_publication_info
+    from layman.common.feature_change import schedule_patch_after_feature_change
 
     if publication_type == LAYER_TYPE:
         maps = get_publication_info(workspace, publication_type, publication, context={'keys': ['used_in_maps']})['used_in_maps']
         for map_obj in maps:
-            patch_after_feature_change(map_obj['workspace'], MAP_TYPE, map_obj['name'])
+            schedule_patch_after_feature_change(map_obj['workspace'], MAP_TYPE, map_obj['name'])
 
 
 def check_no_internal_workspace_name_layer(map_json, *, x_forwarded_items):
@@ -22,12 +22,19 @@ MIN_UPGRADEABLE_VERSION = {
 
 MIGRATIONS = {
     consts.MIGRATION_TYPE_SCHEMA: [
-        ((3, 0, 0), [lambda: logger.info("3.0.0 schema – no structural changes"),]),
+        ((3, 0, 0), [
+            lambda: logger.info("3.0.0 schema – no structural changes"),
+            upgrade_v3_0.create_publication_ordering_indexes,
+            upgrade_v3_0.create_publication_effective_rights,
+            upgrade_v3_0.create_map_reference_table,
+        ]),
     ],
     consts.MIGRATION_TYPE_DATA: [
         ((3, 0, 0), [
             upgrade_v3_0.migrate_map_metadata_urls,
             upgrade_v3_0.migrate_layer_metadata_urls,
+            upgrade_v3_0.fill_map_references,
+            upgrade_v3_0.sync_layer_security_rules,
         ]),
     ],
 }
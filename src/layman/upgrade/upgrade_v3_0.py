@@ -1,14 +1,87 @@
 import logging
 import traceback
-from layman import app, util as layman_util
+from db import util as db_util
+from layman import app, settings, util as layman_util
+from layman.common.prime_db_schema import rights
+from layman.common.micka import util as micka_util, MickaIds
 from layman.map import MAP_TYPE
 from layman.layer import LAYER_TYPE
 from layman.map.micka import csw
 from layman.layer.micka import csw as layer_csw
 from layman.map.map_class import Map
 from layman.layer.layer_class import Layer
+from layman.layer.geoserver import util as layer_gs_util
 
 logger = logging.getLogger(__name__)
+DB_SCHEMA = settings.LAYMAN_PRIME_SCHEMA
+
+
+def create_publication_ordering_indexes():
+    logger.info(f'    Create indexes for ordering publications')
+    statement = f'''
+    CREATE OR REPLACE FUNCTION {DB_SCHEMA}.ordering_title(text) RETURNS text LANGUAGE SQL IMMUTABLE AS
+        $$SELECT regexp_replace(lower(unaccent($1)), '[^a-zA-Z0-9 ]', '', 'g')$$;
+    CREATE INDEX IF NOT EXISTS publications_ordering_title_idx
+        ON {DB_SCHEMA}.publications ({DB_SCHEMA}.ordering_title(title), name, type);
+    CREATE INDEX IF NOT EXISTS publications_updated_at_idx
+        ON {DB_SCHEMA}.publications (updated_at DESC, name, type);
+    '''
+    db_util.run_statement(statement)
+
+
+def create_publication_effective_rights():
+    logger.info(f'    Create denormalized effective rights of publications')
+    statement = f'''
+    ALTER TABLE {DB_SCHEMA}.publications
+        ADD COLUMN IF NOT EXISTS read_user_names text[] NOT NULL DEFAULT '{{}}',
+        ADD COLUMN IF NOT EXISTS read_role_names text[] NOT NULL DEFAULT '{{}}',
+        ADD COLUMN IF NOT EXISTS write_user_names text[] NOT NULL DEFAULT '{{}}',
+        ADD COLUMN IF NOT EXISTS write_role_names text[] NOT NULL DEFAULT '{{}}';
+    {rights.REFRESH_EFFECTIVE_RIGHTS_SQL};
+    CREATE INDEX IF NOT EXISTS publications_read_user_names_idx ON {DB_SCHEMA}.publications USING GIN (read_user_names);
+    CREATE INDEX IF NOT EXISTS publications_read_role_names_idx ON {DB_SCHEMA}.publications USING GIN (read_role_names);
+    CREATE INDEX IF NOT EXISTS publications_write_user_names_idx ON {DB_SCHEMA}.publications USING GIN (write_user_names);
+    CREATE INDEX IF NOT EXISTS publications_write_role_names_idx ON {DB_SCHEMA}.publications USING GIN (write_role_names);
+    '''
+    db_util.run_statement(statement)
+
+
+def create_map_reference_table():
+    logger.info(f'    Create table of layer references in map files')
+    statement = f'''
+    CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.map_reference
+    (
+        id serial PRIMARY KEY,
+        map_uuid uuid NOT NULL,
+        layer_index integer NOT NULL,
+        url text COLLATE pg_catalog."default",
+        layer_workspace VARCHAR(256) COLLATE pg_catalog."default",
+        layer_name text COLLATE pg_catalog."default"
+    )
+    TABLESPACE pg_default;
+    CREATE INDEX IF NOT EXISTS map_reference_map_uuid_idx ON {DB_SCHEMA}.map_reference (map_uuid);
+    CREATE INDEX IF NOT EXISTS map_reference_url_idx ON {DB_SCHEMA}.map_reference (url);
+    CREATE INDEX IF NOT EXISTS map_reference_layer_workspace_idx ON {DB_SCHEMA}.map_reference (layer_workspace);
+    CREATE INDEX IF NOT EXISTS map_reference_layer_name_idx ON {DB_SCHEMA}.map_reference (layer_name);
+    '''
+    db_util.run_statement(statement)
+
+
+def fill_map_references():
+    logger.info(f'    Fill table of layer references in map files')
+    from layman.map import util as map_util
+    from layman.map.filesystem import input_file
+    from layman.map.prime_db_schema import util as map_db_util
+
+    query = f'''select uuid::text from {DB_SCHEMA}.publications where type = %s;'''
+    map_uuids = [row[0] for row in db_util.run_query(query, (MAP_TYPE, ))]
+    for map_uuid in map_uuids:
+        map_json = input_file.get_map_json(map_uuid)
+        if map_json is None:
+            logger.warning(f'      Map file of map {map_uuid} not found, skipping.')
+            continue
+        references = map_util.get_layer_references_from_json(map_json)
+        map_db_util.ensure_map_references(map_uuid, references)
 
 
 def migrate_metadata_urls(publ_type):
@@ -17,9 +90,18 @@ def migrate_metadata_urls(publ_type):
 
     with app.app_context():
         publications = layman_util.get_publication_infos(publ_type=publ_type)
+    muuids = [MickaIds(uuid=pub_info['uuid']).id for pub_info in publications.values()]
+    try:
+        existing_muuids = micka_util.get_existing_record_ids(muuids) if settings.CSW_URL is not None else set()
+    except BaseException:
+        logger.error(f"Error reading existing Micka {type_name} records, migrating all {type_name}s one by one, "
+                     f"error: {traceback.format_exc()}")
+        existing_muuids = set(muuids)
 
     for (workspace, _, pubname), pub_info in publications.items():
         uuid = pub_info['uuid']
+        if MickaIds(uuid=uuid).id not in existing_muuids:
+            continue
         try:
             if publ_type == MAP_TYPE:
                 publication = Map(uuid=uuid)
@@ -50,3 +132,10 @@ def migrate_map_metadata_urls():
 
 def migrate_layer_metadata_urls():
     migrate_metadata_urls(LAYER_TYPE)
+
+
+def sync_layer_security_rules():
+    logger.info(f'    Synchronize GeoServer ACL rules of all layers with their access rights')
+    with app.app_context():
+        rules = layer_gs_util.sync_all_security_rules()
+    logger.info(f'    {len(rules)} GeoServer ACL rules of layers synchronized')
@@ -34,6 +34,7 @@ def delete(username):
         method=request.method,
         x_forwarded_items=x_forwarded_items,
         actor_name=username,
+        synchronous=True,
     )
     delete_user(username)
     return jsonify({
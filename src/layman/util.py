@@ -10,13 +10,16 @@ import re
 import unicodedata
 import urllib.parse
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
+import threading
 
 from flask import current_app, request, jsonify
 from unidecode import unidecode
 
 from layman import settings, celery as celery_util, common
-from layman.common import tasks as tasks_util, redis, PUBLICATION_LOCK_PATCH
+from layman.cache import request as request_cache
+from layman.common import tasks as tasks_util, redis, feature_change, PUBLICATION_LOCK_PATCH
 from layman.http import LaymanError
 from layman.publication_class import Publication
 
@@ -33,6 +36,9 @@ FLASK_PROVIDERS_KEY = f'{__name__}:PROVIDERS'
 FLASK_PUBLICATION_TYPES_KEY = f'{__name__}:PUBLICATION_TYPES'
 FLASK_PUBLICATION_MODULES_KEY = f'{__name__}:PUBLICATION_MODULES'
 
+# number of publications whose prime DB schema records and GeoServer ACL rules are deleted at once by bulk delete
+DELETE_PUBLICATIONS_BATCH_SIZE = 100
+
 HEADER_X_FORWARDED_PROTO_KEY = 'X-Forwarded-Proto'
 HEADER_X_FORWARDED_HOST_KEY = 'X-Forwarded-Host'
 HEADER_X_FORWARDED_PREFIX_KEY = 'X-Forwarded-Prefix'
@@ -409,10 +415,24 @@ def get_publication_uuid(workspace, publ_type, publ_name):
     return get_publication_info(workspace, publ_type, publ_name, context={'keys': ['uuid', ]}).get('uuid')
 
 
+def publication_exists(workspace, publ_type, publ_name):
+    """Check if publication exists or is being created, using only Redis UUID registry and prime DB schema.
+
+    Unlike get_publication_info, no other internal source (GeoServer, Micka, filesystem, ...) is asked.
+    """
+    from layman import uuid as uuid_util
+    from layman.common.prime_db_schema.publications import get_publication_lookup_infos
+    if uuid_util.is_publication_registered(workspace, publ_type, publ_name):
+        return True
+    return bool(get_publication_lookup_infos(workspace, publ_type, pub_name=publ_name))
+
+
 def _get_publication_by_uuid(uuid):
-    from layman.common.prime_db_schema.publications import get_publication_infos as prime_db_schema_get_publication_infos
-    prime_db_schema_info = prime_db_schema_get_publication_infos(uuid=uuid)
-    return list(prime_db_schema_info.keys())[0] if prime_db_schema_info else None
+    from layman.common.prime_db_schema.publications import get_publication_lookup_infos
+    # at most one publication has given UUID
+    for workspace, publ_type, publ_name in get_publication_lookup_infos(uuid=uuid):
+        return workspace, publ_type, publ_name
+    return None
 
 
 def get_publication_info_by_uuid(uuid, context=None):
@@ -436,6 +456,7 @@ def get_publication_info(workspace, publ_type, publ_name, context=None):
     context = context or {}
 
     assert not ('sources_filter' in context and 'keys' in context)
+    keys = None
     sources = get_internal_sources(publ_type)
     if 'sources_filter' in context:
         sources_names = context['sources_filter'].split(',')
@@ -460,6 +481,7 @@ def get_publication_info(workspace, publ_type, publ_name, context=None):
         MAP_TYPE: 'get_map_info',
     }[publ_type]
     partial_infos = call_modules_fn(sources, info_method, [workspace, publ_name], kwargs={
+        'keys': sorted(keys) if keys is not None else None,
         'extra_keys': context.get('extra_keys', []),
         'x_forwarded_items': context.get('x_forwarded_items'),
     })
@@ -492,6 +514,8 @@ def get_publication_infos_with_metainfo(workspace=None, publ_type=None, context=
                                         ordering_bbox_crs=None,
                                         *,
                                         publ_name=None,
+                                        after_ordering_values=None,
+                                        with_total_count=True,
                                         ):
     from layman.authz.role_service import get_user_roles
     from layman.common.prime_db_schema import publications
@@ -514,12 +538,15 @@ def get_publication_infos_with_metainfo(workspace=None, publ_type=None, context=
                                                              ordering_full_text=ordering_full_text,
                                                              ordering_bbox=ordering_bbox,
                                                              ordering_bbox_crs=ordering_bbox_crs,
+                                                             after_ordering_values=after_ordering_values,
+                                                             with_total_count=with_total_count,
                                                              )
 
     return infos
 
 
-def delete_workspace_publication(workspace, publication_type, publication_name, *, method, x_forwarded_items=None):
+def delete_workspace_publication(workspace, publication_type, publication_name, *, method, x_forwarded_items=None,
+                                 is_part_of_bulk_delete=False):
     publ_type_module = get_publication_types()[publication_type]
 
     util_module_name = f'{publ_type_module["module"]}.util'
@@ -533,8 +560,10 @@ def delete_workspace_publication(workspace, publication_type, publication_name,
     redis.create_lock(workspace, publication_type, publication_name, method)
     try:
         abort_publication_fn(workspace, publication_name)
-        delete_info = delete_publication_fn(publication, x_forwarded_items=x_forwarded_items)
-        if is_chain_ready_fn(workspace, publication_name):
+        delete_info = delete_publication_fn(publication, kwargs={'is_part_of_bulk_delete': is_part_of_bulk_delete},
+                                            x_forwarded_items=x_forwarded_items)
+        # publication deleted in bulk is unlocked by `finish_bulk_delete` after its prime DB schema record is deleted
+        if not is_part_of_bulk_delete and is_chain_ready_fn(workspace, publication_name):
             redis.unlock_publication(workspace, publication_type, publication_name)
         result = {
             'name': delete_info["name"],
@@ -574,25 +603,151 @@ def delete_publications(workspace,
                         method,
                         x_forwarded_items=None,
                         actor_name=None,
+                        *,
+                        synchronous=False,
                         ):
+    """Delete all publications of the workspace that the actor can write, and return response with their former infos.
+
+    Publications are locked and deleted by Celery task, so that the request does not wait for them. Each publication
+    is reported as UPDATING until it is deleted. If `synchronous` is true, publications are deleted within the request
+    and error of the first publication that was not deleted is raised.
+    """
     from layman import authn
+    from layman.common import bulk_delete_tasks
     if not actor_name:
         actor_name = authn.get_authn_username()
     whole_infos = get_publication_infos(workspace,
                                         publ_type,
                                         {'actor_name': actor_name,
                                          'access_type': 'write'})
+    publ_tuples = list(whole_infos)
+    if not publ_tuples:
+        return jsonify([])
+
+    if synchronous:
+        return jsonify(bulk_delete_publications(publ_tuples, method=method, x_forwarded_items=x_forwarded_items))
+
+    locked_publ_tuples = []
+    try:
+        for publ_tuple in publ_tuples:
+            redis.create_lock(*publ_tuple, method)
+            locked_publ_tuples.append(publ_tuple)
+        bulk_delete_tasks.delete_publications.apply_async(
+            args=[publ_tuples, method],
+            queue=settings.LAYMAN_CELERY_QUEUE,
+        )
+    except Exception as exc:
+        for publ_tuple in locked_publ_tuples:
+            redis.unlock_publication(*publ_tuple)
+        raise exc
     infos = []
-    for (publication_workspace, publication_type, publication_name) in whole_infos:
-        delete_info = delete_workspace_publication(publication_workspace,
-                                                   publication_type,
-                                                   publication_name,
-                                                   method=method,
-                                                   x_forwarded_items=x_forwarded_items,)
-        infos.append(delete_info)
+    for publ_tuple in publ_tuples:
+        publ_info = whole_infos[publ_tuple]
+        publ_type_name = get_publication_types()[publ_tuple[1]]['name']
+        infos.append({
+            'name': publ_info['name'],
+            'title': publ_info.get('title'),
+            'url': url_for(f'rest_{publ_type_name}.get', uuid=publ_info['uuid'], x_forwarded_items=x_forwarded_items),
+            'uuid': publ_info['uuid'],
+            'access_rights': publ_info['access_rights'],
+        })
     return jsonify(infos)
 
 
+def bulk_delete_publications(publ_tuples, *, method, x_forwarded_items=None):
+    """Delete given publications in parallel and return their former infos in the same order.
+
+    Sources of each publication are deleted by `delete_workspace_publication` in its own thread. Prime DB schema
+    records and GeoServer ACL rules are deleted by `finish_bulk_delete` for batches of publications. All publications
+    are attempted, error of the first publication that was not deleted is raised.
+    """
+    # Publications are independent, so they are deleted in parallel threads, each of them with its own app context
+    flask_app = current_app._get_current_object()  # pylint: disable=protected-access
+    progress = {'deleted': 0}
+    progress_lock = threading.Lock()
+
+    def delete_one(publ_tuple):
+        publication_workspace, publication_type, publication_name = publ_tuple
+        with flask_app.app_context():
+            delete_info = delete_workspace_publication(publication_workspace,
+                                                       publication_type,
+                                                       publication_name,
+                                                       method=method,
+                                                       x_forwarded_items=x_forwarded_items,
+                                                       is_part_of_bulk_delete=True,)
+        with progress_lock:
+            progress['deleted'] += 1
+            logger.info(f"Deleted {progress['deleted']}/{len(publ_tuples)} publications, "
+                        f"last one {publication_workspace}:{publication_type}:{publication_name}")
+        return delete_info
+
+    max_workers = max(1, min(settings.LAYMAN_DELETE_PUBLICATIONS_PARALLELISM, len(publ_tuples)))
+    infos_by_tuple = {}
+    failures = []
+    batch = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_tuple = {executor.submit(delete_one, publ_tuple): publ_tuple for publ_tuple in publ_tuples}
+            for future in as_completed(future_to_tuple):
+                publ_tuple = future_to_tuple[future]
+                try:
+                    infos_by_tuple[publ_tuple] = future.result()
+                    batch.append(publ_tuple)
+                except Exception as exc:  # pylint: disable=broad-except
+                    failures.append((publ_tuple, exc))
+                if len(batch) >= DELETE_PUBLICATIONS_BATCH_SIZE:
+                    finish_bulk_delete(batch, infos_by_tuple)
+                    batch = []
+        finish_bulk_delete(batch, infos_by_tuple)
+    finally:
+        # values cached in current request were read before publications were deleted by other threads
+        request_cache.invalidate(request_cache.PUBLICATION_INFOS)
+    infos = [infos_by_tuple[publ_tuple] for publ_tuple in publ_tuples if publ_tuple in infos_by_tuple]
+    if failures:
+        failures.sort(key=lambda failure: publ_tuples.index(failure[0]))
+        raise_delete_publications_failure(infos, failures)
+    return infos
+
+
+def finish_bulk_delete(publ_tuples, infos_by_tuple):
+    """Delete prime DB schema records and GeoServer ACL rules of publications whose other sources were deleted by
+    `delete_workspace_publication` with `is_part_of_bulk_delete`, by one call per publication type, and unlock them."""
+    try:
+        for publication_type in sorted({publication_type for _, publication_type, _ in publ_tuples}):
+            publ_type_module = get_publication_types()[publication_type]
+            util_module = importlib.import_module(f'{publ_type_module["module"]}.util')
+            finish_bulk_delete_fn = getattr(util_module, f'finish_bulk_delete_{publ_type_module["name"]}s')
+            finish_bulk_delete_fn([infos_by_tuple[publ_tuple]['uuid'] for publ_tuple in publ_tuples
+                                   if publ_tuple[1] == publication_type])
+    finally:
+        for publ_tuple in publ_tuples:
+            redis.unlock_publication(*publ_tuple)
+
+
+def raise_delete_publications_failure(infos, failures):
+    """Raise error of the first publication that was not deleted, extended by number of deleted publications and
+    list of all publications that were not deleted."""
+    failed_publications = [
+        {
+            'workspace': publication_workspace,
+            'publication_type': publication_type,
+            'name': publication_name,
+            'error': exc.to_dict() if isinstance(exc, LaymanError) else str(exc),
+        }
+        for (publication_workspace, publication_type, publication_name), exc in failures
+    ]
+    logger.error(f"Deleted {len(infos)}/{len(infos) + len(failures)} publications, "
+                 f"failed publications: {failed_publications}")
+    _, exc = failures[0]
+    if isinstance(exc, LaymanError) and (exc.data is None or isinstance(exc.data, dict)):
+        exc.data = {
+            **(exc.data or {}),
+            'deleted_publications_count': len(infos),
+            'failed_publications': failed_publications,
+        }
+    raise exc
+
+
 def patch_after_feature_change(workspace, publication_type, publication, *, queue=None, **kwargs):
     try:
         redis.create_lock(workspace, publication_type, publication, common.PUBLICATION_LOCK_FEATURE_CHANGE)
@@ -616,7 +771,8 @@ def is_publication_updating(workspace, publication_type, publication_name):
         publication_name,
     )
 
-    return bool((chain_info and not celery_util.is_chain_ready(chain_info)) or current_lock)
+    return bool((chain_info and not celery_util.is_chain_ready(chain_info)) or current_lock
+                or feature_change.is_change_pending(workspace, publication_type, publication_name))
 
 
 def get_publication_status(workspace, publication_type, publication_name, complete_info, item_keys, ):
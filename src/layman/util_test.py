@@ -1,4 +1,7 @@
+import ast
+import glob
 import importlib
+import os
 import pytest
 from flask import request
 
@@ -284,3 +287,124 @@ def test_check_uuid_decorator_success():
     with app.test_request_context():
         request.view_args = {'uuid': '123e4567-e89b-12d3-a456-426614174000'}
         assert test_func() is True
+
+
+def test_publication_exists():
+    from layman.layer import LAYER_TYPE
+    from .uuid import register_publication_uuid_to_redis, delete_publication_uuid_from_redis
+    workspace = 'test_publication_exists_workspace'
+    layername = 'test_publication_exists_layer'
+
+    with app.app_context():
+        assert not util.publication_exists(workspace, LAYER_TYPE, layername)
+        uuid_str = register_publication_uuid_to_redis(workspace, LAYER_TYPE, layername)
+        try:
+            assert util.publication_exists(workspace, LAYER_TYPE, layername)
+        finally:
+            delete_publication_uuid_from_redis(workspace, LAYER_TYPE, layername, uuid_str)
+        assert not util.publication_exists(workspace, LAYER_TYPE, layername)
+
+
+def test_bulk_delete_publications_reports_failures(monkeypatch):
+    from layman.layer import LAYER_TYPE
+    workspace = 'test_delete_publications_workspace'
+    publ_tuples = [(workspace, LAYER_TYPE, f'layer_{idx}') for idx in range(5)]
+    failing_names = {'layer_1', 'layer_3'}
+    finished_batches = []
+
+    def delete_workspace_publication(_, __, publication_name, **___):
+        if publication_name in failing_names:
+            raise LaymanError(49, {'name': publication_name})
+        return {'name': publication_name, 'uuid': f'uuid_{publication_name}'}
+
+    def finish_bulk_delete(batch, infos_by_tuple):
+        finished_batches.append([infos_by_tuple[publ_tuple]['uuid'] for publ_tuple in batch])
+
+    monkeypatch.setattr(util, 'delete_workspace_publication', delete_workspace_publication)
+    monkeypatch.setattr(util, 'finish_bulk_delete', finish_bulk_delete)
+    monkeypatch.setattr(util, 'DELETE_PUBLICATIONS_BATCH_SIZE', 2)
+
+    with app.app_context():
+        with pytest.raises(LaymanError) as exc_info:
+            util.bulk_delete_publications(publ_tuples, method='DELETE')
+    assert exc_info.value.code == 49
+    assert exc_info.value.data['name'] == 'layer_1'
+    assert exc_info.value.data['deleted_publications_count'] == 3
+    assert [failed['name'] for failed in exc_info.value.data['failed_publications']] == ['layer_1', 'layer_3']
+    assert all(failed['error']['code'] == 49 for failed in exc_info.value.data['failed_publications'])
+    # only deleted publications are finished, in batches of at most DELETE_PUBLICATIONS_BATCH_SIZE
+    assert sorted(uuid for batch in finished_batches for uuid in batch) == ['uuid_layer_0', 'uuid_layer_2', 'uuid_layer_4']
+    assert all(len(batch) <= 2 for batch in finished_batches)
+
+    failing_names = set()
+    finished_batches = []
+    with app.app_context():
+        infos = util.bulk_delete_publications(publ_tuples, method='DELETE')
+    assert [info['name'] for info in infos] == [publ_tuple[2] for publ_tuple in publ_tuples]
+    assert sorted(len(batch) for batch in finished_batches) == [1, 2, 2]
+
+
+PUBLICATION_INFO_FUNCTIONS = {'get_publication_info', 'get_publication_info_by_uuid', 'get_publication_info_by_class'}
+ALWAYS_RETURNED_KEYS = {'workspace', 'type', 'name', 'uuid'}
+
+
+def _get_requested_keys(node):
+    if not isinstance(node, ast.Call):
+        return None
+    func_name = node.func.attr if isinstance(node.func, ast.Attribute) else getattr(node.func, 'id', None)
+    if func_name not in PUBLICATION_INFO_FUNCTIONS:
+        return None
+    context = next((kw.value for kw in node.keywords if kw.arg == 'context'), None)
+    if not isinstance(context, ast.Dict):
+        return None
+    for key, value in zip(context.keys, context.values):
+        if isinstance(key, ast.Constant) and key.value == 'keys' and isinstance(value, (ast.List, ast.Tuple)) \
+                and all(isinstance(elt, ast.Constant) for elt in value.elts):
+            return {elt.value.lstrip('_') for elt in value.elts}
+    return None
+
+
+def _get_read_key(node):
+    """Return (object node, key) of `obj['key']` or `obj.get('key')`."""
+    if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str):
+        return node.value, node.slice.value
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'get' \
+            and node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+        return node.func.value, node.args[0].value
+    return None, None
+
+
+def find_unrequested_reads(file_path):
+    with open(file_path, encoding='utf-8') as file:
+        tree = ast.parse(file.read())
+    result = []
+    for function in ast.walk(tree):
+        if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        assignments = []
+        for node in ast.walk(function):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                assignments.append((node.lineno, node.targets[0].id, _get_requested_keys(node.value)))
+        for node in ast.walk(function):
+            obj, key = _get_read_key(node)
+            if obj is None:
+                continue
+            requested_keys = _get_requested_keys(obj)
+            if requested_keys is None and isinstance(obj, ast.Name):
+                requested_keys = next((keys for lineno, name, keys in sorted(assignments, reverse=True)
+                                       if name == obj.id and lineno < node.lineno), None)
+            if requested_keys is not None and key.lstrip('_') not in requested_keys | ALWAYS_RETURNED_KEYS:
+                result.append(f'{file_path}:{node.lineno} reads {key!r}, requested {sorted(requested_keys)}')
+    return result
+
+
+def test_publication_info_callers_read_only_requested_keys():
+    """Info keys that were not requested may be missing, e.g. in lookup path of get_publication_lookup_infos."""
+    layman_dir = os.path.dirname(__file__)
+    unrequested_reads = [
+        read
+        for file_path in sorted(glob.glob(os.path.join(layman_dir, '**', '*.py'), recursive=True))
+        if not file_path.endswith('_test.py')
+        for read in find_unrequested_reads(file_path)
+    ]
+    assert not unrequested_reads, '\n'.join(unrequested_reads)
@@ -86,6 +86,14 @@ def delete_publication_uuid_from_redis(workspace, publication_type, publication_
     settings.LAYMAN_REDIS.hdel(workspace_type_names_key, publication_name)
 
 
+def is_publication_registered(workspace, publication_type, publication_name):
+    return bool(settings.LAYMAN_REDIS.hexists(get_workspace_type_names_key(workspace, publication_type), publication_name))
+
+
+def is_uuid_registered(uuid_str):
+    return bool(settings.LAYMAN_REDIS.sismember(UUID_SET_KEY, uuid_str))
+
+
 def get_uuid_metadata_key(uuid_str):
     return UUID_METADATA_KEY.format(uuid=uuid_str)
 
@@ -182,6 +190,5 @@ def check_input_uuid(uuid):
     if uuid:
         if not is_valid_uuid(uuid):
             raise LaymanError(2, {'parameter': 'uuid', 'message': f'UUID `{uuid}` is not valid uuid', })
-        publications_by_uuid = prime_db_publications.get_publication_infos(uuid=uuid)
-        if publications_by_uuid:
+        if is_uuid_registered(uuid) or prime_db_publications.get_publication_lookup_infos(uuid=uuid):
             raise LaymanError(2, {'parameter': 'uuid', 'message': f'UUID `{uuid}` value already in use', })
@@ -83,6 +83,31 @@ OVERVIEW_RESAMPLING_METHOD_LIST = [
 
 DEFAULT_CONNECTION_TIMEOUT = int(os.environ['DEFAULT_CONNECTION_TIMEOUT'])
 
+LAYMAN_GDAL_PARALLELISM = int(os.getenv('LAYMAN_GDAL_PARALLELISM', '') or 1)
+assert LAYMAN_GDAL_PARALLELISM >= 1, f'LAYMAN_GDAL_PARALLELISM must be positive integer, found {LAYMAN_GDAL_PARALLELISM}.'
+
+LAYMAN_DELETE_PUBLICATIONS_PARALLELISM = int(os.getenv('LAYMAN_DELETE_PUBLICATIONS_PARALLELISM', '') or 4)
+assert LAYMAN_DELETE_PUBLICATIONS_PARALLELISM >= 1, \
+    f'LAYMAN_DELETE_PUBLICATIONS_PARALLELISM must be positive integer, found {LAYMAN_DELETE_PUBLICATIONS_PARALLELISM}.'
+# each deleting thread holds DB connection, so at least half of DB connection pool is left for other threads of the process
+LAYMAN_DELETE_PUBLICATIONS_PARALLELISM = min(LAYMAN_DELETE_PUBLICATIONS_PARALLELISM, db.PG_POOL_MAX_CONNECTIONS // 2)
+
+LAYMAN_FEATURE_CHANGE_QUIET_TIME = float(os.getenv('LAYMAN_FEATURE_CHANGE_QUIET_TIME', '') or 2)
+assert LAYMAN_FEATURE_CHANGE_QUIET_TIME >= 0, \
+    f'LAYMAN_FEATURE_CHANGE_QUIET_TIME must be non-negative number, found {LAYMAN_FEATURE_CHANGE_QUIET_TIME}.'
+LAYMAN_FEATURE_CHANGE_MAX_LATENCY = float(os.getenv('LAYMAN_FEATURE_CHANGE_MAX_LATENCY', '') or 30)
+assert LAYMAN_FEATURE_CHANGE_MAX_LATENCY >= LAYMAN_FEATURE_CHANGE_QUIET_TIME, \
+    f'LAYMAN_FEATURE_CHANGE_MAX_LATENCY must not be lower than LAYMAN_FEATURE_CHANGE_QUIET_TIME, found {LAYMAN_FEATURE_CHANGE_MAX_LATENCY}.'
+LAYMAN_FEATURE_CHANGE_MAX_MAP_CHAINS = int(os.getenv('LAYMAN_FEATURE_CHANGE_MAX_MAP_CHAINS', '') or 4)
+assert LAYMAN_FEATURE_CHANGE_MAX_MAP_CHAINS >= 1, \
+    f'LAYMAN_FEATURE_CHANGE_MAX_MAP_CHAINS must be positive integer, found {LAYMAN_FEATURE_CHANGE_MAX_MAP_CHAINS}.'
+
+LAYMAN_UPLOAD_MAX_FILE_SIZE = int(os.getenv('LAYMAN_UPLOAD_MAX_FILE_SIZE', '') or 0)
+assert LAYMAN_UPLOAD_MAX_FILE_SIZE >= 0, \
+    f'LAYMAN_UPLOAD_MAX_FILE_SIZE must be non-negative integer, found {LAYMAN_UPLOAD_MAX_FILE_SIZE}.'
+
+LAYMAN_CONTENT_ADDRESSED_ARCHIVES = os.getenv('LAYMAN_CONTENT_ADDRESSED_ARCHIVES', 'false').lower() == 'true'
+
 LAYMAN_PG_HOST = os.environ['LAYMAN_PG_HOST']
 LAYMAN_PG_PORT = os.environ['LAYMAN_PG_PORT']
 LAYMAN_PG_DBNAME = os.environ['LAYMAN_PG_DBNAME']
@@ -242,11 +267,29 @@ UPLOAD_MAX_INACTIVITY_TIME = 5 * 60  # 5 minutes
 # max time (in seconds) to cache GeoServer's requests like WMS capabilities
 LAYMAN_CACHE_GS_TIMEOUT = 1 * 60  # 1 minute
 
+# max time (in seconds) to keep capabilities of one GeoServer layer, entries are also refreshed after every change of the layer
+LAYMAN_CACHE_GS_LAYER_CAPABILITIES_TIMEOUT = 60 * 60  # 1 hour
+
+# max time (in seconds) to cache roles of users read from role service
+LAYMAN_CACHE_ROLE_SERVICE_TIMEOUT = 30  # 30 seconds
+
+# max time (in seconds) to remember that metadata record exists in Micka, entries are also refreshed after every insert or update of the record
+LAYMAN_CACHE_CSW_RECORD_PRESENCE_TIMEOUT = 10 * 60  # 10 minutes
+
+# max number of keep-alive connections to GeoServer kept by GeoServer proxy in one process
+LAYMAN_GS_PROXY_POOL_SIZE = 10
+# size (in bytes) of chunks streamed by GeoServer proxy from GeoServer to the client
+LAYMAN_GS_PROXY_CHUNK_SIZE = 64 * 1024  # 64 KiB
+
 LAYMAN_REDIS_URL = os.environ['LAYMAN_REDIS_URL']
 
 LAYMAN_REDIS = redis.Redis.from_url(LAYMAN_REDIS_URL, encoding="utf-8", decode_responses=True)
 
 LAYMAN_TIMGEN_URL = os.environ['LAYMAN_TIMGEN_URL']
+LAYMAN_TIMGEN_BROWSER_POOL_SIZE = int(os.getenv('LAYMAN_TIMGEN_BROWSER_POOL_SIZE', '') or 1)
+assert LAYMAN_TIMGEN_BROWSER_POOL_SIZE >= 1, f'LAYMAN_TIMGEN_BROWSER_POOL_SIZE must be positive integer, found {LAYMAN_TIMGEN_BROWSER_POOL_SIZE}.'
+LAYMAN_TIMGEN_BROWSER_MAX_RENDERS = int(os.getenv('LAYMAN_TIMGEN_BROWSER_MAX_RENDERS', '') or 50)
+assert LAYMAN_TIMGEN_BROWSER_MAX_RENDERS >= 1, f'LAYMAN_TIMGEN_BROWSER_MAX_RENDERS must be positive integer, found {LAYMAN_TIMGEN_BROWSER_MAX_RENDERS}.'
 LAYMAN_CLIENT_URL = os.environ['LAYMAN_CLIENT_URL']
 LAYMAN_CLIENT_PUBLIC_URL = os.environ['LAYMAN_CLIENT_PUBLIC_URL']
 LAYMAN_SERVER_NAME = os.environ['LAYMAN_SERVER_NAME']
@@ -0,0 +1,37 @@
+import os
+import threading
+from http import cookiejar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+class _RejectAllCookiePolicy(cookiejar.DefaultCookiePolicy):
+    # Session is shared by requests of different actors, so cookies returned by upstream must never be remembered
+    def set_ok(self, cookie, request):
+        return False
+
+
+def get_pooled_session(name, *, pool_connections=10, pool_maxsize=10, max_retries=0):
+    """Return keep-alive session shared by all threads of current process.
+
+    Sessions are keyed also by process ID, so that connections are never shared between forked workers.
+    Cookies are not persisted in the session, pass them explicitly to each request.
+    """
+    key = (os.getpid(), name)
+    session = _SESSIONS.get(key)
+    if session is None:
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(key)
+            if session is None:
+                session = requests.Session()
+                session.cookies.set_policy(_RejectAllCookiePolicy())
+                adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                      max_retries=max_retries)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _SESSIONS[key] = session
+    return session
@@ -3,9 +3,8 @@ from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
 
-def get_session(*, retries=5):
-    session = requests.Session()
-    retry = Retry(
+def get_retry(*, retries=5):
+    return Retry(
         total=retries,
         backoff_factor=0.2,  # Used to compute time in seconds between attempts:
                              # backoff_factor * (2 ** attempt_idx - 1))
@@ -13,6 +12,11 @@ def get_session(*, retries=5):
         status_forcelist=(500,),
         method_whitelist=('HEAD', 'TRACE', 'GET', 'PUT', 'OPTIONS', 'DELETE', 'POST', 'PATCH')
     )
+
+
+def get_session(*, retries=5):
+    session = requests.Session()
+    retry = get_retry(retries=retries)
     adapter = HTTPAdapter(max_retries=retry)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
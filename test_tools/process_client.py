@@ -414,7 +414,7 @@ publish_workspace_map = partial(publish_workspace_publication, MAP_TYPE)
 publish_workspace_layer = partial(publish_publication, LAYER_TYPE)
 
 GET_PUBLICATIONS_KNOWN_PARAMS = {'full_text_filter', 'bbox_filter', 'bbox_filter_crs', 'order_by', 'ordering_bbox',
-                                 'ordering_bbox_crs', 'limit', 'offset'}
+                                 'ordering_bbox_crs', 'limit', 'offset', 'cursor', 'total_count'}
 
 
 def get_workspace_publications_response(publication_type, workspace, *, headers=None, query_params=None, ):
@@ -544,15 +544,21 @@ def delete_publications(publication_type, workspace, headers=None, *, actor_name
     with app.app_context():
         if publication_type == LAYER_TYPE:
             r_url = url_for('rest_layers.delete')
-            response = requests.delete(r_url, headers=headers, params={'workspace': workspace}, timeout=HTTP_TIMEOUT)
-            raise_layman_error(response)
-            wfs.clear_cache()
-            wms.clear_cache()
-            return response.json()
-        r_url = url_for(publication_type_def.delete_workspace_publications_url,
-                        workspace=workspace,
-                        )
-        return finish_delete(r_url, headers)
+            params = {'workspace': workspace}
+        else:
+            r_url = url_for(publication_type_def.delete_workspace_publications_url,
+                            workspace=workspace,
+                            )
+            params = None
+        response = requests.delete(r_url, headers=headers, params=params, timeout=HTTP_TIMEOUT)
+        raise_layman_error(response)
+        # publications are deleted asynchronously, so wait until all of them are gone
+        for publication in response.json():
+            wait_for_rest(url_for(publication_type_def.get_publication_url, uuid=publication['uuid']), 60, 0.5,
+                          check_response=lambda r: r.status_code == 404, headers=headers)
+    wfs.clear_cache()
+    wms.clear_cache()
+    return response.json()
 
 
 def delete_workspace_publications(publication_type, workspace, headers=None, *, actor_name=None, ):
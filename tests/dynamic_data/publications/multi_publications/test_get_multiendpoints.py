@@ -1077,3 +1077,30 @@ class TestGet:
         assert info_publications_response.headers['X-Total-Count'] == f"{exp_result['total_count']}"
         content_range_str = f"items {exp_result['content_range'][0]}-{exp_result['content_range'][1]}/{exp_result['total_count']}"
         assert info_publications_response.headers['Content-Range'] == content_range_str
+
+    @pytest.mark.parametrize('rest_params', [
+        pytest.param({}, id='no-order_by'),
+        pytest.param({'order_by': 'title'}, id='order_by-title'),
+        pytest.param({'order_by': 'last_change'}, id='order_by-last_change'),
+        pytest.param({'order_by': 'bbox', 'ordering_bbox': '-10000,-10000,4000,5000'}, id='order_by-bbox'),
+        pytest.param({'full_text_filter': 'The', 'order_by': 'full_text'}, id='order_by-full_text'),
+    ])
+    def test_rest_cursor_pagination(self, rest_params):
+        def get_publications(query_params):
+            response = process_client.get_publications_response(None, query_params=query_params)
+            return [(item['workspace'], item['name']) for item in response.json()], response.headers
+
+        exp_items, _ = get_publications(rest_params)
+
+        items = []
+        cursor_params = {}
+        while True:
+            page_items, headers = get_publications({**rest_params, 'limit': 2, 'total_count': 'false', **cursor_params})
+            assert 'X-Total-Count' not in headers
+            if page_items:
+                assert headers['Content-Range'] == f"items {len(items) + 1}-{len(items) + len(page_items)}/*"
+            items += page_items
+            if 'X-Next-Cursor' not in headers:
+                break
+            cursor_params = {'cursor': headers['X-Next-Cursor']}
+        assert items == exp_items
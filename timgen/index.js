@@ -1,5 +1,5 @@
 // import 'ol/ol.css';
-import {json_to_map, adjust_map_url, map_to_canvas, log} from './src/map';
+import {json_to_map, adjust_map_url, map_to_canvas, log, set_result} from './src/map';
 import { saveAs } from 'file-saver';
 
 // const map_def_url = 'https://raw.githubusercontent.com/LayerManager/layman/1252fad2677f55182478c2206f47fbacb922fb97/sample/layman.map/full.json';
@@ -43,7 +43,7 @@ const main = async () => {
   ).catch(e => {
     const msg = `Error when fetching map: ${e.message}`
     log(msg)
-    window['canvas_data_url_error'] = msg;
+    set_result('canvas_data_url_error', msg);
   });
   const ol_map = json_to_map({
     map_json,
@@ -55,7 +55,7 @@ const main = async () => {
   ol_map.once('rendercomplete', (event) => {
     log('rendercomplete');
     const canvas = map_to_canvas(ol_map);
-    window['canvas_data_url'] = canvas.toDataURL();
+    set_result('canvas_data_url', canvas.toDataURL());
     if(file_name) {
       if (navigator.msSaveBlob) {
         navigator.msSaveBlob(canvas.msToBlob(), file_name);
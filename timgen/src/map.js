@@ -118,7 +118,7 @@ const proxify_layer_loader = (layer, tiled, gs_public_url, gs_url, headers) => {
             await fetch_retry(remaining_tries, 2 * delay_ms);
           } else {
             log(`load_fn.fetch_retry, loaded ERROR unknown, STOP TRYING`)
-            window['canvas_data_url_error'] = `Timgen load_fn error:\nimage_url=${image_url}\nadjusted_image_url=${adjusted_image_url}\nerror body:\n${text}`;
+            set_result('canvas_data_url_error', `Timgen load_fn error:\nimage_url=${image_url}\nadjusted_image_url=${adjusted_image_url}\nerror body:\n${text}`);
           }
         }
       }
@@ -301,3 +301,10 @@ export const log = (msg) => {
   console.log(msg);
   window['layman_logs'].push(msg);
 }
+
+
+// Sets result of rendering and notifies the caller (e.g. Layman's headless browser) by `timgen_done` event
+export const set_result = (key, value) => {
+  window[key] = value;
+  window.dispatchEvent(new Event('timgen_done'));
+}